@@ -0,0 +1,301 @@
+"""In-process stand-in for the Supabase client, for benchmarks and running without a project.
+
+Implements the tables and auth calls main.py makes, counts every round trip and the JSON
+bytes it would have sent and received, and can add latency, jitter and failures. Plug it in with
+main.set_backend(FakeSupabase(...)) or STILLMIND_BACKEND=benchmarks.fake_supabase:FakeSupabase.
+"""
+import base64
+import copy
+import json
+import os
+import random
+import threading
+import time
+import uuid
+from types import SimpleNamespace
+
+TABLES = ('app_settings', 'breathing_stats', 'achievements', 'notification_settings', 'breathing_cycles')
+# Tables whose rows get a generated id column
+IDENTITY_TABLES = ('breathing_cycles',)
+
+# Access tokens last an hour, like Supabase's default
+TOKEN_LIFETIME = 60 * 60
+
+
+class InjectedFailure(ConnectionError):
+    """A request the fake was told to fail, as if the network dropped it"""
+
+
+def make_token(user_id, lifetime=TOKEN_LIFETIME):
+    """An unsigned JWT with the claims main.decode_jwt_claims() reads"""
+    def part(data):
+        return base64.urlsafe_b64encode(json.dumps(data).encode()).rstrip(b"=").decode()
+    claims = {'sub': user_id, 'exp': int(time.time()) + lifetime, 'jti': uuid.uuid4().hex}
+    return f"{part({'alg': 'none', 'typ': 'JWT'})}.{part(claims)}.fake"
+
+
+class Response:
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+
+class AuthResponse:
+    """What supabase-py's auth calls return: .user and .session, and .dict()"""
+
+    def __init__(self, user=None, session=None):
+        self.user = SimpleNamespace(**user) if user else None
+        self.session = SimpleNamespace(**session) if session else None
+        self._dict = {'user': user, 'session': session}
+
+    def dict(self):
+        return copy.deepcopy(self._dict)
+
+
+class Query:
+    """One table request, built up like postgrest's query builder and sent by execute()"""
+
+    def __init__(self, backend, table):
+        self.backend = backend
+        self.table = table
+        self.operation = 'select'
+        self.body = None
+        self.filters = []  # (column, operator, value)
+        self.columns = '*'
+        self.count = None
+        self.first = 0
+        self.last = None
+        self.on_conflict = 'user_id'
+        self.ignore_duplicates = False
+
+    def select(self, columns='*', count=None):
+        self.operation, self.columns, self.count = 'select', columns, count
+        return self
+
+    def insert(self, rows):
+        self.operation, self.body = 'insert', rows
+        return self
+
+    def upsert(self, rows, on_conflict='user_id', ignore_duplicates=False):
+        self.operation, self.body = 'upsert', rows
+        self.on_conflict, self.ignore_duplicates = on_conflict, ignore_duplicates
+        return self
+
+    def delete(self):
+        self.operation = 'delete'
+        return self
+
+    def eq(self, column, value):
+        self.filters.append((column, 'eq', value))
+        return self
+
+    def gte(self, column, value):
+        self.filters.append((column, 'gte', value))
+        return self
+
+    def order(self, column, desc=False):
+        return self  # Rows are kept in insertion (id) order already
+
+    def range(self, first, last):
+        self.first, self.last = first, last
+        return self
+
+    def limit(self, n):
+        self.last = self.first + n - 1
+        return self
+
+    def matches(self, row):
+        for column, operator, value in self.filters:
+            if operator == 'eq' and row.get(column) != value:
+                return False
+            if operator == 'gte' and not row.get(column, '') >= value:
+                return False
+        return True
+
+    def execute(self):
+        request = {'table': self.table, 'op': self.operation, 'filters': self.filters, 'body': self.body}
+        return self.backend.round_trip(('table', self.table, self.operation), request, self.run)
+
+    def add(self, rows, row):
+        """Store a new row, with a generated id where the table has one; returns a copy"""
+        row = copy.deepcopy(row)
+        if self.table in IDENTITY_TABLES:
+            self.backend.next_id += 1
+            row['id'] = self.backend.next_id
+        rows.append(row)
+        return copy.deepcopy(row)
+
+    def run(self):
+        rows = self.backend.tables.setdefault(self.table, [])
+        if self.operation == 'select':
+            found = [row for row in rows if self.matches(row)]
+            page = found[self.first:None if self.last is None else self.last + 1]
+            if self.columns != '*':
+                names = [name.strip() for name in self.columns.split(',')]
+                page = [{name: row.get(name) for name in names} for row in page]
+            return Response(copy.deepcopy(page), len(found) if self.count else None)
+
+        if self.operation == 'insert':
+            new = self.body if isinstance(self.body, list) else [self.body]
+            return Response([self.add(rows, row) for row in new])
+
+        if self.operation == 'upsert':
+            keys = [key.strip() for key in self.on_conflict.split(',')]
+            written = []
+            for new in self.body if isinstance(self.body, list) else [self.body]:
+                # Like a unique constraint, a null in any key column never conflicts
+                existing = None if any(new.get(key) is None for key in keys) else next(
+                    (row for row in rows if all(row.get(key) == new.get(key) for key in keys)), None)
+                if existing is None:
+                    written.append(self.add(rows, new))
+                elif not self.ignore_duplicates:
+                    existing.update(copy.deepcopy(new))
+                    written.append(copy.deepcopy(existing))
+            return Response(written)
+
+        kept = [row for row in rows if not self.matches(row)]
+        deleted = [row for row in rows if self.matches(row)]
+        self.backend.tables[self.table] = kept
+        return Response(deleted)
+
+
+class FakeAuth:
+    def __init__(self, backend):
+        self.backend = backend
+        self.current = None  # user id of the signed-in session
+        self.admin = FakeAdmin(self)
+
+    def call(self, method, request, run):
+        return self.backend.round_trip(('auth', method), request, run)
+
+    def session_for(self, user_id):
+        return {
+            'access_token': make_token(user_id),
+            'refresh_token': uuid.uuid4().hex,
+            'expires_at': int(time.time()) + TOKEN_LIFETIME,
+            'user': {'id': user_id},
+        }
+
+    def sign_up(self, credentials):
+        def run():
+            user_id = self.backend.add_user(credentials['email'], credentials['password'])
+            return AuthResponse({'id': user_id, 'email': credentials['email']})
+        return self.call('sign_up', credentials, run)
+
+    def sign_in_with_password(self, credentials):
+        def run():
+            user = self.backend.users.get(credentials['email'])
+            if not user or user['password'] != credentials['password']:
+                return AuthResponse()
+            self.current = user['id']
+            return AuthResponse({'id': user['id'], 'email': credentials['email']}, self.session_for(user['id']))
+        return self.call('sign_in_with_password', credentials, run)
+
+    def set_session(self, access_token, refresh_token):
+        def run():
+            payload = access_token.split('.')[1]
+            claims = json.loads(base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4)))
+            self.current = claims['sub']
+            return AuthResponse({'id': self.current}, self.session_for(self.current))
+        return self.call('set_session', {'refresh_token': refresh_token}, run)
+
+    def refresh_session(self):
+        return self.call('refresh_session', {}, lambda: AuthResponse(
+            {'id': self.current}, self.session_for(self.current)))
+
+    def get_user(self):
+        def run():
+            email = next((email for email, user in self.backend.users.items() if user['id'] == self.current), None)
+            return AuthResponse({'id': self.current, 'email': email})
+        return self.call('get_user', {}, run)
+
+    def update_user(self, attributes):
+        def run():
+            for user in self.backend.users.values():
+                if user['id'] == self.current:
+                    user.update(attributes)
+            return AuthResponse({'id': self.current})
+        return self.call('update_user', attributes, run)
+
+    def delete_user(self):
+        def run():
+            self.backend.users = {email: user for email, user in self.backend.users.items()
+                                  if user['id'] != self.current}
+            return AuthResponse()
+        return self.call('delete_user', {}, run)
+
+    def sign_out(self):
+        def run():
+            self.current = None
+        return self.call('sign_out', {}, run)
+
+
+class FakeAdmin:
+    def __init__(self, auth):
+        self.auth = auth
+
+    def sign_out(self, jwt, scope='global'):
+        # Revokes that token's session on the server; the client's current session is left alone
+        return self.auth.call('admin.sign_out', {'scope': scope}, lambda: None)
+
+
+class FakeSupabase:
+    """Supabase client stand-in holding its tables in memory.
+
+    latency and jitter are in seconds per round trip; failure_rate is the chance any round trip
+    raises InjectedFailure. Without arguments these come from STILLMIND_FAKE_LATENCY,
+    STILLMIND_FAKE_JITTER and STILLMIND_FAKE_FAILURE_RATE, so the app can run against it too.
+    """
+
+    def __init__(self, latency=None, jitter=None, failure_rate=None, seed=None):
+        self.latency = float(os.environ.get("STILLMIND_FAKE_LATENCY", 0) if latency is None else latency)
+        self.jitter = float(os.environ.get("STILLMIND_FAKE_JITTER", 0) if jitter is None else jitter)
+        self.failure_rate = float(
+            os.environ.get("STILLMIND_FAKE_FAILURE_RATE", 0) if failure_rate is None else failure_rate)
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.tables = {table: [] for table in TABLES}
+        self.users = {}  # email -> {'id', 'password'}
+        self.next_id = 0
+        self.fail_next = 0  # fail this many round trips before going back to failure_rate
+        self.auth = FakeAuth(self)
+        self.reset_counters()
+
+        # A ready-made account, handy when the app itself runs against the fake
+        self.add_user("demo@stillmind.test", "demo-password")
+
+    def add_user(self, email, password):
+        user_id = str(uuid.uuid4())
+        self.users[email] = {'id': user_id, 'password': password}
+        return user_id
+
+    def table(self, name):
+        return Query(self, name)
+
+    def reset_counters(self):
+        self.round_trips = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.calls = []  # ('table', name, operation) or ('auth', method), one per round trip
+
+    def counters(self):
+        return {'round_trips': self.round_trips, 'bytes_sent': self.bytes_sent, 'bytes_received': self.bytes_received}
+
+    def round_trip(self, call, request, run):
+        """Count, delay and maybe fail one request, then apply it to the in-memory state"""
+        delay = max(0.0, self.latency + self.random.uniform(-self.jitter, self.jitter))
+        if delay:
+            time.sleep(delay)
+        with self.lock:
+            self.round_trips += 1
+            self.calls.append(call)
+            self.bytes_sent += len(json.dumps(request, default=str))
+            if self.fail_next or self.random.random() < self.failure_rate:
+                self.fail_next = max(0, self.fail_next - 1)
+                raise InjectedFailure(f"Injected failure in {'.'.join(call)}")
+            response = run()
+            data = getattr(response, 'data', None)
+            if data is None and isinstance(response, AuthResponse):
+                data = response.dict()
+            self.bytes_received += len(json.dumps(data, default=str))
+            return response
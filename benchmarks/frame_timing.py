@@ -0,0 +1,303 @@
+"""Frame timing of a full breathing session, run headless under a virtual X display.
+
+Starts App against benchmarks/fake_supabase.py, logs in and drives MainPage through a number of
+cycles in each progress style while firing particle bursts. It records how late every `after`
+callback ran compared to when it was due, how long each callback took, and how many canvas
+items exist. The report is JSON with p50/p95/p99 per progress style:
+
+    python benchmarks/frame_timing.py --cycles 5 --output frames.json
+    python benchmarks/frame_timing.py --compare frames.json      # exit 1 if p95/p99 got worse
+
+Needs Xvfb on PATH when no DISPLAY is set.
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from types import SimpleNamespace
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+STYLES = ("bars", "circle", "triangle")
+PERCENTILES = (50, 95, 99)
+# How much worse p95/p99 may get in --compare before it counts as a regression
+TOLERANCE = 0.25
+TOLERANCE_MS = 2.0
+
+
+def start_virtual_display():
+    """Run Xvfb on a free display number unless a display is already available; returns the process"""
+    if os.environ.get("DISPLAY"):
+        return None
+    if not shutil.which("Xvfb"):
+        sys.exit("No DISPLAY and no Xvfb on PATH; install Xvfb (e.g. the xvfb package) to run headless")
+    for number in range(99, 120):
+        if os.path.exists(f"/tmp/.X{number}-lock"):
+            continue
+        process = subprocess.Popen(["Xvfb", f":{number}", "-screen", "0", "1280x800x24", "-nolisten", "tcp"],
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        for _ in range(50):
+            if os.path.exists(f"/tmp/.X11-unix/X{number}"):
+                os.environ["DISPLAY"] = f":{number}"
+                return process
+            time.sleep(0.1)
+        process.kill()
+    sys.exit("Could not start Xvfb")
+
+
+def percentiles(values):
+    """Nearest-rank p50/p95/p99 and max of a list of numbers, in the list's unit"""
+    if not values:
+        return {**{f"p{p}": None for p in PERCENTILES}, "max": None, "count": 0}
+    ordered = sorted(values)
+    report = {f"p{p}": round(ordered[min(len(ordered) - 1, max(0, -(-p * len(ordered) // 100) - 1))], 3)
+              for p in PERCENTILES}
+    report["max"] = round(ordered[-1], 3)
+    report["count"] = len(ordered)
+    return report
+
+
+class AfterRecorder:
+    """Wraps tkinter's after() to time every timer callback: lateness against its due time and run time"""
+
+    def __init__(self, tk):
+        self.tk = tk
+        self.original_after = tk.Misc.after
+        self.reset()
+
+    def reset(self):
+        self.lateness = defaultdict(list)  # callback name -> ms late
+        self.durations = defaultdict(list)  # callback name -> ms spent running
+
+    def install(self):
+        recorder, original_after = self, self.original_after
+
+        def after(widget, ms, func=None, *args):
+            if func is None or not callable(func):
+                return original_after(widget, ms, func, *args)
+            if ms == 'idle':
+                due = time.perf_counter()  # after_idle() is after('idle', ...), due as soon as Tk is idle
+            elif isinstance(ms, (int, float)):
+                due = time.perf_counter() + ms / 1000
+            else:
+                return original_after(widget, ms, func, *args)
+            name = recorder.name_of(func)
+
+            def timed(*call_args):
+                start = time.perf_counter()
+                try:
+                    return func(*call_args)
+                finally:
+                    end = time.perf_counter()
+                    recorder.lateness[name].append(max(0.0, (start - due) * 1000))
+                    recorder.durations[name].append((end - start) * 1000)
+            return original_after(widget, ms, timed, *args)
+
+        self.tk.Misc.after = after
+
+    @staticmethod
+    def name_of(func):
+        name = getattr(func, "__qualname__", None) or type(func).__name__
+        return "lambda" if "<lambda>" in name else name
+
+    def report(self, names=None):
+        """Percentiles over every callback (or only those in `names`), plus one entry per callback name"""
+        picked = [name for name in self.lateness if names is None or name in names]
+        return {
+            "jitter_ms": percentiles([ms for name in picked for ms in self.lateness[name]]),
+            "callback_ms": percentiles([ms for name in picked for ms in self.durations[name]]),
+            "by_callback": {
+                name: {"jitter_ms": percentiles(self.lateness[name]), "callback_ms": percentiles(self.durations[name])}
+                for name in sorted(self.lateness)
+            },
+        }
+
+
+def canvas_items(widget, tk):
+    """Canvas items in a widget tree"""
+    total = len(widget.find_all()) if isinstance(widget, tk.Canvas) else 0
+    return total + sum(canvas_items(child, tk) for child in widget.winfo_children())
+
+
+class SessionDriver:
+    """Runs the breathing sessions on the Tk event loop and collects a report per progress style"""
+
+    # Callbacks that make up the animation; everything else (CTk internals, I/O polling) is reported separately
+    FRAME_CALLBACKS = {"MainPage.tick", "ParticleEngine.step"}
+
+    def __init__(self, main, app, recorder, args):
+        self.main = main
+        self.app = app
+        self.recorder = recorder
+        self.args = args
+        self.page = None
+        self.styles = list(STYLES)
+        self.results = {}
+        self.cycles = 0
+        self.samples = []
+
+    def start(self):
+        page = self.page = self.app.get_frame(self.main.MainPage)
+        self.app.show_frame(self.main.MainPage)
+        # Count cycles as the engine finishes them, then let the page record them as usual
+        complete_cycle = page.complete_cycle
+
+        def counted():
+            self.cycles += 1
+            complete_cycle()
+        page.complete_cycle = counted
+        self.app.after(500, self.next_style)
+
+    def next_style(self):
+        if not self.styles:
+            self.app.quit()
+            return
+        self.style = self.styles.pop(0)
+        self.app.settings_store.update({'progress_style': self.style})
+        self.page.stop_exercise()
+        self.page.create_progress_indicators()
+        self.app.update()
+        self.recorder.reset()
+        self.cycles = 0
+        self.samples = [canvas_items(self.page, self.main.tk)]
+        self.started = time.perf_counter()
+        self.page.is_exercise_active = True
+        self.page.start_breathing()
+        self.app.after(self.args.burst_ms, self.burst)
+        self.app.after(250, self.sample)
+
+    def burst(self):
+        if self.page.is_exercise_active:
+            canvas = self.page.bg_canvas
+            event = SimpleNamespace(x=random.randint(50, max(60, canvas.winfo_width() - 50)),
+                                    y=random.randint(50, max(60, canvas.winfo_height() - 50)))
+            canvas.create_burst(event)
+            self.app.after(self.args.burst_ms, self.burst)
+
+    def sample(self):
+        if not self.page.is_exercise_active:
+            return
+        self.samples.append(canvas_items(self.page, self.main.tk))
+        if self.cycles >= self.args.cycles:
+            self.finish_style()
+            return
+        self.app.after(250, self.sample)
+
+    def finish_style(self):
+        self.page.stop_exercise()
+        report = self.recorder.report(self.FRAME_CALLBACKS)
+        report["cycles"] = self.cycles
+        report["seconds"] = round(time.perf_counter() - self.started, 2)
+        report["canvas_items"] = {"start": self.samples[0], "max": max(self.samples), "end": self.samples[-1]}
+        self.results[self.style] = report
+        # Let the last particles fade before the next style starts
+        self.app.after(1000, self.next_style)
+
+
+def run(args):
+    display = start_virtual_display()
+    home = tempfile.mkdtemp(prefix="stillmind-frames-")
+    os.environ["HOME"] = home  # Keep the saved-session file out of the real home directory
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    try:
+        import tkinter as tk
+        recorder = AfterRecorder(tk)
+        recorder.install()
+
+        import main
+        from benchmarks.fake_supabase import FakeSupabase
+        sys.excepthook = sys.__excepthook__  # main's hook waits for Enter
+        backend = FakeSupabase(args.latency, args.jitter, 0.0, seed=args.seed)
+        main.set_backend(backend)
+        main._local_cache = main.LocalCache(path=os.path.join(home, "cache.db"))
+
+        app = main.App()
+        app.geometry("1000x700")
+        resp, data_handler = main.LoginPage.request_sign_in("demo@stillmind.test", "demo-password")
+        app.set_user(data_handler)
+        # Short phases so every style gets through its cycles quickly; the frame work per tick is the same
+        seconds = args.phase_seconds
+        app.settings_store.update({
+            'sound': False,
+            'breathing_times': {'inhale': seconds, 'hold': seconds, 'exhale': seconds},
+        })
+
+        driver = SessionDriver(main, app, recorder, args)
+        app.after(0, driver.start)
+        app.mainloop()
+        app.io.shutdown()
+        app.destroy()
+        return {
+            "meta": {
+                "cycles_per_style": args.cycles,
+                "phase_seconds": seconds,
+                "burst_ms": args.burst_ms,
+                "backend_latency_s": args.latency,
+                "round_trips": backend.round_trips,
+                "python": sys.version.split()[0],
+                "tk": tk.TkVersion,
+            },
+            "styles": driver.results,
+        }
+    finally:
+        if display:
+            display.terminate()
+
+
+def compare(report, baseline):
+    """Lines describing p95/p99 jitter or callback time that got worse than the baseline allows"""
+    regressions = []
+    for style, result in report["styles"].items():
+        before = baseline.get("styles", {}).get(style)
+        if not before:
+            continue
+        for metric in ("jitter_ms", "callback_ms"):
+            for p in ("p95", "p99"):
+                new, old = result[metric][p], before[metric][p]
+                if new is None or old is None:
+                    continue
+                if new > old * (1 + TOLERANCE) + TOLERANCE_MS:
+                    regressions.append(f"{style} {metric} {p}: {new} ms, baseline {old} ms")
+        if result["canvas_items"]["max"] > before["canvas_items"]["max"]:
+            regressions.append(f"{style} canvas items: {result['canvas_items']['max']}, "
+                               f"baseline {before['canvas_items']['max']}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cycles", type=int, default=3, help="breathing cycles per progress style")
+    parser.add_argument("--phase-seconds", type=int, default=1, help="length of each breathing phase")
+    parser.add_argument("--burst-ms", type=int, default=300, help="time between particle bursts")
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per fake backend round trip")
+    parser.add_argument("--jitter", type=float, default=0.02)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="write the JSON report here as well as to stdout")
+    parser.add_argument("--compare", help="earlier JSON report to check for regressions against")
+    args = parser.parse_args()
+    random.seed(args.seed)
+
+    report = run(args)
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(report, json.load(f))
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
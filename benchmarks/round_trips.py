@@ -0,0 +1,202 @@
+"""Count Supabase round trips and bytes for scripted sessions, and fail when they go up.
+
+Runs the app's own data paths (the same static methods and DataHandling calls the pages use)
+against benchmarks/fake_supabase.py, so no project, network or display is needed:
+
+    python benchmarks/round_trips.py                      # compare with round_trips_baseline.json
+    python benchmarks/round_trips.py --update-baseline    # accept the current counts
+    python benchmarks/round_trips.py --latency 0.08 --jitter 0.04 --failure-rate 0.1
+
+Exits with 1 if any flow makes more round trips or moves more bytes than its baseline.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.fake_supabase import FakeSupabase, InjectedFailure
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "round_trips_baseline.json")
+EMAIL, PASSWORD = "bench@stillmind.test", "bench-password"
+# Bytes may wobble a little with timestamps and token sizes; round trips may not
+BYTES_TOLERANCE = 0.05
+
+
+def import_app():
+    import main
+    sys.excepthook = sys.__excepthook__  # main's hook waits for Enter
+    return main
+
+
+def retry(fn, *args, attempts=50):
+    """Call fn until it succeeds, like the app's retry with backoff, but without the waiting"""
+    for attempt in range(attempts):
+        try:
+            return fn(*args)
+        except InjectedFailure:
+            if attempt == attempts - 1:
+                raise
+
+
+class Session:
+    """One user's scripted session against the fake backend"""
+
+    def __init__(self, main, backend, cache_path):
+        self.main = main
+        self.backend = backend
+        self.cache_path = cache_path
+        self.data_handler = None
+        self.access_token = self.refresh_token = None
+
+    def fresh_cache(self):
+        # A new LocalCache over the same file, as after restarting the app
+        self.main._local_cache = self.main.LocalCache(path=self.cache_path)
+
+    def login(self):
+        self.fresh_cache()
+        resp, self.data_handler = retry(self.main.LoginPage.request_sign_in, EMAIL, PASSWORD)
+        session = resp["session"]
+        self.access_token, self.refresh_token = session["access_token"], session["refresh_token"]
+        store = self.main.SettingsStore(save=self.save_user_data)
+        store.load(self.data_handler)
+        self.settings = store
+        retry(self.data_handler.sync_outbox)
+
+    def restore(self):
+        """Start the app again with the saved session, as App.check_saved_session does"""
+        self.fresh_cache()
+        self.data_handler = self.main.DataHandling(self.data_handler.user_id)
+        self.settings = self.main.SettingsStore(save=self.save_user_data)
+        self.settings.load(self.data_handler, from_cache=True)
+        retry(self.main.App.session_handshake, self.data_handler, self.access_token, self.refresh_token)
+        retry(self.data_handler.sync_outbox)
+
+    def open_pages(self):
+        """Load what StatsPage (every range), AchievementsPage and AccountPage show, with their own loaders"""
+        data_handler = self.data_handler
+        for days in self.main.StatsPage.RANGES:
+            retry(self.main.StatsPage.load_summary, data_handler, days)
+        total, streak, _ = retry(self.main.AchievementsPage.load_progress, data_handler)
+        self.unlock_achievements(total, streak)
+        retry(self.main.AccountPage.load_user)
+
+    def run_cycles(self, count=10):
+        """Finish `count` breathing cycles, as MainPage.complete_cycle and record_cycle do"""
+        data_handler = self.data_handler
+        today = time.strftime('%Y-%m-%d')
+        for _ in range(count):
+            if not data_handler.finish_cycle(today):
+                retry(data_handler.bootstrap)
+            self.unlock_achievements(defer=True)
+        # App.defer_sync: the session's cycles go in one sync once it ends
+        retry(data_handler.sync_outbox)
+
+    def unlock_achievements(self, cycles=None, streak=None, defer=False):
+        # MainPage.record_cycle (deferred) and AchievementsPage.unlock_and_display save whatever got unlocked
+        if self.data_handler.check_achievements(cycles, streak):
+            self.save_user_data('achievements', self.data_handler.achievement_engine().unlocked, defer=defer)
+
+    def change_settings(self):
+        self.settings.update({'theme': 'light'})
+        self.settings.update({'sound': False})
+        self.settings.update({'breathing_times': {'inhale': 4, 'hold': 4, 'exhale': 4}})
+        self.settings.update_notifications({'enabled': True, 'time': '20:00'})
+
+    def save_user_data(self, table, value, on_error=None, defer=False):
+        # App.save_user_data, with the background sync run inline (or left for run_cycles to do at the end)
+        self.data_handler.journal_row(table, value)
+        if not defer:
+            retry(self.data_handler.sync_outbox)
+
+
+def run_flows(main, backend, storage):
+    main.STATS_STORAGE = storage
+    backend.auth.sign_up({"email": EMAIL, "password": PASSWORD})
+    cache_dir = tempfile.mkdtemp(prefix="stillmind-bench-")
+    session = Session(main, backend, os.path.join(cache_dir, "cache.db"))
+    flows = [
+        ("login", session.login),
+        ("open pages", session.open_pages),
+        ("10 cycles", session.run_cycles),
+        ("change settings", session.change_settings),
+        ("restore session", session.restore),
+        ("open pages again", session.open_pages),
+    ]
+    results = {}
+    for name, flow in flows:
+        backend.reset_counters()
+        start = time.perf_counter()
+        flow()
+        results[f"{storage}/{name}"] = {
+            **backend.counters(),
+            'seconds': round(time.perf_counter() - start, 3),
+            'calls': sorted({'.'.join(call) for call in backend.calls}),
+        }
+    return results
+
+
+def compare(results, baseline):
+    """Lines describing every regression against the baseline"""
+    regressions = []
+    for flow, counts in results.items():
+        expected = baseline.get(flow)
+        if expected is None:
+            continue
+        if counts['round_trips'] > expected['round_trips']:
+            regressions.append(f"{flow}: {counts['round_trips']} round trips, baseline {expected['round_trips']}")
+        for key in ('bytes_sent', 'bytes_received'):
+            if counts[key] > expected[key] * (1 + BYTES_TOLERANCE):
+                regressions.append(f"{flow}: {counts[key]} {key.replace('_', ' ')}, baseline {expected[key]}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every round trip")
+    parser.add_argument("--jitter", type=float, default=0.0, help="up to this many seconds more or less")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="chance a round trip fails")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    app = import_app()
+    results = {}
+    for storage in ("blob", "events"):
+        backend = FakeSupabase(args.latency, args.jitter, args.failure_rate, seed=args.seed)
+        app.set_backend(backend)
+        results.update(run_flows(app, backend, storage))
+
+    print(f"{'flow':<28}{'round trips':>12}{'sent':>10}{'received':>10}{'seconds':>9}")
+    for flow, counts in results.items():
+        print(f"{flow:<28}{counts['round_trips']:>12}{counts['bytes_sent']:>10}"
+              f"{counts['bytes_received']:>10}{counts['seconds']:>9.3f}")
+
+    if args.failure_rate:
+        # Retried failures add round trips, so only clean runs are compared
+        return 0
+    if args.update_baseline:
+        baseline = {flow: {key: counts[key] for key in ('round_trips', 'bytes_sent', 'bytes_received')}
+                    for flow, counts in results.items()}
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2)
+            f.write("\n")
+        print(f"Baseline written to {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}, run with --update-baseline first")
+        return 1
+    with open(args.baseline) as f:
+        regressions = compare(results, json.load(f))
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,39 +1,98 @@
 import sys
 import traceback
 import logging
+import logging.handlers
+import atexit
+import time
+import os
+from contextlib import contextmanager
+
+APP_START = time.perf_counter()
+
+class StartupProfile:
+    """Wall time of each startup phase, logged when STILLMIND_PROFILE_STARTUP is set"""
+
+    def __init__(self, enabled):
+        self.enabled = enabled
+        self.phases = []  # (name, ms since process start, duration in ms)
+        self.reported = False
+
+    @contextmanager
+    def phase(self, name):
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, start, time.perf_counter())
+
+    def record(self, name, start, end):
+        if not self.enabled:
+            return
+        self.phases.append((name, (start - APP_START) * 1000, (end - start) * 1000))
+        if self.reported:
+            # Lazy loads after startup are still worth seeing
+            logging.getLogger("stillmind.startup").info("Startup profile: %s took %.1f ms", name, (end - start) * 1000)
+
+    def report(self, name="first frame visible"):
+        """Log every phase so far, ending with the time to `name`"""
+        if not self.enabled or self.reported:
+            return
+        self.reported = True
+        total = (time.perf_counter() - APP_START) * 1000
+        lines = [f"  {phase:<24} at {offset:8.1f} ms  took {duration:8.1f} ms" for phase, offset, duration in self.phases]
+        lines.append(f"  {name:<24} at {total:8.1f} ms")
+        logging.getLogger("stillmind.startup").info("Startup profile:\n%s", "\n".join(lines))
+
+startup_profile = StartupProfile(bool(os.environ.get("STILLMIND_PROFILE_STARTUP")))
 
 def handle_exception(exc_type, exc_value, exc_traceback):
     # Write error to file
     with open('error_log.txt', 'w') as f:
         traceback.print_exception(exc_type, exc_value, exc_traceback, file=f)
+    logging.getLogger("stillmind.app").critical("Unhandled exception", exc_info=(exc_type, exc_value, exc_traceback))
+    stop_logging()
     # Also print to console
     print("An error occurred! Check error_log.txt for details")
     input("Press Enter to exit...")  # Keep console window open
 
 sys.excepthook = handle_exception
 
+_imports_start = time.perf_counter()
 try:
     # Your existing imports and code here
+    # matplotlib, pygame, plyer and supabase are imported on first use, see the get_* accessors below
     import customtkinter as ctk
     from PIL import Image, ImageDraw
     import random
     import json
     from datetime import datetime
-    import matplotlib.pyplot as plt
-    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
     import tkinter.messagebox as messagebox
     import math
     import tkinter as tk
-    from pygame import mixer
-    import os
-    from plyer import notification
     import threading
-    import time
-    from datetime import datetime, timedelta
+    import queue
+    import heapq
+    import bisect
+    from array import array
+    from datetime import datetime, timedelta, date
     import platform
     import subprocess
-    from supabase import create_client, Client
-    from dotenv import load_dotenv
+    import sqlite3
+    import copy
+    import hashlib
+    import uuid
+    import base64
+    import itertools
+    import wave
+    import zlib
+    import importlib
+    import functools
+    import inspect
+    from collections import OrderedDict, deque
+    from concurrent.futures import ThreadPoolExecutor
 
 except Exception as e:
     with open('startup_error.txt', 'w') as f:
@@ -41,26 +100,329 @@ except Exception as e:
     print("Error during startup! Check startup_error.txt")
     input("Press Enter to exit...")
 
-load_dotenv()
-url = os.environ.get("SUPABASE_URL")
-key = os.environ.get("SUPABASE_KEY")
-supabase = create_client(url, key)
+startup_profile.record("imports", _imports_start, time.perf_counter())
+
+class Metrics:
+    """Counters and timing histograms (in ms) for network calls and UI handlers, saved as JSON snapshots"""
+
+    # Recent durations kept per histogram for percentiles; count, total, min and max cover every one
+    RESERVOIR = 512
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.counters = {}
+        self.histograms = {}  # name -> {'count', 'total', 'min', 'max', 'recent'}
+
+    def count(self, name, n=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def observe(self, name, value):
+        with self.lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = {
+                    'count': 0, 'total': 0.0, 'min': value, 'max': value, 'recent': deque(maxlen=self.RESERVOIR)
+                }
+            histogram['count'] += 1
+            histogram['total'] += value
+            histogram['min'] = min(histogram['min'], value)
+            histogram['max'] = max(histogram['max'], value)
+            histogram['recent'].append(value)
+
+    @contextmanager
+    def span(self, name):
+        """Time the block into histogram `name`; an exception also counts towards `name`.errors"""
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self.count(f"{name}.errors")
+            raise
+        finally:
+            self.observe(name, (time.perf_counter() - start) * 1000)
+
+    def timed(self, name):
+        """Decorator running a function inside span(name)"""
+        def decorate(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.span(name):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    @staticmethod
+    def percentile(ordered, p):
+        return ordered[min(len(ordered) - 1, max(0, -(-p * len(ordered) // 100) - 1))]
+
+    def snapshot(self):
+        """Everything recorded so far as plain JSON-ready data"""
+        with self.lock:
+            counters = dict(self.counters)
+            histograms = {name: (dict(h), sorted(h['recent'])) for name, h in self.histograms.items()}
+        timings = {}
+        for name, (histogram, recent) in sorted(histograms.items()):
+            timings[name] = {
+                'count': histogram['count'],
+                'total_ms': round(histogram['total'], 3),
+                'mean_ms': round(histogram['total'] / histogram['count'], 3),
+                'min_ms': round(histogram['min'], 3),
+                'max_ms': round(histogram['max'], 3),
+                **{f"p{p}_ms": round(self.percentile(recent, p), 3) for p in (50, 95, 99)},
+            }
+        return {
+            'started': datetime.fromtimestamp(self.started).isoformat(timespec='seconds'),
+            'taken': datetime.now().isoformat(timespec='seconds'),
+            'counters': dict(sorted(counters.items())),
+            'timings': timings,
+        }
+
+    def save(self, path):
+        """Write a snapshot to path, replacing the previous one in a single step"""
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(self.snapshot(), f, indent=2)
+        os.replace(temp_path, path)
+
+metrics = Metrics()
+
+def instrumented(prefix):
+    """Class decorator timing every public method as a '<prefix>.<method>' span"""
+    def decorate(cls):
+        for name, value in list(vars(cls).items()):
+            if not name.startswith('_') and inspect.isfunction(value):
+                setattr(cls, name, metrics.timed(f"{prefix}.{name}")(value))
+        return cls
+    return decorate
+
+class InstrumentedQuery:
+    """A Supabase table query whose execute() is timed as 'supabase.<table>.<operation>'"""
+
+    OPERATIONS = ('select', 'insert', 'upsert', 'update', 'delete')
+
+    def __init__(self, query, table, operation='select'):
+        self.query = query
+        self.table = table
+        self.operation = operation
+
+    def __getattr__(self, name):
+        attribute = getattr(self.query, name)
+        if name == 'execute':
+            return metrics.timed(f"supabase.{self.table}.{self.operation}")(attribute)
+        if not callable(attribute):
+            return attribute
+
+        def chained(*args, **kwargs):
+            operation = name if name in self.OPERATIONS else self.operation
+            return InstrumentedQuery(attribute(*args, **kwargs), self.table, operation)
+        return chained
+
+class InstrumentedAuth:
+    """Supabase auth whose calls are timed as 'supabase.auth.<method>'"""
+
+    def __init__(self, auth):
+        self.auth = auth
+
+    def __getattr__(self, name):
+        attribute = getattr(self.auth, name)
+        if not callable(attribute):
+            return attribute
+        return metrics.timed(f"supabase.auth.{name}")(attribute)
+
+class InstrumentedClient:
+    """Wraps the Supabase client (or a stand-in backend) so every call it makes shows up in metrics"""
+
+    def __init__(self, client):
+        self.client = client
+        self.auth = InstrumentedAuth(client.auth)
+
+    def table(self, name):
+        return InstrumentedQuery(self.client.table(name), name)
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+_supabase = None
+_lazy_import_lock = threading.Lock()
+
+# "module:factory" of a stand-in for the Supabase client, e.g. benchmarks.fake_supabase:FakeSupabase.
+# It needs the parts of supabase-py used here: table(name) queries (select/eq/gte/order/range/limit,
+# insert/upsert/delete, execute) and auth (sign_up, sign_in_with_password, set_session,
+# refresh_session, get_user, update_user, delete_user, admin.sign_out).
+BACKEND = os.environ.get("STILLMIND_BACKEND")
+
+def set_backend(backend):
+    """Send every Supabase call to `backend` instead, or back to the real client with None"""
+    global _supabase
+    with _lazy_import_lock:
+        _supabase = InstrumentedClient(backend) if backend is not None else None
+
+def get_supabase():
+    """Supabase client (or the configured backend), created on first use (safe to call from worker threads).
+    Every call through it is timed in `metrics`."""
+    global _supabase
+    if _supabase is None:
+        with _lazy_import_lock:
+            if _supabase is None and BACKEND:
+                module, _, factory = BACKEND.partition(":")
+                _supabase = InstrumentedClient(getattr(importlib.import_module(module), factory)())
+            if _supabase is None:
+                with startup_profile.phase("supabase client"):
+                    from supabase import create_client, ClientOptions
+                    from dotenv import load_dotenv
+                    load_dotenv()
+                    url = os.environ.get("SUPABASE_URL")
+                    key = os.environ.get("SUPABASE_KEY")
+                    # The App refreshes tokens itself so it can save the new ones (see App.schedule_token_refresh)
+                    _supabase = InstrumentedClient(
+                        create_client(url, key, options=ClientOptions(auto_refresh_token=False)))
+    return _supabase
+
+_mixer = None
+
+def get_mixer():
+    """pygame's mixer module, imported when sound first plays"""
+    global _mixer
+    if _mixer is None:
+        with startup_profile.phase("pygame"):
+            from pygame import mixer
+            _mixer = mixer
+    return _mixer
+
+def get_notifier():
+    """plyer's notification facade, imported when a reminder first fires"""
+    with startup_profile.phase("plyer"):
+        from plyer import notification
+    return notification
+
+def get_matplotlib(offscreen=False):
+    """(Figure, FigureCanvasTkAgg), imported when the stats graph is first drawn.
+    With offscreen=True the canvas is the plain Agg one, for drawing images off the Tk thread."""
+    # Figures are created directly rather than through pyplot, so no global figure manager holds on to them
+    with startup_profile.phase("matplotlib"):
+        from matplotlib.figure import Figure
+        if offscreen:
+            from matplotlib.backends.backend_agg import FigureCanvasAgg
+            return Figure, FigureCanvasAgg
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+    return Figure, FigureCanvasTkAgg
+
+# Log levels, e.g. "INFO" or "WARNING,sync=DEBUG,notifications=DEBUG"; overrides 'log_levels' in the app settings
+LOG_LEVEL = os.environ.get("STILLMIND_LOG_LEVEL", "")
+# Also write the log to the console (off by default, console writes are slow on Windows)
+LOG_CONSOLE = bool(os.environ.get("STILLMIND_LOG_CONSOLE"))
+# The log file is rotated at this size, keeping this many old files
+LOG_FILE_BYTES = 1024 * 1024
+LOG_BACKUPS = 3
+# Each subsystem logs to "stillmind.<subsystem>", so its level can be set on its own
+LOG_SUBSYSTEMS = ('app', 'startup', 'session', 'sync', 'cache', 'io', 'audio', 'ui', 'notifications')
+
+class RateLimitFilter(logging.Filter):
+    """Lets each message (by logger, level and format string) through at most BURST times per WINDOW seconds.
+
+    The first message after a quiet window says how many were dropped.
+    """
+
+    BURST = 5
+    WINDOW = 60
+    # Forget everything if this many different messages have been seen, so memory stays bounded
+    MAX_KEYS = 1000
+
+    def __init__(self):
+        super().__init__()
+        self.lock = threading.Lock()
+        self.seen = {}  # (logger, level, format string) -> [window start, messages in window]
+
+    def filter(self, record):
+        key = (record.name, record.levelno, str(record.msg))
+        now = time.monotonic()
+        with self.lock:
+            entry = self.seen.get(key)
+            if entry is None or now - entry[0] >= self.WINDOW:
+                if len(self.seen) >= self.MAX_KEYS:
+                    self.seen.clear()
+                dropped = entry[1] - self.BURST if entry else 0
+                entry = self.seen[key] = [now, 0]
+                if dropped > 0:
+                    record.msg = f"{record.msg} [{dropped} similar messages dropped]"
+            entry[1] += 1
+            return entry[1] <= self.BURST
+
+_log_listener = None
 
-# Set up logging
 def setup_logging():
+    """Log through a queue: callers only enqueue, a background thread formats and writes the rotating file"""
+    global _log_listener
     log_path = "stillmind_log.txt"
     if getattr(sys, 'frozen', False):
         # If running as executable
         log_path = os.path.join(os.path.dirname(sys.executable), "stillmind_log.txt")
-    
-    logging.basicConfig(
-        filename=log_path,
-        level=logging.DEBUG,
-        format='%(asctime)s - %(levelname)s - %(message)s'
-    )
+
+    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(name)s - %(threadName)s - %(message)s')
+    file_handler = logging.handlers.RotatingFileHandler(
+        log_path, maxBytes=LOG_FILE_BYTES, backupCount=LOG_BACKUPS, encoding='utf-8', delay=True)
+    handlers = [file_handler]
+    if LOG_CONSOLE:
+        handlers.append(logging.StreamHandler())
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    # Dropped on the calling thread, before anything is queued
+    queue_handler.addFilter(RateLimitFilter())
+    root = logging.getLogger()
+    root.addHandler(queue_handler)
+    # Other libraries only log warnings; our own loggers follow the configured levels
+    root.setLevel(logging.WARNING)
+    apply_log_levels()
+
+    _log_listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _log_listener.start()
+    atexit.register(stop_logging)
+
+def stop_logging():
+    """Write out everything still queued; called on exit (os._exit skips atexit, so App.on_closing calls it too)"""
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
+
+def parse_log_levels(spec):
+    """{subsystem: level} from "INFO,sync=DEBUG" or a dict like {'': 'INFO', 'sync': 'DEBUG'}; '' is every subsystem"""
+    if isinstance(spec, dict):
+        items = spec.items()
+    else:
+        items = [part.partition('=')[::2] if '=' in part else ('', part) for part in (spec or '').split(',')]
+    levels = {}
+    for subsystem, level in items:
+        level = str(level).strip().upper()
+        if isinstance(logging.getLevelName(level), int):
+            levels[str(subsystem).strip()] = level
+    return levels
+
+def apply_log_levels(settings_levels=None):
+    """Set each subsystem's level from the app settings, with STILLMIND_LOG_LEVEL taking precedence"""
+    levels = {'': 'INFO', **parse_log_levels(settings_levels), **parse_log_levels(LOG_LEVEL)}
+    logging.getLogger("stillmind").setLevel(levels.pop(''))
+    for subsystem in LOG_SUBSYSTEMS:
+        # NOTSET falls back to the "stillmind" level
+        logging.getLogger(f"stillmind.{subsystem}").setLevel(levels.get(subsystem, logging.NOTSET))
 
 setup_logging()
 
+app_log = logging.getLogger("stillmind.app")
+startup_log = logging.getLogger("stillmind.startup")
+session_log = logging.getLogger("stillmind.session")
+sync_log = logging.getLogger("stillmind.sync")
+cache_log = logging.getLogger("stillmind.cache")
+io_log = logging.getLogger("stillmind.io")
+audio_log = logging.getLogger("stillmind.audio")
+ui_log = logging.getLogger("stillmind.ui")
+notification_log = logging.getLogger("stillmind.notifications")
+
 def get_resource_path(relative_path):
     """Get absolute path to resource, works for dev and for PyInstaller/Nuitka"""
     try:
@@ -82,132 +444,468 @@ def get_app_data_path(filename):
     
     return os.path.join(app_dir, filename)
 
-def load_image(path, size=None):
-    """Safely load an image with error handling"""
-    try:
-        img_path = get_resource_path(path)
-        img = Image.open(img_path)
-        if size:
-            img = img.resize(size)
-        return img
-    except Exception as e:
-        print(f"Error loading image {path}: {e}")
-        return None
+class AssetRegistry:
+    """Decodes each image file once and shares pre-scaled variants and CTkImages between pages"""
 
-class ParticleBurst:
-    def __init__(self, canvas, x, y, colors=None):
-        if colors is None:
-            self.colors = ["#FF6B6B", "#4ECDC4", "#45B7D1", "#96CEB4", "#FFEEAD"]  # Default colors
+    # Variants are scaled for displays up to this much HiDPI scaling, and never scaled up
+    MAX_DISPLAY_SCALING = 2
+    # Released CTkImages kept around in case a page asks for them again
+    MAX_UNUSED = 8
+
+    def __init__(self):
+        self.sources = {}  # path -> decoded PIL image
+        self.variants = {}  # (path, size) -> PIL image scaled for that size
+        self.images = {}  # (light path, dark path, size) -> shared CTkImage
+        self.refcounts = {}  # same key -> number of holders
+        self.unused = OrderedDict()  # released keys, least recently released first
+
+    def source(self, path):
+        image = self.sources.get(path)
+        if image is None:
+            image = Image.open(get_resource_path(path))
+            image.load()  # Decode now and close the file
+            self.sources[path] = image
+        return image
+
+    def variant(self, path, size):
+        """The image at `path` scaled down once for widgets of `size`"""
+        image = self.variants.get((path, size))
+        if image is None:
+            image = self.source(path)
+            target = (size[0] * self.MAX_DISPLAY_SCALING, size[1] * self.MAX_DISPLAY_SCALING)
+            if image.width > target[0] and image.height > target[1]:
+                image = image.copy()
+                image.thumbnail(target)
+            self.variants[(path, size)] = image
+        return image
+
+    def acquire(self, path, size=(20, 20), dark_path=None):
+        """Shared CTkImage for a file (optionally a different file in dark mode); release() when done"""
+        key = (path, dark_path or path, size)
+        image = self.images.get(key)
+        if image is None:
+            image = ctk.CTkImage(
+                light_image=self.variant(path, size),
+                dark_image=self.variant(dark_path or path, size),
+                size=size
+            )
+            self.images[key] = image
+        self.refcounts[key] = self.refcounts.get(key, 0) + 1
+        self.unused.pop(key, None)
+        return image
+
+    def release(self, image):
+        for key, shared in self.images.items():
+            if shared is image:
+                break
         else:
-            self.colors = colors
-        
+            return
+        self.refcounts[key] -= 1
+        if self.refcounts[key] <= 0:
+            self.unused[key] = None
+            self.evict()
+
+    def evict(self):
+        while len(self.unused) > self.MAX_UNUSED:
+            key, _ = self.unused.popitem(last=False)
+            del self.images[key]
+            del self.refcounts[key]
+            # Drop decoded data nothing else is using
+            in_use = {path for light, dark, _ in self.images for path in (light, dark)}
+            for path in {key[0], key[1]} - in_use:
+                self.sources.pop(path, None)
+                for variant_key in [k for k in self.variants if k[0] == path]:
+                    del self.variants[variant_key]
+
+assets = AssetRegistry()
+
+class ParticleEngine:
+    """Click bursts for one canvas: particle state in parallel arrays, a pool of reused oval items and one timer"""
+
+    DEFAULT_COLORS = ["#FF6B6B", "#4ECDC4", "#45B7D1", "#96CEB4", "#FFEEAD"]
+    PARTICLES_PER_BURST = 15
+    MAX_PARTICLES = 300  # Bursts beyond this are trimmed so rapid clicking can't blow the frame budget
+    LIFETIME = 50  # Frames until a particle has faded out (alpha drops by 0.02 per frame)
+    FRAME_MS = 16  # ~60 FPS
+
+    def __init__(self, canvas):
         self.canvas = canvas
-        self.particles = []
-        self.create_particles(x, y)
-        self.animate()
-
-    def create_particles(self, x, y):
-        for _ in range(15):  # Increased number of particles
+        # Live particles occupy the first `live` slots of every array
+        self.x = array('d')
+        self.y = array('d')
+        self.vx = array('d')
+        self.vy = array('d')
+        self.size = array('d')
+        self.age = array('l')
+        self.ramp = []  # Fade ramp (list of colors) per particle
+        self.items = array('l')
+        self.live = 0
+        self.free_items = []  # Hidden ovals ready for reuse
+        self.ramps = {}  # base color -> color for every frame of the fade
+        self.timer = None
+
+    def color_ramp(self, color):
+        ramp = self.ramps.get(color)
+        if ramp is None:
+            hex_color = color.lstrip('#')
+            r, g, b = (int(hex_color[i:i+2], 16) for i in (0, 2, 4))
+            ramp = []
+            for frame in range(self.LIFETIME):
+                alpha = 1 - frame / self.LIFETIME
+                ramp.append(f'#{int(r*alpha):02x}{int(g*alpha):02x}{int(b*alpha):02x}')
+            self.ramps[color] = ramp
+        return ramp
+
+    def burst(self, x, y, colors=None):
+        colors = colors or self.DEFAULT_COLORS
+        count = min(self.PARTICLES_PER_BURST, self.MAX_PARTICLES - self.live)
+        for _ in range(count):
             angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(2, 6)  # Increased speed range
-            size = random.randint(3, 8)  # Increased size range
-            color = random.choice(self.colors)
-            
-            particle = {
-                'id': self.canvas.create_oval(x-size, y-size, x+size, y+size, 
-                                            fill=color, outline=""),
-                'x': x,
-                'y': y,
-                'vx': math.cos(angle) * speed,
-                'vy': math.sin(angle) * speed,
-                'size': size,
-                'alpha': 1.0
-            }
-            self.particles.append(particle)
-
-    def animate(self):
-        if not self.particles:
-            return
-        
-        for particle in self.particles[:]:
-            # Update position
-            particle['x'] += particle['vx']
-            particle['y'] += particle['vy']
-            
-            # Update alpha (fade out more slowly)
-            particle['alpha'] -= 0.02  # Reduced from 0.05 to 0.02
-            
-            if particle['alpha'] <= 0:
-                self.canvas.delete(particle['id'])
-                self.particles.remove(particle)
+            speed = random.uniform(2, 6)
+            size = random.randint(3, 8)
+            ramp = self.color_ramp(random.choice(colors))
+            if self.free_items:
+                item = self.free_items.pop()
+                self.canvas.coords(item, x-size, y-size, x+size, y+size)
+                self.canvas.itemconfig(item, fill=ramp[0], state='normal')
             else:
-                # Move particle
-                self.canvas.moveto(particle['id'], 
-                                 particle['x'] - particle['size'],
-                                 particle['y'] - particle['size'])
-                
-                # Update opacity
-                current_color = self.canvas.itemcget(particle['id'], 'fill')
-                rgb = self.hex_to_rgb(current_color)
-                new_color = self.rgb_to_hex(*rgb, particle['alpha'])
-                self.canvas.itemconfig(particle['id'], fill=new_color)
-        
-        if self.particles:
-            self.canvas.after(16, self.animate)  # ~60 FPS
-
-    @staticmethod
-    def hex_to_rgb(hex_color):
-        hex_color = hex_color.lstrip('#')
-        return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
-
-    @staticmethod
-    def rgb_to_hex(r, g, b, alpha=1.0):
-        return f'#{int(r*alpha):02x}{int(g*alpha):02x}{int(b*alpha):02x}'
+                item = self.canvas.create_oval(x-size, y-size, x+size, y+size, fill=ramp[0], outline="")
+            self.add(x, y, math.cos(angle) * speed, math.sin(angle) * speed, size, ramp, item)
+        if self.live and self.timer is None:
+            self.timer = self.canvas.after(self.FRAME_MS, self.step)
+
+    def add(self, x, y, vx, vy, size, ramp, item):
+        i = self.live
+        if i == len(self.items):
+            self.x.append(x)
+            self.y.append(y)
+            self.vx.append(vx)
+            self.vy.append(vy)
+            self.size.append(size)
+            self.age.append(0)
+            self.ramp.append(ramp)
+            self.items.append(item)
+        else:
+            self.x[i], self.y[i], self.vx[i], self.vy[i] = x, y, vx, vy
+            self.size[i], self.age[i], self.ramp[i], self.items[i] = size, 0, ramp, item
+        self.live += 1
+
+    def remove(self, i):
+        """Hide particle i for reuse and move the last live particle into its slot"""
+        self.canvas.itemconfig(self.items[i], state='hidden')
+        self.free_items.append(self.items[i])
+        last = self.live - 1
+        if i != last:
+            self.x[i], self.y[i], self.vx[i], self.vy[i] = self.x[last], self.y[last], self.vx[last], self.vy[last]
+            self.size[i], self.age[i], self.ramp[i], self.items[i] = self.size[last], self.age[last], self.ramp[last], self.items[last]
+        self.live = last
+
+    def step(self):
+        """Advance every live particle one frame; the timer stops once none are left"""
+        self.timer = None
+        canvas = self.canvas
+        i = 0
+        while i < self.live:
+            age = self.age[i] + 1
+            if age >= self.LIFETIME:
+                self.remove(i)  # Another particle now sits in slot i
+                continue
+            self.age[i] = age
+            x = self.x[i] = self.x[i] + self.vx[i]
+            y = self.y[i] = self.y[i] + self.vy[i]
+            size = self.size[i]
+            item = self.items[i]
+            canvas.coords(item, x-size, y-size, x+size, y+size)
+            canvas.itemconfig(item, fill=self.ramp[i][age])
+            i += 1
+        if self.live:
+            self.timer = canvas.after(self.FRAME_MS, self.step)
+
+    def stop(self):
+        if self.timer is not None:
+            self.canvas.after_cancel(self.timer)
+            self.timer = None
 
 class BackgroundCanvas(ctk.CTkCanvas):
     def __init__(self, parent, **kwargs):
         super().__init__(parent, highlightthickness=0, borderwidth=0, **kwargs)
         self.bind('<Button-1>', self.create_burst)
         self.parent = parent
+        self.particles = ParticleEngine(self)
         
-        # Load background images
-        self.bg_dark = ctk.CTkImage(
-            light_image=Image.open(get_resource_path("images/dark_background.jpg")),
-            dark_image=Image.open(get_resource_path("images/dark_background.jpg")),
-            size=(800, 600)  # Adjust size to match your window
-        )
-        self.bg_light = ctk.CTkImage(
-            light_image=Image.open(get_resource_path("images/light_background.jpg")),
-            dark_image=Image.open(get_resource_path("images/light_background.jpg")),
-            size=(800, 600)  # Adjust size to match your window
-        )
+        # Background images are decoded once and shared by every page
+        self.bg_dark = assets.acquire("images/dark_background.jpg", (800, 600))  # Adjust size to match your window
+        self.bg_light = assets.acquire("images/light_background.jpg", (800, 600))
         
         # Create background image label
         self.bg_label = ctk.CTkLabel(self, text="", image=self.bg_dark)
         self.bg_label.place(relx=0, rely=0, relwidth=1, relheight=1)
         
-        # Initial background color setup
+        # Initial background color setup; theme changes come through the App's StyleRegistry
         self.update_background_color()
-        
-        # Bind to theme changes
-        self.bind('<Configure>', lambda e: self.update_background_color())
 
-    def update_background_color(self):
+    def destroy(self):
+        self.particles.stop()
+        assets.release(self.bg_dark)
+        assets.release(self.bg_light)
+        super().destroy()
+
+    def update_background_color(self, theme=None):
         # Update background image based on theme
-        if ctk.get_appearance_mode() == "Dark":
+        if (theme or ctk.get_appearance_mode()) == "Dark":
             self.bg_label.configure(image=self.bg_dark)
         else:
             self.bg_label.configure(image=self.bg_light)
 
     def create_burst(self, event):
-        ParticleBurst(self, event.x, event.y)
+        self.particles.burst(event.x, event.y)
+
+class IOExecutor:
+    """Runs blocking network calls on worker threads and delivers the results on the Tk thread"""
+
+    # How often the Tk thread checks for finished calls while any are outstanding, in ms
+    POLL_INTERVAL = 15
+
+    def __init__(self, root, max_workers=4):
+        self.root = root
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="stillmind-io")
+        # Writes share one worker so they reach Supabase in the order they were made
+        self.write_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="stillmind-write")
+        self.results = queue.SimpleQueue()
+        self.pending = 0
+        self.poll_job = None
+
+    def submit(self, fn, *args, on_success=None, on_error=None, ordered=False):
+        """Run fn(*args) in the background; callbacks run on the Tk thread. Call from the Tk thread."""
+        future = (self.write_pool if ordered else self.pool).submit(fn, *args)
+        self.pending += 1
+        future.add_done_callback(lambda f: self.results.put((f, on_success, on_error)))
+        if self.poll_job is None:
+            self.poll_job = self.root.after(self.POLL_INTERVAL, self.poll)
+        return future
+
+    def poll(self):
+        self.poll_job = None
+        while True:
+            try:
+                future, on_success, on_error = self.results.get_nowait()
+            except queue.Empty:
+                break
+            self.pending -= 1
+            try:
+                error = future.exception()
+                if error is None:
+                    if on_success:
+                        on_success(future.result())
+                else:
+                    io_log.warning("Background call failed: %s", error)
+                    if on_error:
+                        on_error(error)
+            except Exception as e:
+                io_log.exception("Error handling background result: %s", e)
+
+        if self.pending > 0:
+            self.poll_job = self.root.after(self.POLL_INTERVAL, self.poll)
+
+    def shutdown(self):
+        # Writes are journaled before they are queued, so an unfinished sync simply replays on the next start
+        # instead of holding the window open for as long as a hung request takes
+        self.pool.shutdown(wait=False, cancel_futures=True)
+        self.write_pool.shutdown(wait=False, cancel_futures=True)
+
+class AudioEngine:
+    """pygame mixer set up on first use: breathing cues pre-decoded on reserved channels, background music streamed"""
+
+    FREQUENCY = 44100
+    BUFFER = 512  # Samples per mix; ~12 ms at 44.1 kHz keeps cue onset short without underruns on slow machines
+    CUE_CHANNELS = 2  # Reserved so nothing else can take the channel a cue needs
+    CUES = ('inhale', 'hold', 'exhale')
+    FADE_MS = 2000  # Fade between playlist tracks, and in at the start
+    POLL_MS = 250
+
+    def __init__(self, root, directory="audio"):
+        self.root = root
+        self.directory = directory
+        self.ready = False
+        self.failed = False
+        self.mixer = None
+        self.cues = {}  # name -> Sound, decoded to the mixer's format
+        self.cue_channels = []
+        self.next_channel = 0
+        self.playlist = None  # Background tracks, found on first use
+        self.track = 0
+        self.track_length = None
+        self.fading = False
+        self.music_playing = False
+        self.poll_job = None
+        self.buffer_latency_ms = 0
+
+    def find(self, name):
+        """Paths of audio files whose name starts with `name`, ignoring case (the files are Inhale.wav etc.)"""
+        try:
+            files = sorted(os.listdir(get_resource_path(self.directory)))
+        except OSError:
+            return []
+        return [
+            get_resource_path(os.path.join(self.directory, file)) for file in files
+            if file.lower().startswith(name) and file.lower().endswith(('.wav', '.ogg', '.mp3'))
+        ]
+
+    def load(self):
+        """Initialize the mixer and decode the cues, once; False if audio is unavailable"""
+        if self.ready or self.failed:
+            return self.ready
+        try:
+            mixer = get_mixer()
+            mixer.pre_init(self.FREQUENCY, -16, 2, self.BUFFER)
+            mixer.init()
+            mixer.set_reserved(self.CUE_CHANNELS)
+            self.cue_channels = [mixer.Channel(i) for i in range(self.CUE_CHANNELS)]
+            for name in self.CUES:
+                paths = self.find(name)
+                if paths:
+                    self.cues[name] = mixer.Sound(paths[0])
+            frequency = (mixer.get_init() or (self.FREQUENCY,))[0]
+            self.buffer_latency_ms = self.BUFFER / frequency * 1000
+            self.mixer = mixer
+            self.ready = True
+        except Exception as e:
+            self.failed = True
+            audio_log.warning("Error loading audio files: %s", e)
+        return self.ready
+
+    def play_cue(self, name):
+        start = time.perf_counter()
+        sound = self.cues.get(name) if self.load() else None
+        if not sound:
+            return
+        channel = self.cue_channels[self.next_channel]
+        self.next_channel = (self.next_channel + 1) % len(self.cue_channels)
+        channel.play(sound)
+        # Cue onset latency: the play() call plus one mixer buffer
+        metrics.observe("audio.cue_latency", (time.perf_counter() - start) * 1000 + self.buffer_latency_ms)
+
+    def stop_cues(self):
+        for channel in self.cue_channels:
+            channel.stop()
+
+    def play_music(self):
+        """Stream the background track(s) from disk; several tracks play in turn with a fade between them"""
+        if self.playlist is None:
+            self.playlist = self.find("background")
+        if not self.playlist or self.music_playing or not self.load():
+            return
+        self.music_playing = True
+        self.start_track(self.track)
+
+    def start_track(self, index):
+        self.track = index % len(self.playlist)
+        path = self.playlist[self.track]
+        try:
+            self.mixer.music.load(path)
+            # A single track just loops; a playlist moves on when each track ends
+            self.mixer.music.play(loops=-1 if len(self.playlist) == 1 else 0, fade_ms=self.FADE_MS)
+        except Exception as e:
+            audio_log.warning("Error playing background music: %s", e)
+            self.music_playing = False
+            return
+        self.track_length = None
+        if path.lower().endswith('.wav'):
+            try:
+                with wave.open(path) as track:
+                    self.track_length = track.getnframes() / track.getframerate() * 1000
+            except (wave.Error, OSError):
+                pass
+        self.fading = False
+        if len(self.playlist) > 1 and self.poll_job is None:
+            self.poll_job = self.root.after(self.POLL_MS, self.poll_music)
+
+    def poll_music(self):
+        """Fade the current track out near its end and start the next one"""
+        self.poll_job = None
+        if not self.music_playing:
+            return
+        music = self.mixer.music
+        if not music.get_busy():
+            self.start_track(self.track + 1)
+            return
+        if not self.fading and self.track_length and music.get_pos() >= self.track_length - self.FADE_MS:
+            # mixer.music is a single stream, so tracks fade out and in rather than overlap
+            music.fadeout(self.FADE_MS)
+            self.fading = True
+        self.poll_job = self.root.after(self.POLL_MS, self.poll_music)
+
+    def stop_music(self):
+        self.music_playing = False
+        if self.poll_job is not None:
+            self.root.after_cancel(self.poll_job)
+            self.poll_job = None
+        if self.ready:
+            self.mixer.music.fadeout(300)
+
+    def shutdown(self):
+        if self.ready:
+            self.mixer.quit()
+            self.ready = False
+
+def decode_jwt_claims(token):
+    """Claims of a JWT read locally, without checking the signature; only used to plan ahead"""
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        return json.loads(base64.urlsafe_b64decode(payload))
+    except (AttributeError, IndexError, ValueError):
+        return None
+
+def is_session_rejected(error):
+    """Whether Supabase refused the tokens, as opposed to not being reachable"""
+    from supabase_auth.errors import AuthApiError, AuthSessionMissingError, AuthInvalidJwtError
+    if isinstance(error, (AuthSessionMissingError, AuthInvalidJwtError)):
+        return True
+    return isinstance(error, AuthApiError) and 400 <= (error.status or 0) < 500
 
 class App(ctk.CTk):
+    # Refresh the access token this long before it expires
+    TOKEN_REFRESH_MARGIN = 60
+    # Longest wait between attempts to reach Supabase with a saved session while offline, in ms
+    MAX_RETRY_DELAY = 5 * 60 * 1000
+    # How often the metrics snapshot in the app data directory is rewritten, in ms
+    METRICS_SNAPSHOT_MS = 60 * 1000
+    # Cycles are synced this long after the last one (or on leaving MainPage), so a session's
+    # cycles cost one read-modify-write of the stats row rather than one per cycle, in ms
+    CYCLE_SYNC_DELAY = 30 * 1000
+
     def __init__(self):
-        super().__init__()
+        with startup_profile.phase("tk window"):
+            super().__init__()
         
         # Initialize data_handler as None at start
         self.data_handler = None
+        # Access token of the current session, so logging out revokes that session and no later one
+        self.access_token = None
+        self.refresh_job = None
+        self.retry_delay = 15000
+        # Replay of the offline outbox: one at a time, retried with backoff like the session
+        self.sync_running = False
+        self.sync_again = False
+        self.sync_job = None
+        self.sync_delay = 15000
+        self.sync_deferred = False
+        
+        # Settings of whoever is logged in, held in memory
+        self.settings_store = SettingsStore(save=self.save_user_data)
+        self.settings_store.subscribe(self.apply_theme, 'theme')
+        # Every change, so log levels go back to the defaults on logout too
+        self.settings_store.subscribe(lambda changed: apply_log_levels(self.settings_store.log_levels()))
+        
+        # Network calls run here so they never block the window
+        self.io = IOExecutor(self)
+        
+        # Sound is set up the first time something plays
+        self.audio = AudioEngine(self)
+        
+        # Theme colors for every page's widgets
+        self.styles = StyleRegistry()
         
         # Set up proper window close handling
         self.protocol("WM_DELETE_WINDOW", self.on_closing)
@@ -219,8 +917,12 @@ class App(ctk.CTk):
         self.geometry("800x600")
         self.resizable(False, False)
         
-        # Initialize notification manager and connect data_handler later after login
+        # Reminders follow the settings store, which saves them for the current user
         self.notification_manager = NotificationManager()
+        self.settings_store.subscribe(
+            lambda changed: self.notification_manager.update_settings(self.settings_store.reminder_settings()),
+            'notifications'
+        )
         self.notification_manager.start_notification_thread()
         
         # Create container
@@ -229,30 +931,83 @@ class App(ctk.CTk):
         self.container.grid_rowconfigure(0, weight=1)
         self.container.grid_columnconfigure(0, weight=1)
         
-        # Check for saved session BEFORE creating frames
-        self.check_saved_session()
-        
-        # Initialize frames dictionary
+        # Pages are built the first time they are shown, or while the app is idle
         self.frames = {}
+        self.current_frame = None
+        self.warm_up_queue = []
+        self.bind("<Map>", self.on_first_map)
         
-        # Add all pages to the frames dictionary
-        for F in (LoginPage, StartingPage, MainPage, StatsPage, SettingsPage, AchievementsPage, HelpPage, AccountPage):
-            frame = F(self.container, self)
-            self.frames[F] = frame
-            frame.grid(row=0, column=0, sticky="nsew")
+        # Timings of every call and page, saved now and then and shown on Ctrl+Shift+D
+        self.metrics_path = get_app_data_path("stillmind_metrics.json")
+        self.diagnostics = None
+        self.bind_all("<Control-Shift-D>", self.show_diagnostics)
+        self.after(self.METRICS_SNAPSHOT_MS, self.save_metrics)
+        
+        # Check for saved session BEFORE creating frames
+        with startup_profile.phase("session restore"):
+            self.check_saved_session()
         
         # Show the starting frame based on login state
-        if self.data_handler:
-            print("Auto-login successful, showing StartingPage")
-            self.show_frame(StartingPage)
-            # Apply theme if user is already logged in
-            self.apply_theme_from_settings()
-        else:
-            print("No active session, showing LoginPage")
-            self.show_frame(LoginPage)
+        with startup_profile.phase("first frame"):
+            if self.data_handler:
+                session_log.info("Auto-login successful, showing StartingPage")
+                self.show_frame(StartingPage)
+            else:
+                session_log.info("No active session, showing LoginPage")
+                self.show_frame(LoginPage)
+        
+        # Build the rest in the order they are most likely to be opened
+        self.warm_up_queue = [
+            F for F in (StartingPage, MainPage, StatsPage, AchievementsPage, SettingsPage, AccountPage, HelpPage, LoginPage)
+            if F not in self.frames
+        ]
+        self.after_idle(self.warm_up_next_page)
+
+    def save_metrics(self):
+        """Write the metrics snapshot in the background, then schedule the next one"""
+        self.io.submit(metrics.save, self.metrics_path, on_error=lambda e: app_log.warning("Error saving metrics: %s", e))
+        self.after(self.METRICS_SNAPSHOT_MS, self.save_metrics)
+
+    def show_diagnostics(self, event=None):
+        if self.diagnostics is not None and self.diagnostics.winfo_exists():
+            self.diagnostics.lift()
+            return
+        self.diagnostics = DiagnosticsPanel(self)
+
+    def on_first_map(self, event):
+        if event.widget is self:
+            self.unbind("<Map>")
+            startup_log.info("Window visible after %.0f ms", (time.perf_counter() - APP_START) * 1000)
+            startup_profile.report("window visible")
+
+    def get_frame(self, cont):
+        """Return the page for a class, building it on first use"""
+        frame = self.frames.get(cont)
+        if frame is None:
+            with metrics.span(f"page.build.{cont.__name__}"):
+                frame = cont(self.container, self)
+            self.frames[cont] = frame
+            frame.grid(row=0, column=0, sticky="nsew")
+            self.styles.register_tree(frame)
+            self.styles.apply(frame)
+            # A newly gridded page stacks on top, keep the visible one in front
+            if self.current_frame is not None:
+                self.current_frame.tkraise()
+        return frame
+
+    def warm_up_next_page(self):
+        """Build one page per idle slot so input is never blocked for long"""
+        while self.warm_up_queue:
+            cont = self.warm_up_queue.pop(0)
+            if cont not in self.frames:
+                self.get_frame(cont)
+                break
+        if self.warm_up_queue:
+            # Give pending input a chance before building the next page
+            self.after(50, lambda: self.after_idle(self.warm_up_next_page))
 
     def check_saved_session(self):
-        """Check for saved login session and auto-login if valid"""
+        """Restore a saved login from local data only; the server confirms it in the background"""
         try:
             # Check if session file exists
             session_file = os.path.join(os.path.expanduser("~"), ".stillmind_session")
@@ -260,34 +1015,197 @@ class App(ctk.CTk):
                 with open(session_file, "r") as f:
                     session_data = json.load(f)
                 
-                # Check if session is not expired
-                expires_at = datetime.fromisoformat(session_data.get("expires_at", "2000-01-01"))
-                if expires_at > datetime.now():
-                    # Try to restore session
-                    user_id = session_data.get("user_id")
-                    access_token = session_data.get("access_token")
-                    refresh_token = session_data.get("refresh_token")
-                    
-                    if user_id and access_token and refresh_token:
-                        # Set Supabase access token
-                        try:
-                            # Set the session with both tokens
-                            supabase.auth.set_session(access_token, refresh_token)
-                            
-                            # Initialize data handler
-                            self.data_handler = DataHandling(user_id)
-                            print(f"Auto-login successful for user: {user_id}")
-                            return
-                        except Exception as e:
-                            print(f"Error restoring session: {e}")
+                access_token = session_data.get("access_token")
+                refresh_token = session_data.get("refresh_token")
+                # The token itself says who it belongs to; an expired one is refreshed in the background
+                claims = decode_jwt_claims(access_token) or {}
+                user_id = claims.get("sub") or session_data.get("user_id")
+                
+                if user_id and access_token and refresh_token:
+                    # Show the user's pages from the local cache straight away
+                    self.set_user(DataHandling(user_id), from_cache=True)
+                    self.restore_session(access_token, refresh_token)
+                    session_log.info("Restoring session for user: %s", user_id)
+                    return
         except Exception as e:
-            print(f"Error during auto-login: {e}")
+            session_log.error("Error during auto-login: %s", e)
         
         # If we get here, no valid session was found
-        self.data_handler = None
+        self.set_user(None)
+
+    def restore_session(self, access_token, refresh_token):
+        """Hand the saved tokens to Supabase and load the user's data, without blocking the window"""
+        data_handler = self.data_handler
+        self.access_token = access_token
+        self.io.submit(
+            self.session_handshake, data_handler, access_token, refresh_token,
+            on_success=lambda session: self.finish_restore(data_handler, session),
+            on_error=lambda e: self.restore_failed(data_handler, access_token, refresh_token, e)
+        )
+
+    @staticmethod
+    def session_handshake(data_handler, access_token, refresh_token):
+        """Runs on an I/O worker: set (and if expired, refresh) the session, then prefetch the user's tables"""
+        session = get_supabase().auth.set_session(access_token, refresh_token).session
+        if session is None:
+            from supabase_auth.errors import AuthSessionMissingError
+            raise AuthSessionMissingError()
+        try:
+            data_handler.bootstrap()
+        except Exception as e:
+            # Pages fall back to fetching each table on demand
+            session_log.warning("Error loading user data: %s", e)
+        return session
+
+    def finish_restore(self, data_handler, session):
+        if data_handler is not self.data_handler:
+            return  # Logged out in the meantime
+        self.retry_delay = 15000
+        self.session_ready(session)
+        # Settings may have changed on another device since they were cached
+        self.settings_store.load(data_handler, from_cache=True)
+        # Back online: send whatever was recorded while we weren't
+        self.sync_outbox()
+        session_log.info("Auto-login successful for user: %s", data_handler.user_id)
+
+    def restore_failed(self, data_handler, access_token, refresh_token, error):
+        if data_handler is not self.data_handler:
+            return
+        if is_session_rejected(error):
+            session_log.warning("Saved session is no longer valid: %s", error)
+            self.clear_session()
+            return
+        # Offline or Supabase unreachable: keep working from the cache and try again later
+        session_log.warning("Could not reach Supabase to restore the session, retrying: %s", error)
+        self.after(self.retry_delay, lambda: self.data_handler is data_handler and self.restore_session(access_token, refresh_token))
+        self.retry_delay = min(self.retry_delay * 2, self.MAX_RETRY_DELAY)
+
+    def session_ready(self, session):
+        """Save a confirmed or refreshed session and plan its next refresh"""
+        self.save_session(
+            self.data_handler.user_id, session.access_token, session.refresh_token,
+            datetime.fromtimestamp(session.expires_at) if session.expires_at else datetime.now()
+        )
+        self.schedule_token_refresh(session.access_token)
+
+    def schedule_token_refresh(self, access_token):
+        """Refresh the session shortly before the access token expires, so no request has to wait for it"""
+        if self.refresh_job:
+            self.after_cancel(self.refresh_job)
+            self.refresh_job = None
+        expires = (decode_jwt_claims(access_token) or {}).get("exp")
+        if expires:
+            delay = max(0, expires - time.time() - self.TOKEN_REFRESH_MARGIN)
+            self.refresh_job = self.after(int(delay * 1000), self.refresh_token)
+
+    def refresh_token(self):
+        self.refresh_job = None
+        data_handler = self.data_handler
+        if not data_handler:
+            return
+        self.io.submit(
+            lambda: get_supabase().auth.refresh_session().session,
+            on_success=lambda session: data_handler is self.data_handler and self.session_ready(session),
+            on_error=lambda e: self.refresh_failed(data_handler, e)
+        )
+
+    def refresh_failed(self, data_handler, error):
+        if data_handler is not self.data_handler:
+            return
+        if is_session_rejected(error):
+            session_log.warning("Session could not be refreshed: %s", error)
+            self.clear_session()
+            return
+        session_log.warning("Token refresh failed, retrying: %s", error)
+        self.refresh_job = self.after(30000, self.refresh_token)
         
+    def set_user(self, data_handler, from_cache=False):
+        """Make a user (or nobody) current and apply their settings, without touching the network here"""
+        self.data_handler = data_handler
+        fetch = not from_cache and data_handler is not None and not SettingsStore.is_cached(data_handler)
+        # Whatever is cached (usually all of it, the login prefetches it) applies straight away
+        self.settings_store.load(data_handler, from_cache=True)
+        if fetch:
+            # Cold cache, e.g. the prefetch failed: load the rest in the background
+            self.io.submit(
+                SettingsStore.fetch, data_handler,
+                on_success=lambda settings: self.settings_loaded(data_handler, settings),
+                on_error=lambda e: ui_log.warning("Error loading settings: %s", e)
+            )
+
+    def settings_loaded(self, data_handler, settings):
+        if data_handler is self.data_handler:
+            self.settings_store.apply(data_handler, *settings)
+
+    def save_user_data(self, table, value, on_error=None, defer=False):
+        """Update the local cache right away, journal the write and sync it to Supabase in the background.
+
+        on_error is only called if the write couldn't be journaled; while offline it waits in the outbox.
+        With defer the sync waits for the end of the session, see defer_sync().
+        """
+        if not self.data_handler:
+            return
+        try:
+            self.data_handler.journal_row(table, value)
+        except sqlite3.Error as e:
+            sync_log.error("Error journaling %s: %s", table, e)
+            if on_error:
+                on_error(e)
+            return
+        if defer:
+            self.defer_sync()
+        else:
+            self.sync_outbox()
+
+    def sync_outbox(self):
+        """Replay the current user's journaled writes in the background, retrying with backoff while offline"""
+        data_handler = self.data_handler
+        if not data_handler:
+            return
+        if self.sync_running:
+            # Picked up as soon as the current replay finishes
+            self.sync_again = True
+            return
+        if self.sync_job:
+            self.after_cancel(self.sync_job)
+            self.sync_job = None
+        self.sync_deferred = False
+        self.sync_running = True
+        self.io.submit(
+            data_handler.sync_outbox, ordered=True,
+            on_success=lambda count: self.sync_finished(data_handler, count),
+            on_error=lambda e: self.sync_finished(data_handler, error=e)
+        )
+
+    def defer_sync(self):
+        """Sync the outbox CYCLE_SYNC_DELAY after the last call, batching the cycles of a session"""
+        if self.sync_job:
+            self.after_cancel(self.sync_job)
+        self.sync_job = self.after(self.CYCLE_SYNC_DELAY, self.sync_outbox)
+        self.sync_deferred = True
+
+    def sync_finished(self, data_handler, count=0, error=None):
+        self.sync_running = False
+        again, self.sync_again = self.sync_again, False
+        if data_handler is not self.data_handler:
+            # A sync asked for meanwhile was for the user now logged in
+            if again:
+                self.sync_outbox()
+            return
+        if error is None:
+            self.sync_delay = 15000
+            if count:
+                sync_log.info("Synced %d queued writes", count)
+            if again:
+                self.sync_outbox()
+            return
+        sync_log.warning("Could not sync queued writes, retrying: %s", error)
+        self.sync_job = self.after(self.sync_delay, self.sync_outbox)
+        self.sync_delay = min(self.sync_delay * 2, self.MAX_RETRY_DELAY)
+
     def save_session(self, user_id, access_token, refresh_token, expires_at):
         """Save login session for auto-login"""
+        self.access_token = access_token
         try:
             session_data = {
                 "user_id": user_id,
@@ -300,18 +1218,36 @@ class App(ctk.CTk):
             with open(session_file, "w") as f:
                 json.dump(session_data, f)
             
-            print(f"Session saved for user: {user_id}")
+            session_log.info("Session saved for user: %s", user_id)
         except Exception as e:
-            print(f"Error saving session: {e}")
+            session_log.error("Error saving session: %s", e)
 
     def logout(self):
         """Log out the current user"""
+        # Revoke the session in the background, after any writes already on the write worker. Only
+        # this session's token: signing the client out could end a login made in the meantime
+        access_token = self.access_token
+        if access_token:
+            self.io.submit(
+                lambda: get_supabase().auth.admin.sign_out(access_token, "local"), ordered=True,
+                on_success=lambda _: session_log.info("Logout successful"),
+                on_error=lambda e: session_log.error("Error during logout: %s", e)
+            )
+        self.clear_session()
+
+    def clear_session(self):
+        """Forget the current user locally and go back to the login page"""
         try:
-            # Clear Supabase session
-            supabase.auth.sign_out()
+            if self.refresh_job:
+                self.after_cancel(self.refresh_job)
+                self.refresh_job = None
+            if self.sync_job:
+                self.after_cancel(self.sync_job)
+                self.sync_job = None
             
-            # Clear data handler
-            self.data_handler = None
+            # Clear data handler and go back to the default settings
+            self.set_user(None)
+            self.access_token = None
             
             # Remove session file
             session_file = os.path.join(os.path.expanduser("~"), ".stillmind_session")
@@ -324,101 +1260,177 @@ class App(ctk.CTk):
             
             # Show login page
             self.show_frame(LoginPage)
-            
-            print("Logout successful")
         except Exception as e:
-            print(f"Error during logout: {e}")
+            session_log.error("Error clearing session: %s", e)
 
-    def apply_theme_from_settings(self):
-        """Load and apply theme and sound settings from database settings"""
-        if self.data_handler:
-            settings = self.data_handler.get_settings()
-            
-            # Apply theme
-            theme = settings.get('theme', 'dark')
-            ctk.set_appearance_mode(theme)
-            
-            # Apply sound settings
-            should_play_sound = settings.get('sound', True)
-            if MainPage in self.frames:
-                self.frames[MainPage].toggle_background_music(should_play_sound)
-            
-            # Update button colors
-            button_color = get_button_color()
-            for frame in self.frames.values():
-                for widget in frame.winfo_children():
-                    if isinstance(widget, ctk.CTkButton):
-                        widget.configure(fg_color=button_color)
-                        
-            # Update all background canvases
-            for frame in self.frames.values():
-                if hasattr(frame, 'bg_canvas'):
-                    frame.bg_canvas.update_background_color()
+    def apply_theme(self, changed=None):
+        """Apply the theme setting to the window and the pages built so far"""
+        ctk.set_appearance_mode(self.settings_store.theme())
+        
+        # Restyle the page on screen now; the others are restyled when they are next shown
+        self.styles.apply(self.current_frame)
 
     def show_frame(self, cont):
-        frame = self.frames[cont]
-        frame.tkraise()
-        
-        # Update frame-specific content
-        if cont == AccountPage:
-            # Refresh account page content when shown
-            if hasattr(frame, 'load_user_info'):
-                frame.load_user_info()
-                
-        if hasattr(frame, 'bg_canvas'):
-            frame.bg_canvas.update_background_color()
+        """Raise a page, building it if needed; timed per page as page.show.<Page>"""
+        with metrics.span(f"page.show.{cont.__name__}"):
+            frame = self.get_frame(cont)
+            self.styles.apply(frame)
+            frame.tkraise()
+            self.current_frame = frame
+            if self.sync_deferred and cont is not MainPage:
+                # The session is over, send its cycles now
+                self.sync_outbox()
         
-        # Other existing show_frame code...
-        if cont == MainPage:
-            # Reload settings from database before showing the page
-            if self.data_handler:
-                self.frames[MainPage].settings = self.data_handler.get_settings()
-                # Apply sound settings
-                should_play_sound = self.frames[MainPage].settings.get('sound', True)
-                self.frames[MainPage].toggle_background_music(should_play_sound)
-            self.frames[MainPage].create_progress_indicators()
-            self.frames[MainPage].start_countdown()
-        elif cont == StatsPage:
-            self.frames[MainPage].stop_exercise()
-            self.frames[StatsPage].update_graph()
-        elif cont == SettingsPage:
-            # Refresh settings when entering settings page
-            if self.data_handler:
-                self.frames[SettingsPage].refresh_settings_from_database()
-        elif cont == AchievementsPage:
-            # Refresh achievements when showing achievements page
-            self.frames[AchievementsPage].update_achievements()
-            
-        # Update notification manager if data_handler exists
-        if self.data_handler:
-            self.notification_manager.set_data_handler(self.data_handler)
+            # Update frame-specific content
+            if cont == AccountPage:
+                # Refresh account page content when shown
+                if hasattr(frame, 'load_user_info'):
+                    frame.load_user_info()
+
+            # Other existing show_frame code...
+            if cont == MainPage:
+                if self.data_handler:
+                    # Apply sound settings
+                    self.frames[MainPage].toggle_background_music(self.settings_store.sound_enabled())
+                self.frames[MainPage].create_progress_indicators()
+                self.frames[MainPage].start_countdown()
+            elif cont == StatsPage:
+                if MainPage in self.frames:
+                    self.frames[MainPage].stop_exercise()
+                self.frames[StatsPage].update_graph()
+            elif cont == SettingsPage:
+                # Refresh settings when entering settings page
+                self.frames[SettingsPage].refresh_from_store()
+            elif cont == AchievementsPage:
+                # Refresh achievements when showing achievements page
+                self.frames[AchievementsPage].update_achievements()
 
     def on_closing(self):
         """Handle proper shutdown of the application"""
         try:
             # Stop any playing sounds
-            mixer.quit()
+            self.audio.shutdown()
             
             # Stop notification thread if running
             if hasattr(self, 'notification_manager'):
                 self.notification_manager.stop_notification_thread()
             
+            # Stop background calls; unsynced writes stay in the outbox
+            self.io.shutdown()
+            
+            # Keep the timings of this run
+            try:
+                metrics.save(self.metrics_path)
+            except OSError as e:
+                app_log.warning("Error saving metrics: %s", e)
+            
             # Stop any other background threads here
             
             # Destroy the window
             self.destroy()
             
+            # os._exit skips atexit, so write out the log first
+            stop_logging()
+            
             # Force exit the program
             os._exit(0)
         except Exception as e:
-            print(f"Error during shutdown: {e}")
+            app_log.error("Error during shutdown: %s", e)
+            stop_logging()
             os._exit(1)
 
+class DiagnosticsPanel(ctk.CTkToplevel):
+    """Hidden window (Ctrl+Shift+D) listing the slowest calls and pages, refreshed while open"""
+
+    REFRESH_MS = 1000
+
+    def __init__(self, controller):
+        super().__init__(controller)
+        self.title("StillMind diagnostics")
+        self.geometry("760x480")
+        self.text = ctk.CTkTextbox(self, font=("Courier", 12), wrap="none")
+        self.text.pack(fill="both", expand=True, padx=10, pady=10)
+        self.refresh()
+
+    def refresh(self):
+        if not self.winfo_exists():
+            return
+        snapshot = metrics.snapshot()
+        lines = [f"Since {snapshot['started']}, taken {snapshot['taken']}", ""]
+        lines.append(f"{'timing':<44}{'count':>7}{'total ms':>11}{'p50':>9}{'p95':>9}{'max':>9}")
+        # Most time spent first, which is usually what makes the app feel slow
+        for name, t in sorted(snapshot['timings'].items(), key=lambda item: -item[1]['total_ms']):
+            lines.append(f"{name:<44}{t['count']:>7}{t['total_ms']:>11.1f}"
+                         f"{t['p50_ms']:>9.1f}{t['p95_ms']:>9.1f}{t['max_ms']:>9.1f}")
+        lines += ["", f"{'counter':<44}{'value':>7}"]
+        lines += [f"{name:<44}{value:>7}" for name, value in snapshot['counters'].items()]
+
+        position = self.text.yview()[0]
+        self.text.configure(state="normal")
+        self.text.delete("1.0", "end")
+        self.text.insert("1.0", "\n".join(lines))
+        self.text.configure(state="disabled")
+        self.text.yview_moveto(position)
+        self.after(self.REFRESH_MS, self.refresh)
+
+class StyleRegistry:
+    """Theme-dependent styling of every registered widget, applied page by page.
+
+    Only the page on screen is restyled when the theme changes; the others catch up
+    in apply() the next time they are raised.
+    """
+
+    # Options per role and appearance mode
+    ROLES = {
+        'button': {
+            'Dark': {'fg_color': "#766E7A"},
+            'Light': {'fg_color': "#859FBB"},
+        },
+    }
+
+    def __init__(self):
+        self.widgets = {}  # page -> {widget: role name, or a callable(theme) that restyles it}
+        self.applied = {}  # page -> appearance mode it was last styled for
+
+    def register(self, page, widget, style='button'):
+        self.widgets.setdefault(page, {})[widget] = style
+        self.applied.pop(page, None)  # The new widget still needs styling
+
+    def register_tree(self, page):
+        """Register the themed widgets anywhere under a page, however deeply nested"""
+        themed_colors = [ctk.ThemeManager.theme["CTkButton"]["fg_color"]] + [
+            options['fg_color'] for options in self.ROLES['button'].values()
+        ]
+        pending = [page]
+        while pending:
+            widget = pending.pop()
+            if isinstance(widget, ctk.CTkButton):
+                # Buttons given their own color (e.g. Delete Account) keep it
+                if widget.cget("fg_color") in themed_colors and widget not in self.widgets.get(page, {}):
+                    self.register(page, widget)
+                continue
+            if isinstance(widget, BackgroundCanvas) and widget not in self.widgets.get(page, {}):
+                self.register(page, widget, widget.update_background_color)
+            pending.extend(widget.winfo_children())
+
+    def apply(self, page):
+        """Bring a page up to the current theme, if it isn't already"""
+        theme = ctk.get_appearance_mode()
+        if page is None or self.applied.get(page) == theme:
+            return
+        widgets = self.widgets.get(page, {})
+        for widget, style in list(widgets.items()):
+            if not widget.winfo_exists():
+                del widgets[widget]
+            elif callable(style):
+                style(theme)
+            else:
+                widget.configure(**self.ROLES[style][theme])
+        self.applied[page] = theme
+
 def get_button_color():
     """Returns the appropriate button color based on the current theme"""
-    if ctk.get_appearance_mode() == "Dark":
-        return "#766E7A"
-    return "#859FBB"
+    return StyleRegistry.ROLES['button'][ctk.get_appearance_mode()]['fg_color']
 
 class LoginPage(ctk.CTkFrame):
     def __init__(self, parent, controller):
@@ -475,12 +1487,22 @@ class LoginPage(ctk.CTkFrame):
         self.back_button = ctk.CTkButton(
             self,
             text="Back",
-            image=ctk.CTkImage(Image.open(get_resource_path("icons/back.png")), size=(20, 20)),
+            image=assets.acquire("icons/back.png", (20, 20)),
             command=lambda: controller.show_frame(StartingPage)
         )
         self.back_button.place(relx=0.5, rely=0.9, anchor="center")
         self.back_button.lift()
 
+    def set_busy(self, busy, message=""):
+        """Disable the buttons and show a status message while a request is in flight"""
+        state = "disabled" if busy else "normal"
+        self.signup_button.configure(state=state)
+        self.signin_button.configure(state=state)
+        self.message_label.configure(text=message)
+
+    def show_error(self, error):
+        self.set_busy(False, f"Error: {str(error)}")
+
     def sign_up(self):
         # Get user input from entries
         email = self.email_entry.get().strip()
@@ -489,17 +1511,20 @@ class LoginPage(ctk.CTkFrame):
             self.message_label.configure(text="Please enter both email and password.")
             return
 
-        try:
-            # Call Supabase auth API for sign up
-            response = supabase.auth.sign_up({"email": email, "password": password})
-            resp = response.dict()  # Convert the Pydantic model to a dictionary
-            if resp.get("error"):
-                err = resp["error"]["message"]
-                self.message_label.configure(text=f"Sign up failed: {err}")
-            else:
-                self.message_label.configure(text="Sign up successful, now just click sign in")
-        except Exception as e:
-            self.message_label.configure(text=f"Error: {str(e)}")
+        self.set_busy(True, "Signing up...")
+        # Call Supabase auth API for sign up
+        self.controller.io.submit(
+            lambda: get_supabase().auth.sign_up({"email": email, "password": password}).dict(),
+            on_success=self.finish_sign_up,
+            on_error=self.show_error
+        )
+
+    def finish_sign_up(self, resp):
+        if resp.get("error"):
+            err = resp["error"]["message"]
+            self.set_busy(False, f"Sign up failed: {err}")
+        else:
+            self.set_busy(False, "Sign up successful, now just click sign in")
 
     def sign_in(self):
         # Get user input from entries
@@ -509,133 +1534,1289 @@ class LoginPage(ctk.CTkFrame):
             self.message_label.configure(text="Please enter both email and password.")
             return
 
+        self.set_busy(True, "Signing in...")
+        self.controller.io.submit(
+            self.request_sign_in, email, password,
+            on_success=self.finish_sign_in,
+            on_error=self.show_error
+        )
+
+    @staticmethod
+    def request_sign_in(email, password):
+        """Runs on an I/O worker: authenticate, then prefetch the user's data"""
+        # Call Supabase auth API for sign in
+        response = get_supabase().auth.sign_in_with_password({"email": email, "password": password})
+        resp = response.dict()  # Convert to a dictionary for easier access
+        data_handler = None
+        current_user_id = (resp.get("user") or {}).get("id")
+        if not resp.get("error") and current_user_id:
+            data_handler = DataHandling(current_user_id)
+            try:
+                data_handler.bootstrap()
+            except Exception as e:
+                # Pages fall back to fetching each table on demand
+                session_log.warning("Error loading user data: %s", e)
+        return resp, data_handler
+
+    def finish_sign_in(self, result):
+        resp, data_handler = result
+        if resp.get("error"):
+            err = resp["error"]["message"]
+            self.set_busy(False, f"Login failed: {err}")
+            return
+        if not data_handler:
+            self.set_busy(False, "User ID not found in response")
+            return
+
+        self.set_busy(False, "Login successful!")
+        current_user_id = data_handler.user_id
+        self.controller.set_user(data_handler)
+        # Writes recorded offline during an earlier session
+        self.controller.sync_outbox()
+
+        # Save session for auto-login
+        session = resp.get("session") or {}
+        access_token = session.get("access_token")
+        refresh_token = session.get("refresh_token")
+        expires_at_value = session.get("expires_at")
+        
+        if access_token and refresh_token and expires_at_value is not None:
+            # Handle expires_at which could be an integer (timestamp) or string
+            if isinstance(expires_at_value, int):
+                # Unix timestamp (seconds since epoch)
+                expires_at = datetime.fromtimestamp(expires_at_value)
+            else:
+                # ISO format string
+                try:
+                    # Handle different string formats
+                    if isinstance(expires_at_value, str) and 'Z' in expires_at_value:
+                        expires_at_value = expires_at_value.replace('Z', '+00:00')
+                    expires_at = datetime.fromisoformat(str(expires_at_value))
+                except ValueError:
+                    # Fallback - set expiry to 7 days from now
+                    expires_at = datetime.now() + timedelta(days=7)
+    
+            self.controller.save_session(current_user_id, access_token, refresh_token, expires_at)
+            self.controller.schedule_token_refresh(access_token)
+        
+        self.controller.show_frame(StartingPage)
+
+
+class LocalCache:
+    """Per-user read-through cache of Supabase rows, kept in memory and in a SQLite file"""
+
+    # How long a cached row is served before going back to Supabase, in seconds
+    TABLE_TTLS = {
+        'app_settings': 24 * 60 * 60,
+        'notification_settings': 24 * 60 * 60,
+        'achievements': 60 * 60,
+        'breathing_stats': 10 * 60,
+        'breathing_cycles': 10 * 60,
+        'stats_migration': float('inf'),
+    }
+    DEFAULT_TTL = 5 * 60
+
+    def __init__(self, path=None, max_users=5):
+        self.path = path or get_app_data_path("stillmind_cache.db")
+        self.max_users = max_users
+        self.lock = threading.RLock()
+        self.memory = {}  # (user_id, table) -> (value, fetched_at)
+        self.users = OrderedDict()  # user_id -> last_used, least recently used first
+        self.db = None
+        self.memory_outbox = []  # (id, user_id, kind, target, payload) when there's no database
+        self.next_outbox_id = 1
+        # Names this copy of the outbox, whose ids only count up within it (see DataHandling.applied_cycles)
+        self.device_id = uuid.uuid4().hex
+
         try:
-            # Call Supabase auth API for sign in
-            response = supabase.auth.sign_in_with_password({"email": email, "password": password})
-            resp = response.dict()  # Convert to a dictionary for easier access
-            if resp.get("error"):
-                err = resp["error"]["message"]
-                self.message_label.configure(text=f"Login failed: {err}")
+            self.db = sqlite3.connect(self.path, check_same_thread=False)
+            # WAL without fsync on every commit keeps writes cheap enough for the Tk thread
+            self.db.execute("PRAGMA journal_mode=WAL")
+            self.db.execute("PRAGMA synchronous=NORMAL")
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "user_id TEXT NOT NULL, "
+                "table_name TEXT NOT NULL, "
+                "value TEXT NOT NULL, "
+                "fetched_at REAL NOT NULL, "
+                "last_used REAL NOT NULL, "
+                "PRIMARY KEY (user_id, table_name))"
+            )
+            # Writes not yet confirmed by Supabase, replayed oldest first
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS outbox ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "user_id TEXT NOT NULL, "
+                "kind TEXT NOT NULL, "
+                "target TEXT NOT NULL, "
+                "payload TEXT NOT NULL, "
+                "created_at REAL NOT NULL)"
+            )
+            self.db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            row = self.db.execute("SELECT value FROM meta WHERE key = 'device_id'").fetchone()
+            if row:
+                self.device_id = row[0]
             else:
-                self.message_label.configure(text="Login successful!")
-                current_user_id = resp.get("user", {}).get("id")
-                if current_user_id:
-                    self.controller.data_handler = DataHandling(current_user_id)
-                    
-                    # Save session for auto-login
-                    access_token = resp.get("session", {}).get("access_token")
-                    refresh_token = resp.get("session", {}).get("refresh_token")
-                    expires_at_value = resp.get("session", {}).get("expires_at")
-                    
-                    if access_token and refresh_token and expires_at_value is not None:
-                        # Handle expires_at which could be an integer (timestamp) or string
-                        if isinstance(expires_at_value, int):
-                            # Unix timestamp (seconds since epoch)
-                            expires_at = datetime.fromtimestamp(expires_at_value)
-                        else:
-                            # ISO format string
-                            try:
-                                # Handle different string formats
-                                if isinstance(expires_at_value, str) and 'Z' in expires_at_value:
-                                    expires_at_value = expires_at_value.replace('Z', '+00:00')
-                                expires_at = datetime.fromisoformat(str(expires_at_value))
-                            except ValueError:
-                                # Fallback - set expiry to 7 days from now
-                                expires_at = datetime.now() + timedelta(days=7)
-                
-                        self.controller.save_session(current_user_id, access_token, refresh_token, expires_at)
-                    
-                    # Apply theme after login
-                    self.controller.apply_theme_from_settings()
-                    self.controller.show_frame(StartingPage)
-                else:
-                    self.message_label.configure(text="User ID not found in response")
-        except Exception as e:
-            self.message_label.configure(text=f"Error: {str(e)}")
+                self.db.execute("INSERT INTO meta (key, value) VALUES ('device_id', ?)", (self.device_id,))
+            self.db.commit()
+            rows = self.db.execute(
+                "SELECT user_id, MAX(last_used) FROM cache GROUP BY user_id ORDER BY 2"
+            ).fetchall()
+            for user_id, last_used in rows:
+                self.users[user_id] = last_used
+        except sqlite3.Error as e:
+            # The cache is only an optimisation, keep working from memory
+            cache_log.warning("Local cache unavailable, using memory only: %s", e)
+            self.db = None
+
+    def load_entry(self, user_id, table):
+        """(value, fetched_at) from memory or disk, or None. Call with the lock held."""
+        entry = self.memory.get((user_id, table))
+        if entry is None and self.db is not None:
+            row = self.db.execute(
+                "SELECT value, fetched_at FROM cache WHERE user_id = ? AND table_name = ?",
+                (user_id, table)
+            ).fetchone()
+            if row:
+                entry = (json.loads(row[0]), row[1])
+                self.memory[(user_id, table)] = entry
+        return entry
+
+    def is_fresh(self, user_id, table):
+        with self.lock:
+            entry = self.load_entry(user_id, table)
+            ttl = self.TABLE_TTLS.get(table, self.DEFAULT_TTL)
+            return entry is not None and time.time() - entry[1] <= ttl
+
+    def get(self, user_id, table, allow_stale=False):
+        """Return a copy of the cached value, or None if missing or expired"""
+        with self.lock:
+            entry = self.load_entry(user_id, table)
+            if entry is None:
+                return None
+
+            value, fetched_at = entry
+            ttl = self.TABLE_TTLS.get(table, self.DEFAULT_TTL)
+            if not allow_stale and time.time() - fetched_at > ttl:
+                return None
+
+            self.touch(user_id)
+            # Callers mutate what they get back, never hand out the cached object
+            return copy.deepcopy(value)
+
+    def modify(self, user_id, table, update):
+        """Apply update(value) to the cached value in place, in memory only.
+
+        Avoids copying and re-encoding large values on the Tk thread; call flush()
+        later from a worker to write the result to disk. Returns False if nothing is cached.
+        """
+        with self.lock:
+            entry = self.load_entry(user_id, table)
+            if entry is None:
+                return False
+            update(entry[0])
+            return True
+
+    def flush(self, user_id, table):
+        """Write the in-memory value of a table to disk"""
+        with self.lock:
+            entry = self.memory.get((user_id, table))
+            if entry is None or self.db is None:
+                return
+            try:
+                self.db.execute(
+                    "UPDATE cache SET value = ? WHERE user_id = ? AND table_name = ?",
+                    (json.dumps(entry[0]), user_id, table)
+                )
+                self.db.commit()
+            except sqlite3.Error as e:
+                cache_log.warning("Error writing local cache: %s", e)
+
+    def put(self, user_id, table, value):
+        with self.lock:
+            now = time.time()
+            self.memory[(user_id, table)] = (copy.deepcopy(value), now)
+            if self.db is not None:
+                try:
+                    self.db.execute(
+                        "INSERT OR REPLACE INTO cache (user_id, table_name, value, fetched_at, last_used) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (user_id, table, json.dumps(value), now, now)
+                    )
+                    self.db.commit()
+                except sqlite3.Error as e:
+                    cache_log.warning("Error writing local cache: %s", e)
+            self.touch(user_id, now)
+            self.evict()
+
+    def invalidate(self, user_id, table=None):
+        """Drop one cached table for a user, or everything cached for that user"""
+        with self.lock:
+            if table is None:
+                for cache_key in [k for k in self.memory if k[0] == user_id]:
+                    del self.memory[cache_key]
+                self.users.pop(user_id, None)
+                query, params = "DELETE FROM cache WHERE user_id = ?", (user_id,)
+            else:
+                self.memory.pop((user_id, table), None)
+                query, params = "DELETE FROM cache WHERE user_id = ? AND table_name = ?", (user_id, table)
+
+            if self.db is not None:
+                try:
+                    self.db.execute(query, params)
+                    self.db.commit()
+                except sqlite3.Error as e:
+                    cache_log.warning("Error invalidating local cache: %s", e)
+
+    def enqueue(self, user_id, kind, target, payload, replace=False):
+        """Journal a write for replay; with replace, older entries for the same target are dropped.
+
+        Raises sqlite3.Error if the entry could not be written to disk.
+        """
+        with self.lock:
+            if self.db is None:
+                if replace:
+                    self.memory_outbox = [e for e in self.memory_outbox if e[1:4] != (user_id, kind, target)]
+                self.memory_outbox.append((self.next_outbox_id, user_id, kind, target, copy.deepcopy(payload)))
+                self.next_outbox_id += 1
+                return self.next_outbox_id - 1
+            try:
+                if replace:
+                    self.db.execute(
+                        "DELETE FROM outbox WHERE user_id = ? AND kind = ? AND target = ?",
+                        (user_id, kind, target)
+                    )
+                cursor = self.db.execute(
+                    "INSERT INTO outbox (user_id, kind, target, payload, created_at) VALUES (?, ?, ?, ?, ?)",
+                    (user_id, kind, target, json.dumps(payload), time.time())
+                )
+                self.db.commit()
+                return cursor.lastrowid
+            except sqlite3.Error:
+                self.db.rollback()
+                raise
+
+    def pending(self, user_id):
+        """Journaled writes for a user as (id, kind, target, payload), oldest first"""
+        with self.lock:
+            if self.db is None:
+                return [(e[0], e[2], e[3], copy.deepcopy(e[4])) for e in self.memory_outbox if e[1] == user_id]
+            rows = self.db.execute(
+                "SELECT id, kind, target, payload FROM outbox WHERE user_id = ? ORDER BY id", (user_id,)
+            ).fetchall()
+            return [(row[0], row[1], row[2], json.loads(row[3])) for row in rows]
+
+    def remove(self, ids):
+        """Forget journaled writes once Supabase has them"""
+        ids = list(ids)
+        if not ids:
+            return
+        with self.lock:
+            if self.db is None:
+                ids = set(ids)
+                self.memory_outbox = [e for e in self.memory_outbox if e[0] not in ids]
+                return
+            try:
+                self.db.executemany("DELETE FROM outbox WHERE id = ?", [(i,) for i in ids])
+                self.db.commit()
+            except sqlite3.Error as e:
+                # Left in the journal, they are replayed again on the next sync
+                cache_log.error("Error updating local outbox: %s", e)
+
+    def clear_outbox(self, user_id):
+        with self.lock:
+            self.memory_outbox = [e for e in self.memory_outbox if e[1] != user_id]
+            if self.db is not None:
+                try:
+                    self.db.execute("DELETE FROM outbox WHERE user_id = ?", (user_id,))
+                    self.db.commit()
+                except sqlite3.Error as e:
+                    cache_log.warning("Error clearing local outbox: %s", e)
+
+    def touch(self, user_id, now=None):
+        # Only hit the disk when the LRU order actually changes
+        if self.users and next(reversed(self.users)) == user_id:
+            return
+        now = now or time.time()
+        self.users[user_id] = now
+        self.users.move_to_end(user_id)
+        if self.db is not None:
+            try:
+                self.db.execute("UPDATE cache SET last_used = ? WHERE user_id = ?", (now, user_id))
+                self.db.commit()
+            except sqlite3.Error as e:
+                cache_log.warning("Error updating local cache: %s", e)
+
+    def evict(self):
+        """Forget the least recently used users once more than max_users are cached"""
+        while len(self.users) > self.max_users:
+            user_id, _ = self.users.popitem(last=False)
+            self.invalidate(user_id)
+
+_local_cache = None
+
+def get_local_cache():
+    """Shared LocalCache for the whole process"""
+    global _local_cache
+    if _local_cache is None:
+        _local_cache = LocalCache()
+    return _local_cache
+
+DEFAULT_SETTINGS = {
+    'theme': 'dark',
+    'sound': True,
+    'breathing_times': {
+        'inhale': 4,
+        'hold': 7,
+        'exhale': 8
+    },
+    'progress_style': 'bars'
+}
+
+DEFAULT_NOTIFICATION_SETTINGS = {'enabled': True, 'time': '09:00'}
+
+# Per-user tables: table name -> (JSON column, value for a new user)
+USER_TABLES = {
+    'app_settings': ('settings', DEFAULT_SETTINGS),
+    'breathing_stats': ('stats', {}),
+    'achievements': ('achievements', {}),
+    'notification_settings': ('settings', DEFAULT_NOTIFICATION_SETTINGS),
+}
+
+# Where completed cycles are stored:
+#   'blob'   - one JSON {date: count} dict per user in breathing_stats (original layout)
+#   'events' - one appended row per cycle in breathing_cycles, which needs:
+#       create table breathing_cycles (
+#           id bigint generated always as identity primary key,
+#           user_id uuid not null references auth.users on delete cascade,
+#           day date not null,
+#           completed_at timestamptz not null default now(),
+#           client_id text,
+#           unique (user_id, client_id),
+#           unique (user_id, completed_at)
+#       );
+#       create index on breathing_cycles (user_id, day);
+#   client_id is set by the device that journaled the cycle, so replaying it twice stores it once;
+#   migrated cycles have none and are told apart by completed_at (see migrate_stats_blob).
+STATS_STORAGE = os.environ.get("STILLMIND_STATS_STORAGE", "blob")
+CYCLE_EVENTS_TABLE = 'breathing_cycles'
+
+# PostgREST returns at most this many rows per request
+PAGE_SIZE = 1000
+
+# breathing_stats.stats used to be {'YYYY-MM-DD': count} for every day ever practised. Version 2
+# packs it: a base date plus zlib-compressed day deltas and counts, with old days rolled up into
+# monthly totals. Both formats are read. Released clients parse every key of the row as a date,
+# so rows on Supabase stay {'YYYY-MM-DD': count} until STILLMIND_STATS_FORMAT=2; the local cache
+# is always packed. Set it once every client in use reads version 2, there's no going back.
+STATS_FORMAT_VERSION = 2
+STATS_WRITE_FORMAT = os.environ.get("STILLMIND_STATS_FORMAT", "1")
+# Days are kept one by one this far back (beyond the longest stats range) and for the current
+# streak; whole months before that are rolled up
+STATS_DAILY_DAYS = 400
+
+def pack_columns(deltas, counts):
+    """Two equally long lists of unsigned ints as one base64 string"""
+    packed = array('I', deltas)
+    packed.extend(counts)
+    if sys.byteorder == 'big':
+        packed.byteswap()  # Stored little-endian
+    return base64.b64encode(zlib.compress(packed.tobytes(), 9)).decode('ascii')
+
+def unpack_columns(text):
+    """(deltas, counts) arrays from pack_columns()"""
+    packed = array('I')
+    if text:
+        packed.frombytes(zlib.decompress(base64.b64decode(text)))
+        if sys.byteorder == 'big':
+            packed.byteswap()
+    half = len(packed) // 2
+    return packed[:half], packed[half:]
+
+def is_packed_stats(stats):
+    return isinstance(stats, dict) and stats.get('v') == STATS_FORMAT_VERSION
+
+def month_index(key):
+    """'YYYY-MM' as a month number"""
+    return int(key[:4]) * 12 + int(key[5:7]) - 1
+
+def unpack_stats(stats):
+    """(base ordinal, day ordinals, day counts, {month number: count}) of a packed history"""
+    deltas, counts = unpack_columns(stats.get('days'))
+    base = date.fromisoformat(stats['base']).toordinal() if stats.get('base') else 0
+    days = array('l', itertools.accumulate(deltas, initial=base))[1:]
+    month_deltas, month_counts = unpack_columns(stats.get('months'))
+    first_month = month_index(stats['month_base']) if stats.get('month_base') else 0
+    months = dict(zip(itertools.islice(itertools.accumulate(month_deltas, initial=first_month), 1, None),
+                      month_counts))
+    return base, days, counts, months
+
+def decode_stats(stats):
+    """A history in either format as {'YYYY-MM-DD': count}, plus {'YYYY-MM': count} for rolled-up months"""
+    if not is_packed_stats(stats):
+        return dict(stats or {})
+    _, days, counts, months = unpack_stats(stats)
+    history = {f"{month // 12:04d}-{month % 12 + 1:02d}": count for month, count in months.items()}
+    history.update((date.fromordinal(day).isoformat(), count) for day, count in zip(days, counts))
+    return history
+
+def encode_stats(stats, today=None):
+    """Pack a history (in either format) as version 2, rolling up days no per-day view needs"""
+    if is_packed_stats(stats):
+        _, day_list, counts, months = unpack_stats(stats)
+        days = list(zip(day_list, counts))
+    else:
+        days, months = [], {}
+        for key, count in (stats or {}).items():
+            if len(key) == 7:
+                months[month_index(key)] = months.get(month_index(key), 0) + count
+            else:
+                days.append((date.fromisoformat(key).toordinal(), count))
+        days.sort()
+
+    # The latest run of consecutive days stays day by day, however long ago it started
+    streak_start = days[-1][0] if days else 0
+    i = len(days) - 1
+    while i > 0 and days[i - 1][0] == days[i][0] - 1:
+        i -= 1
+        streak_start = days[i][0]
+
+    # Only whole months before both the per-day horizon and the current streak are rolled up
+    horizon = (today or date.today()).toordinal() - STATS_DAILY_DAYS
+    horizon = date.fromordinal(min(horizon, streak_start) if days else horizon).replace(day=1).toordinal()
+    split = bisect.bisect_left(days, (horizon,))
+    for day, count in days[:split]:
+        month = date.fromordinal(day)
+        month = month.year * 12 + month.month - 1
+        months[month] = months.get(month, 0) + count
+    days = days[split:]
+
+    month_list = sorted(months.items())
+    return {
+        'v': STATS_FORMAT_VERSION,
+        'base': date.fromordinal(days[0][0]).isoformat() if days else None,
+        'days': pack_columns(
+            [day - previous for previous, (day, _) in zip([days[0][0]] + [d for d, _ in days], days)],
+            [count for _, count in days]
+        ) if days else '',
+        'month_base': (f"{month_list[0][0] // 12:04d}-{month_list[0][0] % 12 + 1:02d}"
+                       if month_list else None),
+        'months': pack_columns(
+            [month - previous for previous, (month, _) in zip([month_list[0][0]] + [m for m, _ in month_list], month_list)],
+            [count for _, count in month_list]
+        ) if month_list else '',
+    }
+
+def add_to_stats(stats, day, count=1):
+    """Count cycles on a 'YYYY-MM-DD' day in a packed history, in place"""
+    deltas, counts = unpack_columns(stats.get('days'))
+    ordinal = date.fromisoformat(day).toordinal()
+    if not deltas:
+        stats['base'] = day
+        deltas.append(0)
+        counts.append(count)
+    else:
+        last = date.fromisoformat(stats['base']).toordinal() + sum(deltas)
+        if ordinal == last:
+            counts[-1] += count
+        elif ordinal > last:
+            deltas.append(ordinal - last)
+            counts.append(count)
+        else:
+            # An older day (e.g. the clock was set back), rare enough to repack
+            history = decode_stats(stats)
+            history[day] = history.get(day, 0) + count
+            stats.update(encode_stats(history))
+            return
+    stats['days'] = pack_columns(deltas, counts)
+
+class StatsIndex:
+    """Totals and streaks over a {'YYYY-MM-DD': count} or packed history, kept up to date in O(1) per cycle"""
+
+    def __init__(self, stats=None):
+        self.days = array('l')  # ordinal day numbers with cycles, ascending
+        self.counts = {}  # ordinal day number -> cycles that day
+        self.total = 0
+        self.run = 0  # consecutive days ending on the last recorded day
+        self.longest_streak = 0
+        if is_packed_stats(stats):
+            # Straight from the packed columns, without building a date string per day
+            _, self.days, counts, months = unpack_stats(stats)
+            self.counts = dict(zip(self.days, counts))
+            self.total = sum(counts) + sum(months.values())
+            self.recount_runs()
+            return
+        days = []
+        for key, count in (stats or {}).items():
+            if len(key) == 7:
+                # A rolled-up month only counts towards the total; streaks use the days kept one by one
+                self.total += count
+            else:
+                days.append((self.ordinal(key), count))
+        for day, count in sorted(days):
+            self.record(day, count)
+
+    @staticmethod
+    def ordinal(day):
+        if isinstance(day, int):
+            return day
+        if isinstance(day, str):
+            day = date.fromisoformat(day)
+        return day.toordinal()
+
+    def record(self, day, count=1):
+        day = self.ordinal(day)
+        self.total += count
+        if day in self.counts:
+            self.counts[day] += count
+            return
+        self.counts[day] = count
+
+        if not self.days or day > self.days[-1]:
+            # The normal case, including the first cycle after midnight
+            self.run = self.run + 1 if self.days and self.days[-1] == day - 1 else 1
+            self.days.append(day)
+            self.longest_streak = max(self.longest_streak, self.run)
+        else:
+            # An older day showed up (e.g. the clock was set back), rare enough to recount
+            bisect.insort(self.days, day)
+            self.recount_runs()
+
+    def recount_runs(self):
+        run = longest = 0
+        previous = None
+        for day in self.days:
+            run = run + 1 if previous == day - 1 else 1
+            longest = max(longest, run)
+            previous = day
+        self.run = run
+        self.longest_streak = longest
+
+    def current_streak(self, today=None):
+        """Consecutive days with cycles ending today, 0 if nothing was done today"""
+        today = self.ordinal(today or datetime.now().date())
+        if self.days and self.days[-1] == today:
+            return self.run
+        return 0
+
+    def total_since(self, day):
+        start = bisect.bisect_left(self.days, self.ordinal(day))
+        return sum(self.counts[d] for d in self.days[start:])
+
+    def window(self, first, last):
+        """[('YYYY-MM-DD', count)] for every day from first to last, with missing days as 0"""
+        first, last = self.ordinal(first), self.ordinal(last)
+        return [
+            (date.fromordinal(day).isoformat(), self.counts.get(day, 0))
+            for day in range(first, last + 1)
+        ]
 
+# Built-in achievements; an achievements.json next to the app with the same shape replaces them.
+# "rule" is what the requirement is compared against: total "cycles" or the current "streak".
+DEFAULT_ACHIEVEMENT_DEFINITIONS = {
+    "first_breath": {
+        "rule": "cycles",
+        "name": "First Breath",
+        "description": "Complete your first breathing exercise",
+        "icon": "🌱",
+        "requirement": 1
+    },
+    "beginner": {
+        "rule": "cycles",
+        "name": "Beginner",
+        "description": "Complete 10 breathing exercises",
+        "icon": "🌿",
+        "requirement": 10
+    },
+    "intermediate": {
+        "rule": "cycles",
+        "name": "Intermediate",
+        "description": "Complete 50 breathing exercises",
+        "icon": "🌳",
+        "requirement": 50
+    },
+    "advanced": {
+        "rule": "cycles",
+        "name": "Advanced",
+        "description": "Complete 100 breathing exercises",
+        "icon": "🌲",
+        "requirement": 100
+    },
+    "master": {
+        "rule": "cycles",
+        "name": "Breath Master",
+        "description": "Complete 500 breathing exercises",
+        "icon": "🏆",
+        "requirement": 500
+    },
+    "streak_3": {
+        "rule": "streak",
+        "name": "Consistent",
+        "description": "Maintain a 3-day streak",
+        "icon": "📆",
+        "requirement": 3
+    },
+    "streak_7": {
+        "rule": "streak",
+        "name": "Dedicated",
+        "description": "Maintain a 7-day streak",
+        "icon": "🔥",
+        "requirement": 7
+    },
+    "streak_30": {
+        "rule": "streak",
+        "name": "Committed",
+        "description": "Maintain a 30-day streak",
+        "icon": "⭐",
+        "requirement": 30
+    }
+}
+
+def load_achievement_definitions():
+    """Achievement definitions from achievements.json if present, else the built-in ones"""
+    path = get_resource_path("achievements.json")
+    if os.path.exists(path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            ui_log.warning("Error loading %s, using built-in achievements: %s", path, e)
+    return DEFAULT_ACHIEVEMENT_DEFINITIONS
+
+ACHIEVEMENT_DEFINITIONS = load_achievement_definitions()
+
+class AchievementEngine:
+    """Unlocks achievements as cycles are recorded, checking only the next threshold per rule"""
+
+    def __init__(self, definitions, unlocked):
+        self.definitions = definitions
+        self.unlocked = unlocked  # achievement id -> {'unlocked_at': ...}, as stored in Supabase
+        self.thresholds = {}  # rule -> [(requirement, achievement id)], ascending
+        for achievement_id, achievement in definitions.items():
+            rule = self.rule_of(achievement_id, achievement)
+            self.thresholds.setdefault(rule, []).append((achievement["requirement"], achievement_id))
+        for thresholds in self.thresholds.values():
+            thresholds.sort()
+        # Index of the first threshold per rule that hasn't been reached yet
+        self.next_index = {rule: 0 for rule in self.thresholds}
 
+    @staticmethod
+    def rule_of(achievement_id, achievement):
+        """The rule an achievement is checked against; definitions without one go by their id"""
+        return achievement.get("rule", "streak" if achievement_id.startswith("streak_") else "cycles")
+
+    def evaluate(self, **values):
+        """Unlock everything reached by the given rule values, e.g. evaluate(cycles=12, streak=3).
+
+        Returns the ids unlocked by this call, so the caller saves only when something changed.
+        """
+        newly_unlocked = []
+        unlocked_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        for rule, value in values.items():
+            thresholds = self.thresholds.get(rule, [])
+            i = self.next_index.get(rule, 0)
+            while i < len(thresholds) and thresholds[i][0] <= value:
+                achievement_id = thresholds[i][1]
+                if achievement_id not in self.unlocked:
+                    self.unlocked[achievement_id] = {'unlocked_at': unlocked_at}
+                    newly_unlocked.append(achievement_id)
+                i += 1
+            self.next_index[rule] = i
+        return newly_unlocked
+
+def merge_daily_counts(*histories):
+    """Per-day maximum of several histories (in either stats format), as decode_stats() returns them"""
+    histories = [decode_stats(history) for history in histories]
+    # A month rolled up in one history is compared as a whole in all of them
+    rolled = {key for history in histories for key in history if len(key) == 7}
+    merged = {}
+    for history in histories:
+        folded = {}
+        for key, count in history.items():
+            key = key[:7] if key[:7] in rolled else key
+            folded[key] = folded.get(key, 0) + count
+        for key, count in folded.items():
+            if count > merged.get(key, 0):
+                merged[key] = count
+    return merged
+
+def merge_achievements(*unlocks):
+    """Union of several {id: {'unlocked_at': ...}} maps, keeping the earliest unlock of each"""
+    merged = {}
+    for unlocked in unlocks:
+        for achievement_id, info in (unlocked or {}).items():
+            current = merged.get(achievement_id)
+            # An unlock without a time never wins over one with a time
+            if current is None or (info.get('unlocked_at') or '~') < (current.get('unlocked_at') or '~'):
+                merged[achievement_id] = dict(info)
+    return merged
+
+@instrumented("data")
 class DataHandling:
-    def __init__(self, user_id: str):
+    def __init__(self, user_id: str, cache=None):
         self.user_id = user_id
-
-    def get_settings(self) -> dict:
-        response = supabase.table('app_settings').select('*').eq('user_id', self.user_id).execute()
-        if response.data and len(response.data) > 0:
-            return response.data[0]['settings']
+        self.cache = cache or get_local_cache()
+        self._stats_index = None
+        self._achievement_engine = None
+        # Held while a table is read from or replayed to Supabase, so a read never
+        # sees journaled writes twice (once on the server and once in the outbox)
+        self.locks = {table: threading.Lock() for table in [*USER_TABLES, CYCLE_EVENTS_TABLE]}
+        self.sync_lock = threading.Lock()
+
+    def load_row(self, table):
+        """Fetch a user's row from Supabase into the cache, creating it with defaults if missing"""
+        column, default = USER_TABLES[table]
+        with self.locks[table]:
+            response = get_supabase().table(table).select(column).eq('user_id', self.user_id).execute()
+            if response.data and len(response.data) > 0:
+                value = response.data[0][column]
+            else:
+                value = copy.deepcopy(default)
+                # ignore_duplicates keeps a row another device just created
+                get_supabase().table(table).upsert(
+                    {'user_id': self.user_id, column: value},
+                    on_conflict='user_id',
+                    ignore_duplicates=True
+                ).execute()
+            # Writes still waiting in the outbox are newer than what the server has. Under the
+            # cache lock, so a cycle recorded meanwhile is either in the snapshot or counted after the put
+            with self.cache.lock:
+                value = self.with_pending(table, value)
+                if table == 'breathing_stats':
+                    value = encode_stats(value)
+                self.cache.put(self.user_id, table, value)
+        if table == 'breathing_stats':
+            self._stats_index = None
+        elif table == 'achievements':
+            self._achievement_engine = None
+        return value
+
+    def fetch_row(self, table):
+        """Read a user's row through the local cache"""
+        cached = self.cache.get(self.user_id, table)
+        if cached is not None:
+            return cached
+        return copy.deepcopy(self.load_row(table))
+
+    def cached(self, table, allow_stale=False):
+        """Cached copy of a table without touching the network, or None"""
+        return self.cache.get(self.user_id, table, allow_stale=allow_stale)
+
+    def stage(self, table, value):
+        """Put a value in the local cache ahead of writing it to Supabase"""
+        if table == 'breathing_stats':
+            value = encode_stats(value)
+        self.cache.put(self.user_id, table, value)
+
+    def journal_row(self, table, value):
+        """Cache a row and journal it for sync_outbox(); raises sqlite3.Error if it couldn't be journaled"""
+        value = copy.deepcopy(value)
+        self.stage(table, value)
+        self.queue_row(table, value)
+
+    def queue_row(self, table, value):
+        """Journal a row for the outbox; it replaces any older unsynced version of the same row"""
+        self.cache.enqueue(self.user_id, 'row', table, value, replace=True)
+
+    def queue_cycle(self, day):
+        """Journal one finished cycle for the outbox"""
+        self.cache.enqueue(self.user_id, 'cycle', day, {
+            'day': day,
+            'completed_at': datetime.now().astimezone().isoformat(),
+            'client_id': uuid.uuid4().hex
+        })
+
+    def cycle_client_id(self, entry_id, payload):
+        # Cycles journaled before client ids existed are named after their outbox entry
+        return payload.get('client_id') or f"{self.cache.device_id}-{entry_id}"
+
+    def applied_cycles(self, stats):
+        """Highest outbox id of this device's cycles already counted in a stats row from Supabase.
+
+        replay_row() stores it with the row, so cycles whose replay got through but whose
+        journal entries survived (lost response, failed remove) are not counted twice.
+        """
+        if not is_packed_stats(stats):
+            return 0
+        return (stats.get('applied') or {}).get(self.cache.device_id, 0)
+
+    def with_pending(self, table, value, entries=None):
+        """A row as fetched from Supabase, with this device's journaled writes applied on top"""
+        if entries is None:
+            entries = self.cache.pending(self.user_id)
+        rows = [(entry_id, payload) for entry_id, kind, target, payload in entries
+                if kind == 'row' and target == table]
+        last_id, row = rows[-1] if rows else (0, None)
+
+        if table == 'breathing_stats':
+            applied = self.applied_cycles(value)
+            value = merge_daily_counts(value, row)
+            if STATS_STORAGE != 'events':
+                # Cycles journaled after the last full history are not in it yet, unless already replayed
+                for entry_id, kind, day, _ in entries:
+                    if kind == 'cycle' and entry_id > max(last_id, applied):
+                        value[day] = value.get(day, 0) + 1
+        elif table == 'achievements':
+            value = merge_achievements(value, row)
+        elif row is not None:
+            value = row
+        return value
+
+    def sync_outbox(self):
+        """Replay journaled writes to Supabase in as few requests as possible.
+
+        Cycles are added to the server's per-day counts (or inserted a page of events at a
+        time), achievements are merged with the server's and other rows overwrite it. Each
+        table is replayed on its own and its entries are only dropped once Supabase has them.
+        Returns how many entries were replayed; raises the first error after trying every table.
+        """
+        with self.sync_lock:
+            # Cycles counted in memory must be on disk before their journal entries go
+            self.cache.flush(self.user_id, self.stats_table)
+            entries = self.cache.pending(self.user_id)
+            if not entries:
+                return 0
+
+            tables = {target for _, kind, target, _ in entries if kind == 'row'}
+            cycles = [entry for entry in entries if entry[1] == 'cycle']
+            replays = []
+            if cycles and STATS_STORAGE == 'events':
+                # The old history goes in first, or events already on the server could look like a migration
+                self.migrate_stats_blob()
+                replays.append((CYCLE_EVENTS_TABLE, lambda: self.replay_cycle_events(cycles)))
+            elif cycles:
+                tables.add('breathing_stats')
+            replays += [(table, lambda t=table: self.replay_row(t, entries)) for table in sorted(tables)]
+
+            error = None
+            for table, replay in replays:
+                try:
+                    with self.locks[table]:
+                        replay()
+                except Exception as e:
+                    sync_log.warning("Could not sync %s: %s", table, e)
+                    error = error or e
+            if error:
+                raise error
+            return len(entries)
+
+    def replay_cycle_events(self, cycles):
+        """Insert journaled cycles as breathing_cycles rows, one request per page.
+
+        Cycles already stored by an earlier replay are skipped by their client id.
+        """
+        for i in range(0, len(cycles), PAGE_SIZE):
+            page = cycles[i:i + PAGE_SIZE]
+            get_supabase().table(CYCLE_EVENTS_TABLE).upsert([
+                {'user_id': self.user_id, 'day': payload['day'], 'completed_at': payload['completed_at'],
+                 'client_id': self.cycle_client_id(entry_id, payload)}
+                for entry_id, _, _, payload in page
+            ], on_conflict='user_id,client_id', ignore_duplicates=True).execute()
+            self.cache.remove(entry_id for entry_id, _, _, _ in page)
+
+    def replay_row(self, table, entries):
+        """Write a table's journaled value to Supabase, merged with the server's for stats and achievements"""
+        column, _ = USER_TABLES[table]
+        if STATS_STORAGE == 'events':
+            # Cycles are replayed as events, not into the blob
+            entries = [entry for entry in entries if entry[1] == 'row']
+        ids = [entry_id for entry_id, kind, target, _ in entries
+               if target == table or (kind == 'cycle' and table == 'breathing_stats')]
+
+        if table in ('breathing_stats', 'achievements'):
+            response = get_supabase().table(table).select(column).eq('user_id', self.user_id).execute()
+            server = response.data[0][column] if response.data else None
+            value = self.with_pending(table, server or {}, entries)
+            if table == 'breathing_stats' and self.writes_packed_stats(server, value):
+                # Rows still in the old format are upgraded on their first packed write. Old-format
+                # rows take no extra keys, so only packed ones carry the applied marker
+                value = encode_stats(value)
+                applied = dict(server.get('applied') or {}) if is_packed_stats(server) else {}
+                cycle_ids = [entry_id for entry_id, kind, _, _ in entries if kind == 'cycle']
+                if cycle_ids:
+                    applied[self.cache.device_id] = max(self.applied_cycles(server), *cycle_ids)
+                if applied:
+                    value['applied'] = applied
+            if value != server:
+                get_supabase().table(table).upsert(
+                    {'user_id': self.user_id, column: value}, on_conflict='user_id').execute()
+            self.merge_into_cache(table, value)
         else:
-            default_settings = {
-                'theme': 'dark',
-                'sound': True,
-                'breathing_times': {
-                    'inhale': 4,
-                    'hold': 7,
-                    'exhale': 8
-                },
-                'progress_style': 'bars'
-            }
-            supabase.table('app_settings').insert({'user_id': self.user_id, 'settings': default_settings}).execute()
-            return default_settings
+            value = [payload for _, kind, target, payload in entries if kind == 'row' and target == table][-1]
+            get_supabase().table(table).upsert(
+                {'user_id': self.user_id, column: value}, on_conflict='user_id').execute()
+        self.cache.remove(ids)
 
-    def save_settings(self, settings: dict):
-        response = supabase.table('app_settings').select('*').eq('user_id', self.user_id).execute()
-        if response.data and len(response.data) > 0:
-            supabase.table('app_settings').update({'settings': settings}).eq('user_id', self.user_id).execute()
-        else:
-            supabase.table('app_settings').insert({'user_id': self.user_id, 'settings': settings}).execute()
+    @staticmethod
+    def writes_packed_stats(server, history):
+        """Whether a stats row goes to Supabase packed: when enabled, or once it already is or has rolled-up months"""
+        return (STATS_WRITE_FORMAT == str(STATS_FORMAT_VERSION) or is_packed_stats(server)
+                or any(len(key) == 7 for key in history))
+
+    def merge_into_cache(self, table, value):
+        """Fold a merged server value into the cached one, which may have moved on meanwhile"""
+        changed = []
+
+        def merge(cached):
+            if table == 'breathing_stats':
+                merged = merge_daily_counts(cached, value)
+                if merged != decode_stats(cached):
+                    changed.append(table)
+                    cached.clear()
+                    cached.update(encode_stats(merged))
+                return
+            merged = merge_achievements(cached, value)
+            if merged != cached:
+                changed.append(table)
+                cached.clear()
+                cached.update(merged)
+
+        if not self.cache.modify(self.user_id, table, merge):
+            self.cache.put(self.user_id, table, value)
+            changed.append(table)
+        elif changed:
+            self.cache.flush(self.user_id, table)
+        if changed:
+            # Another device added cycles or unlocks, rebuild from the cache on next use
+            if table == 'breathing_stats':
+                self._stats_index = None
+            else:
+                self._achievement_engine = None
+
+    def bootstrap(self):
+        """Load every per-user table at once after login, so the pages start from the cache"""
+        loaders = {table: (lambda t=table: self.load_row(t)) for table in USER_TABLES}
+        if STATS_STORAGE == 'events':
+            del loaders['breathing_stats']
+            loaders[CYCLE_EVENTS_TABLE] = self.sync_cycle_counts
+        with ThreadPoolExecutor(max_workers=len(loaders)) as pool:
+            futures = {name: pool.submit(loader) for name, loader in loaders.items()}
+        return {name: future.result() for name, future in futures.items()}
 
-    def get_stats(self) -> dict:
-        response = supabase.table('breathing_stats').select('*').eq('user_id', self.user_id).execute()
-        if response.data and len(response.data) > 0:
-            return response.data[0]['stats']
-        else:
-            default_stats = {}
-            supabase.table('breathing_stats').insert({'user_id': self.user_id, 'stats': default_stats}).execute()
-            return default_stats
-
-    def save_stats(self, stats: dict):
-        response = supabase.table('breathing_stats').select('*').eq('user_id', self.user_id).execute()
-        if response.data and len(response.data) > 0:
-            supabase.table('breathing_stats').update({'stats': stats}).eq('user_id', self.user_id).execute()
-        else:
-            supabase.table('breathing_stats').insert({'user_id': self.user_id, 'stats': stats}).execute()
+    def get_settings(self) -> dict:
+        return self.fetch_row('app_settings')
+
+    @property
+    def stats_table(self):
+        """Local cache table holding the per-day history"""
+        return CYCLE_EVENTS_TABLE if STATS_STORAGE == 'events' else 'breathing_stats'
+
+    def cached_stats(self, allow_stale=False):
+        """Cached history without touching the network (packed, or {'YYYY-MM-DD': count}), or None"""
+        cached = self.cache.get(self.user_id, self.stats_table, allow_stale=allow_stale)
+        if cached is not None and STATS_STORAGE == 'events':
+            return cached['counts']
+        return cached
+
+    def stats_index(self, allow_stale=False):
+        """StatsIndex over the cached history, or None if it would need the network.
+
+        Built once from the cache and then kept current by record_cycle(), so reading
+        totals and streaks costs nothing per day of history.
+        """
+        if self._stats_index is not None and (
+                allow_stale or self.cache.is_fresh(self.user_id, self.stats_table)):
+            return self._stats_index
+        stats = self.cached_stats(allow_stale=allow_stale)
+        if stats is None:
+            return None
+        self._stats_index = StatsIndex(stats)
+        return self._stats_index
+
+    def load_stats_index(self):
+        """stats_index(), fetching the history first if it isn't cached"""
+        index = self.stats_index()
+        if index is None:
+            # The packed row builds an index without decoding every day
+            history = self.sync_cycle_counts() if STATS_STORAGE == 'events' else self.fetch_row('breathing_stats')
+            self._stats_index = index = StatsIndex(history)
+        return index
+
+    def record_cycle(self, day):
+        """Journal a finished cycle and count it in the cached history, as one step.
+
+        Cheap enough for the Tk thread; sync_outbox() stores it. Returns False if the history
+        isn't cached yet (loading it picks the cycle up from the journal). Raises sqlite3.Error
+        if the cycle couldn't be journaled.
+        """
+        # A load taking its outbox snapshot under the same lock sees both or neither
+        with self.cache.lock:
+            self.queue_cycle(day)
+            return self.count_cycle(day)
+
+    def finish_cycle(self, day):
+        """Record a finished cycle (see record_cycle).
+
+        Returns True when the history and unlocks are cached for check_achievements(), False
+        when bootstrap() has to load them first. Raises sqlite3.Error if it couldn't be journaled.
+        """
+        counted = self.record_cycle(day)
+        return counted and self.cached('achievements', allow_stale=True) is not None
+
+    def check_achievements(self, cycles=None, streak=None):
+        """Ids newly unlocked by the cached totals (or the given ones); save achievement_engine().unlocked after"""
+        engine = self.achievement_engine()
+        if engine is None:
+            return []
+        if cycles is None or streak is None:
+            index = self.stats_index(allow_stale=True)
+            if index is None:
+                return []
+            cycles, streak = index.total, index.current_streak()
+        return engine.evaluate(cycles=cycles, streak=streak)
+
+    def count_cycle(self, day):
+        """Count a journaled cycle in the local cache and the stats index; False if nothing is cached"""
+        def add(value):
+            if is_packed_stats(value):
+                add_to_stats(value, day)
+                return
+            counts = value['counts'] if STATS_STORAGE == 'events' else value
+            counts[day] = counts.get(day, 0) + 1
+
+        if not self.cache.modify(self.user_id, self.stats_table, add):
+            return False
+        if self._stats_index is not None:
+            self._stats_index.record(day)
+        return True
+
+    def query_daily_counts(self, since=None, client_ids=None):
+        """Count cycle events per day on or after `since` ('YYYY-MM-DD'), a page at a time.
+
+        With a `client_ids` set, the client id of every event fetched is added to it.
+        """
+        counts = {}
+        offset = 0
+        columns = 'day' if client_ids is None else 'day,client_id'
+        while True:
+            query = get_supabase().table(CYCLE_EVENTS_TABLE).select(columns).eq('user_id', self.user_id)
+            if since:
+                query = query.gte('day', since)
+            rows = query.order('id').range(offset, offset + PAGE_SIZE - 1).execute().data or []
+            for row in rows:
+                counts[row['day']] = counts.get(row['day'], 0) + 1
+                if client_ids is not None:
+                    client_ids.add(row.get('client_id'))
+            if len(rows) < PAGE_SIZE:
+                return counts
+            offset += PAGE_SIZE
+
+    def sync_cycle_counts(self):
+        """Bring the cached per-day counts up to date, fetching only days since the last sync"""
+        cached = self.cache.get(self.user_id, CYCLE_EVENTS_TABLE)
+        if cached is not None:
+            return cached['counts']
+
+        self.migrate_stats_blob()
+        with self.locks[CYCLE_EVENTS_TABLE]:
+            cached = self.cache.get(self.user_id, CYCLE_EVENTS_TABLE, allow_stale=True)
+            counts = cached['counts'] if cached else {}
+            since = cached.get('synced_day') if cached else None
+
+            # Days from the last sync on are recounted in full, older days can't change
+            stored = set() if any(entry[1] == 'cycle' for entry in self.cache.pending(self.user_id)) else None
+            counts.update(self.query_daily_counts(since, stored))
+            # Snapshot and put under the cache lock, so a cycle recorded meanwhile is counted exactly once
+            with self.cache.lock:
+                # Cycles still in the outbox aren't on the server yet, unless a replay got through unconfirmed.
+                # Ones journaled during the query can't be there: replays wait for the table lock.
+                for entry_id, kind, day, payload in self.cache.pending(self.user_id):
+                    if (kind == 'cycle' and (since is None or day >= since) and
+                            self.cycle_client_id(entry_id, payload) not in (stored or ())):
+                        counts[day] = counts.get(day, 0) + 1
+                self.cache.put(self.user_id, CYCLE_EVENTS_TABLE, {
+                    'counts': counts,
+                    'synced_day': datetime.now().strftime('%Y-%m-%d')
+                })
+                self._stats_index = None
+            return counts
+
+    def migrate_stats_blob(self):
+        """Copy the old breathing_stats blob into breathing_cycles once per user and device.
+
+        Runs before any journaled cycle is replayed as an event. It doesn't check for existing
+        events: the rows are the same whichever device builds them, and (user_id, completed_at)
+        makes copying them again a no-op.
+        """
+        with self.locks[CYCLE_EVENTS_TABLE]:
+            if self.cache.get(self.user_id, 'stats_migration') is not None:
+                return
+            stats = decode_stats(self.fetch_row('breathing_stats'))
+            # A rolled-up month's cycles land on its first day
+            stats = {(f"{key}-01" if len(key) == 7 else key): count for key, count in stats.items()}
+            # A day's cycles are a second apart from noon, so every device migrating the same blob
+            # builds the same rows
+            rows = [
+                {'user_id': self.user_id, 'day': day,
+                 'completed_at': (datetime.fromisoformat(f"{day}T12:00:00") + timedelta(seconds=n)).isoformat()}
+                for day, count in sorted(stats.items())
+                for n in range(count)
+            ]
+            for i in range(0, len(rows), PAGE_SIZE):
+                get_supabase().table(CYCLE_EVENTS_TABLE).upsert(
+                    rows[i:i + PAGE_SIZE], on_conflict='user_id,completed_at', ignore_duplicates=True
+                ).execute()
+            if rows:
+                sync_log.info("Migrated %d cycles to %s", len(rows), CYCLE_EVENTS_TABLE)
+            self.cache.put(self.user_id, 'stats_migration', {'done': True})
+
+    def range_index(self):
+        """Index to answer a range query from, or None when only a window should be fetched"""
+        index = self.stats_index()
+        if index is None and STATS_STORAGE != 'events':
+            index = self.load_stats_index()
+        return index
+
+    def get_last_n_days(self, days, today=None):
+        """[(day, count)] for the `days` days ending today, oldest first, with missing days as 0"""
+        today = today or datetime.now().date()
+        first = today - timedelta(days=days - 1)
+        index = self.range_index()
+        if index is None:
+            index = StatsIndex(self.query_daily_counts(first.isoformat()))
+        return index.window(first, today)
+
+    def get_total_since(self, since=None):
+        """Total completed cycles on or after `since` ('YYYY-MM-DD'), or ever"""
+        index = self.range_index()
+        if index is not None:
+            return index.total if since is None else index.total_since(since)
+        query = get_supabase().table(CYCLE_EVENTS_TABLE).select('id', count='exact').eq('user_id', self.user_id)
+        if since:
+            query = query.gte('day', since)
+        return query.limit(1).execute().count or 0
+
+    def get_current_streak(self, today=None):
+        """Consecutive days with cycles ending today (0 if nothing was done today)"""
+        today = today or datetime.now().date()
+        index = self.range_index()
+        if index is not None:
+            return index.current_streak(today)
+        # Widen the window only while the streak reaches its start
+        for days in (30, 365, None):
+            since = (today - timedelta(days=days - 1)).isoformat() if days else None
+            streak = StatsIndex(self.query_daily_counts(since)).current_streak(today)
+            if days is None or streak < days:
+                return streak
 
     def get_notification_settings(self) -> dict:
-        response = supabase.table('notification_settings').select('*').eq('user_id', self.user_id).execute()
-        if response.data and len(response.data) > 0:
-            return response.data[0]['settings']
-        else:
-            default_notif = {'enabled': True, 'time': '09:00'}
-            supabase.table('notification_settings').insert({'user_id': self.user_id, 'settings': default_notif}).execute()
-            return default_notif
-
-    def save_notification_settings(self, notification_settings: dict):
-        response = supabase.table('notification_settings').select('*').eq('user_id', self.user_id).execute()
-        if response.data and len(response.data) > 0:
-            supabase.table('notification_settings').update({'settings': notification_settings}).eq('user_id', self.user_id).execute()
-        else:
-            supabase.table('notification_settings').insert({'user_id': self.user_id, 'settings': notification_settings}).execute()
-            
+        return self.fetch_row('notification_settings')
+
     def get_achievements(self) -> dict:
-        response = supabase.table('achievements').select('*').eq('user_id', self.user_id).execute()
-        print(f"Achievement response: {response.data}")  # Debugging
-        
-        if response.data and len(response.data) > 0:
-            achievements = response.data[0]['achievements']
-            print(f"Loaded achievements: {achievements}")  # Debugging
-            return achievements
-        else:
-            default_achievements = {}
-            supabase.table('achievements').insert({'user_id': self.user_id, 'achievements': default_achievements}).execute()
-            return default_achievements
-            
-    def save_achievements(self, achievements: dict):
-        response = supabase.table('achievements').select('*').eq('user_id', self.user_id).execute()
-        if response.data and len(response.data) > 0:
-            supabase.table('achievements').update({'achievements': achievements}).eq('user_id', self.user_id).execute()
-        else:
-            supabase.table('achievements').insert({'user_id': self.user_id, 'achievements': achievements}).execute()
+        return self.fetch_row('achievements')
+
+    def achievement_engine(self):
+        """AchievementEngine over the cached unlocks, or None if they aren't cached yet"""
+        if self._achievement_engine is None:
+            unlocked = self.cached('achievements', allow_stale=True)
+            if unlocked is None:
+                return None
+            self._achievement_engine = AchievementEngine(ACHIEVEMENT_DEFINITIONS, unlocked)
+        return self._achievement_engine
 
 
+class SettingsStore:
+    """The current user's app and reminder settings, loaded once and read from memory.
+
+    Changes go through update()/update_notifications(), which save in the background and
+    call every subscriber interested in the keys that changed.
+    """
+
+    def __init__(self, save=None):
+        self.save = save  # save(table, value, on_error=None), e.g. App.save_user_data
+        self.data_handler = None
+        self.app = copy.deepcopy(DEFAULT_SETTINGS)
+        self.notifications = dict(DEFAULT_NOTIFICATION_SETTINGS)
+        self.subscribers = []  # (callback, keys it cares about; empty for all)
+
+    def load(self, data_handler, from_cache=False):
+        """Switch to a user's settings, or the defaults when logged out, and notify everyone.
+
+        With from_cache only the local cache is read (stale entries included), never the network.
+        """
+        try:
+            app, notifications = self.fetch(data_handler, from_cache)
+        except Exception as e:
+            ui_log.warning("Error loading settings, using defaults: %s", e)
+            app, notifications = {}, {}
+        self.apply(data_handler, app, notifications)
+
+    @staticmethod
+    def fetch(data_handler, from_cache=False):
+        """(app settings, reminder settings) of a user, {} for nobody. Without from_cache this
+        may go to the network, so call it from a worker."""
+        if not data_handler:
+            return {}, {}
+        if from_cache:
+            return (data_handler.cached('app_settings', allow_stale=True) or {},
+                    data_handler.cached('notification_settings', allow_stale=True) or {})
+        return data_handler.get_settings(), data_handler.get_notification_settings()
+
+    @staticmethod
+    def is_cached(data_handler):
+        """True if fetch() would not need the network"""
+        return all(data_handler.cached(table) is not None for table in ('app_settings', 'notification_settings'))
+
+    def apply(self, data_handler, app, notifications):
+        """Switch to settings returned by fetch() and notify everyone"""
+        self.data_handler = data_handler
+        self.app = {**copy.deepcopy(DEFAULT_SETTINGS), **app}
+        self.notifications = {**DEFAULT_NOTIFICATION_SETTINGS, **notifications}
+        self.notify(set(self.app) | {'notifications'})
+
+    def subscribe(self, callback, *keys):
+        """Call callback(changed keys) when any of `keys` changes ('notifications' for reminders), or any key if none"""
+        self.subscribers.append((callback, set(keys)))
+
+    def notify(self, changed):
+        for callback, keys in list(self.subscribers):
+            if not keys or keys & changed:
+                try:
+                    callback(changed)
+                except Exception as e:
+                    ui_log.exception("Error applying settings change: %s", e)
+
+    def update(self, changes, on_error=None):
+        """Change app settings; saved only when a user is logged in"""
+        changed = {key for key, value in changes.items() if self.app.get(key) != value}
+        if not changed:
+            return
+        self.app.update(copy.deepcopy(changes))
+        if self.data_handler and self.save:
+            self.save('app_settings', self.app, on_error=on_error)
+        self.notify(changed)
+
+    def update_notifications(self, changes, on_error=None):
+        """Change reminder settings; saved only when a user is logged in"""
+        if all(self.notifications.get(key) == value for key, value in changes.items()):
+            return
+        self.notifications.update(changes)
+        if self.data_handler and self.save:
+            self.save('notification_settings', self.notifications, on_error=on_error)
+        self.notify({'notifications'})
+
+    def theme(self) -> str:
+        return self.app.get('theme', 'dark')
+
+    def sound_enabled(self) -> bool:
+        return bool(self.app.get('sound', True))
+
+    def progress_style(self) -> str:
+        return self.app.get('progress_style', 'bars')
+
+    def breathing_times(self) -> dict:
+        return {**DEFAULT_SETTINGS['breathing_times'], **self.app.get('breathing_times', {})}
+
+    def phases(self) -> list:
+        return breathing_phases(self.app)
+
+    def reminder_settings(self) -> dict:
+        return dict(self.notifications)
+
+    def log_levels(self):
+        """Optional {subsystem: level} (or "INFO,sync=DEBUG") to raise logging for one user, e.g. while debugging"""
+        return self.app.get('log_levels')
+
 class StartingPage(ctk.CTkFrame):
     def __init__(self, parent, controller):
         super().__init__(parent)
@@ -652,7 +2833,7 @@ class StartingPage(ctk.CTkFrame):
             width=40,
             height=40,
             corner_radius=20,
-            image=ctk.CTkImage(Image.open(get_resource_path("icons/help.png")), size=(20, 20)),
+            image=assets.acquire("icons/help.png", (20, 20)),
             command=lambda: controller.show_frame(HelpPage)
         )
         self.help_button.place(relx=0.95, rely=0.05, anchor="center")
@@ -679,7 +2860,7 @@ class StartingPage(ctk.CTkFrame):
             text="Stats",
             width=button_width,
             fg_color=button_color,
-            image=ctk.CTkImage(Image.open(get_resource_path("icons/stats.png")), size=(20, 20)),
+            image=assets.acquire("icons/stats.png", (20, 20)),
             command=lambda: controller.show_frame(StatsPage)
         )
         self.stats_button.place(x=start_x, y=button_y)
@@ -690,7 +2871,7 @@ class StartingPage(ctk.CTkFrame):
             text="Start",
             width=button_width,
             fg_color=button_color,
-            image=ctk.CTkImage(Image.open(get_resource_path("icons/play.png")), size=(20, 20)),
+            image=assets.acquire("icons/play.png", (20, 20)),
             command=lambda: controller.show_frame(MainPage)
         )
         self.start_Button.place(x=start_x + button_width + spacing, y=button_y)
@@ -701,7 +2882,7 @@ class StartingPage(ctk.CTkFrame):
             text="Achievements",
             width=button_width,
             fg_color=button_color,
-            image=ctk.CTkImage(Image.open(get_resource_path("icons/trophy.png")), size=(20, 20)),
+            image=assets.acquire("icons/trophy.png", (20, 20)),
             command=lambda: controller.show_frame(AchievementsPage)
         )
         self.achievements_button.place(x=start_x + 2 * (button_width + spacing), y=button_y)
@@ -712,7 +2893,7 @@ class StartingPage(ctk.CTkFrame):
             text="Settings",
             width=button_width,
             fg_color=button_color,
-            image=ctk.CTkImage(Image.open(get_resource_path("icons/settings.png")), size=(20, 20)),
+            image=assets.acquire("icons/settings.png", (20, 20)),
             command=lambda: controller.show_frame(SettingsPage)
         )
         self.settings_Button.place(x=start_x + 3 * (button_width + spacing), y=button_y)
@@ -722,49 +2903,156 @@ class StartingPage(ctk.CTkFrame):
         self.account_button = ctk.CTkButton(
             self,
             text="Account",
-            image=ctk.CTkImage(Image.open(get_resource_path("icons/account.png")), size=(20, 20)),
+            image=assets.acquire("icons/account.png", (20, 20)),
             command=lambda: controller.show_frame(AccountPage)
         )
         self.account_button.place(relx=0.8, rely=0.05, anchor="center")
 
+# Named breathing patterns as [(phase name, seconds)]; settings['pattern'] may name one or give its own list
+BREATHING_PATTERNS = {
+    '4-7-8': [('Inhale', 4), ('Hold', 7), ('Exhale', 8)],
+    'box': [('Inhale', 4), ('Hold', 4), ('Exhale', 4), ('Hold', 4)],
+}
+
+def phase_seconds(value):
+    """A phase length from settings as a float, or None if it isn't a finite number"""
+    try:
+        seconds = float(value)
+    except (TypeError, ValueError):
+        return None
+    return seconds if math.isfinite(seconds) else None
+
+def breathing_phases(settings):
+    """[(name, seconds)] for one breathing cycle: the chosen pattern, or the inhale/hold/exhale times.
+
+    Settings come from Supabase as stored by any client, so a time that isn't a number falls back
+    to its 4-7-8 default, and a malformed pattern is ignored in favour of the three times.
+    """
+    pattern = settings.get('pattern')
+    if isinstance(pattern, str):
+        pattern = BREATHING_PATTERNS.get(pattern)
+    if pattern:
+        try:
+            pattern = [(str(name), phase_seconds(seconds)) for name, seconds in pattern]
+        except (TypeError, ValueError):
+            pattern = None  # Not a list of (name, seconds)
+        if pattern and any(seconds is None for _, seconds in pattern):
+            pattern = None
+    if not pattern:
+        defaults = DEFAULT_SETTINGS['breathing_times']
+        times = settings.get('breathing_times')
+        times = times if isinstance(times, dict) else {}
+        pattern = []
+        for name in ('inhale', 'hold', 'exhale'):
+            seconds = phase_seconds(times.get(name, defaults[name]))
+            pattern.append((name.capitalize(), defaults[name] if seconds is None else seconds))
+    # Zero-length phases (e.g. no hold) are skipped
+    phases = [(name, float(seconds)) for name, seconds in pattern if seconds > 0]
+    return phases or BREATHING_PATTERNS['4-7-8']
+
+class BreathingEngine:
+    """Steps through breathing phases on a monotonic clock.
+
+    Phase boundaries are fixed offsets from the start of the cycle and progress is computed
+    from elapsed time, so late ticks delay a transition only until the next tick instead of
+    stretching every phase after it.
+    """
+
+    def __init__(self, phases, on_phase=None, on_cycle=None, clock=time.perf_counter):
+        self.phases = phases
+        self.ends = list(itertools.accumulate(seconds for _, seconds in phases))  # Offsets within a cycle
+        self.cycle_length = self.ends[-1]
+        self.on_phase = on_phase  # on_phase(index, name) when a phase begins
+        self.on_cycle = on_cycle  # on_cycle() when the last phase ends
+        self.clock = clock
+        self.cycle_start = None  # Clock time the current cycle began, moved forward by pauses
+        self.paused_at = None
+        self.phase = 0
+        self.cycles = 0
+
+    @property
+    def running(self):
+        return self.cycle_start is not None and self.paused_at is None
+
+    def start(self):
+        self.cycle_start = self.clock()
+        self.paused_at = None
+        self.phase = 0
+        self.cycles = 0
+        if self.on_phase:
+            self.on_phase(0, self.phases[0][0])
+
+    def pause(self):
+        if self.running:
+            self.paused_at = self.clock()
+
+    def resume(self):
+        if self.cycle_start is not None and self.paused_at is not None:
+            self.cycle_start += self.clock() - self.paused_at
+            self.paused_at = None
+
+    def stop(self):
+        self.cycle_start = None
+        self.paused_at = None
+
+    def update(self):
+        """Fire the transitions that are due and return (phase index, progress from 0 to 1)"""
+        if self.cycle_start is None:
+            return self.phase, 0.0
+        now = self.paused_at if self.paused_at is not None else self.clock()
+
+        # Cycles missed entirely (e.g. the machine was suspended) are skipped rather than counted
+        behind = int((now - self.cycle_start) // self.cycle_length)
+        if behind > 1:
+            self.cycle_start += (behind - 1) * self.cycle_length
+
+        while self.cycle_start is not None and now - self.cycle_start >= self.ends[self.phase]:
+            self.phase += 1
+            if self.phase == len(self.phases):
+                self.phase = 0
+                self.cycle_start += self.cycle_length
+                self.cycles += 1
+                if self.on_cycle:
+                    self.on_cycle()
+            if self.on_phase and self.cycle_start is not None:
+                self.on_phase(self.phase, self.phases[self.phase][0])
+        if self.cycle_start is None:
+            return self.phase, 0.0  # Stopped by a callback
+
+        phase_start = self.ends[self.phase - 1] if self.phase else 0
+        return self.phase, (now - self.cycle_start - phase_start) / self.phases[self.phase][1]
+
+    def time_to_next_phase(self):
+        """Seconds until the current phase ends"""
+        if self.cycle_start is None:
+            return None
+        now = self.paused_at if self.paused_at is not None else self.clock()
+        return max(0.0, self.cycle_start + self.ends[self.phase] - now)
+
 class MainPage(ctk.CTkFrame):
+    TICK_MS = 50  # Progress redraw interval while breathing
+
     def __init__(self, parent, controller):
         super().__init__(parent)
         self.controller = controller
         self.timer = 0
         self.scheduled_tasks = []
         self.is_exercise_active = False
+        self.engine = None
+        self.tick_task = None
+        self.progress_indicators = {}  # progress style -> indicator widget, kept between sessions
+        self.progress_indicator = None
         
         # Add background canvas
         self.bg_canvas = BackgroundCanvas(self)
         self.bg_canvas.place(relx=0, rely=0, relwidth=1, relheight=1)
         
-        # Load settings
-        self.settings = self.get_settings()
+        # Settings are read from the shared store, which tells the page about changes
+        self.settings = controller.settings_store
+        self.settings.subscribe(self.on_settings_changed, 'sound', 'progress_style', 'breathing_times', 'pattern')
         
-        # Initialize audio
-        mixer.init()
-        
-        # Load audio files with better error handling
-        self.inhale_sound = None
-        self.hold_sound = None
-        self.exhale_sound = None
-        self.background_music = None
-        
-        try:
-            if os.path.exists(get_resource_path(os.path.join("audio", "inhale.wav"))):
-                self.inhale_sound = mixer.Sound(get_resource_path(os.path.join("audio", "inhale.wav")))
-            if os.path.exists(get_resource_path(os.path.join("audio", "hold.wav"))):
-                self.hold_sound = mixer.Sound(get_resource_path(os.path.join("audio", "hold.wav")))
-            if os.path.exists(get_resource_path(os.path.join("audio", "exhale.wav"))):
-                self.exhale_sound = mixer.Sound(get_resource_path(os.path.join("audio", "exhale.wav")))
-            if os.path.exists(get_resource_path(os.path.join("audio", "background.wav"))):
-                self.background_music = mixer.Sound(get_resource_path(os.path.join("audio", "background.wav")))
-                # Check settings for sound before playing
-                if self.settings.get('sound', True):
-                    self.background_music.play(-1)
-        except Exception as e:
-            print(f"Warning: Error loading audio files: {e}")
+        # Audio is set up the first time a sound plays; music starts when the page is shown (App.show_frame)
+        self.audio = controller.audio
 
         quotes = [
             "Breathe deeply, for each breath is a new opportunity. -Unknown",
@@ -816,7 +3104,7 @@ class MainPage(ctk.CTkFrame):
         self.restart_button = ctk.CTkButton(
             self,
             text="Restart",
-            image=ctk.CTkImage(Image.open(get_resource_path("icons/restart.png")), size=(20, 20)),
+            image=assets.acquire("icons/restart.png", (20, 20)),
             width=button_width,
             command=self.start_countdown
         )
@@ -825,7 +3113,7 @@ class MainPage(ctk.CTkFrame):
         self.done_button = ctk.CTkButton(
             self,
             text="Done",
-            image=ctk.CTkImage(Image.open(get_resource_path("icons/done.png")), size=(20, 20)),
+            image=assets.acquire("icons/done.png", (20, 20)),
             width=button_width,
             command=self.done_button_click
         )
@@ -839,30 +3127,33 @@ class MainPage(ctk.CTkFrame):
         self.done_button.lift()
     
     def create_progress_indicators(self):
-        for widget in self.progress_container.winfo_children():
-            widget.destroy()
-
-        # Always get fresh settings when creating indicators
-        self.settings = self.get_settings()
-        
-        if self.settings['progress_style'] == 'bars':
-            self.progress_bars = []
-            bar_width = 200
-            spacing = 20
-            
-            for i in range(3):
-                progress = ctk.CTkProgressBar(self.progress_container, width=bar_width)
-                progress.set(0)
-                progress.pack(side="left", padx=spacing)
-                self.progress_bars.append(progress)
-                
-        elif self.settings['progress_style'] == 'circle':
-            self.progress_indicator = CircleProgress(self.progress_container, size=300)
-            self.progress_indicator.pack(padx=20)
-            
-        elif self.settings['progress_style'] == 'triangle':
-            self.progress_indicator = TriangleProgress(self.progress_container, size=300)
-            self.progress_indicator.pack(padx=20)
+        """Show the indicator for the current progress style, reusing the one built for it before"""
+        self.phases = self.settings.phases()
+        style = self.settings.progress_style()
+        indicator = self.progress_indicators.get(style)
+        if indicator is None:
+            if style == 'circle':
+                indicator = CircleProgress(self.progress_container, size=300, segments=len(self.phases))
+            elif style == 'triangle':
+                indicator = TriangleProgress(self.progress_container, size=300, segments=len(self.phases))
+            else:
+                indicator = BarProgress(self.progress_container, segments=len(self.phases))
+            self.progress_indicators[style] = indicator
+
+        if indicator is not self.progress_indicator:
+            if self.progress_indicator:
+                self.progress_indicator.pack_forget()
+            indicator.pack(padx=0 if isinstance(indicator, BarProgress) else 20)
+            self.progress_indicator = indicator
+        indicator.set_segments(len(self.phases))
+        indicator.reset()
+
+    def on_settings_changed(self, changed):
+        # Pages are built ahead of time, so only the page on screen may start the music
+        if 'sound' in changed and (self.controller.current_frame is self or not self.settings.sound_enabled()):
+            self.toggle_background_music(self.settings.sound_enabled())
+        if changed - {'sound'} and not self.is_exercise_active:
+            self.create_progress_indicators()
 
     def cancel_scheduled_tasks(self):
         # Stop all sounds
@@ -874,122 +3165,104 @@ class MainPage(ctk.CTkFrame):
         self.scheduled_tasks.clear()
 
     def stop_all_sounds(self):
-        if hasattr(self, 'inhale_sound') and self.inhale_sound:
-            self.inhale_sound.stop()
-        if hasattr(self, 'hold_sound') and self.hold_sound:
-            self.hold_sound.stop()
-        if hasattr(self, 'exhale_sound') and self.exhale_sound:
-            self.exhale_sound.stop()
-        if hasattr(self, 'background_music') and self.background_music:
-            self.background_music.stop()
+        self.audio.stop_cues()
+        self.audio.stop_music()
 
     def start_countdown(self):
         self.stop_exercise()
         self.is_exercise_active = True
         
-        if self.settings['progress_style'] == 'bars':
-            for bar in self.progress_bars:
-                bar.set(0)
-            
+        self.progress_indicator.reset()
         self.Changing_text.configure(text="Get Ready")
+        if self.settings.sound_enabled():
+            self.audio.load()  # Decode the cues during the countdown rather than on the first inhale
         
         self.scheduled_tasks.extend([
             self.after(1000, lambda: self.Changing_text.configure(text="3")),
             self.after(2000, lambda: self.Changing_text.configure(text="2")),
             self.after(3000, lambda: self.Changing_text.configure(text="1")),
-            self.after(4000, self.start_inhale)
+            self.after(4000, self.start_breathing)
         ])
-    
-    def start_inhale(self):
-        if self.settings['progress_style'] == 'bars':
-            for bar in self.progress_bars:
-                bar.set(0)
-        self.Changing_text.configure(text="Inhale")
-        self.play_sound('inhale')
-        self.animate_progress(0, 0, 4000, lambda: self.start_hold())
-    
-    def start_hold(self):
-        self.Changing_text.configure(text="Hold")
-        self.play_sound('hold')
-        self.animate_progress(1, 0, 7000, lambda: self.start_exhale())
-    
-    def start_exhale(self):
-        self.Changing_text.configure(text="Exhale")
-        self.play_sound('exhale')
-        self.animate_progress(2, 0, 8000, self.complete_cycle)
-    
+
+    def start_breathing(self):
+        self.engine = BreathingEngine(self.phases, on_phase=self.enter_phase, on_cycle=self.complete_cycle)
+        self.engine.start()
+        self.tick()
+
+    def enter_phase(self, index, name):
+        if index == 0:
+            self.progress_indicator.reset()  # New cycle: empty every segment
+        else:
+            self.progress_indicator.set_progress(index - 1, 1)
+        self.Changing_text.configure(text=name)
+        self.play_sound(name.lower())
+
+    def tick(self):
+        """Redraw progress from the engine and come back at the next frame or phase change, whichever is sooner"""
+        self.tick_task = None
+        if not self.engine or not self.engine.running:
+            return
+        segment, progress = self.engine.update()
+        self.progress_indicator.set_progress(segment, min(progress, 1))
+        remaining = self.engine.time_to_next_phase()
+        if remaining is not None:
+            delay = min(self.TICK_MS, math.ceil(remaining * 1000))
+            self.tick_task = self.after(delay, self.tick)
+
+    @metrics.timed("page.MainPage.complete_cycle")
     def complete_cycle(self):
-        if hasattr(self.controller, 'data_handler') and self.controller.data_handler:
-            stats = self.controller.data_handler.get_stats()
-            
+        data_handler = getattr(self.controller, 'data_handler', None)
+        if data_handler:
             today = datetime.now().strftime('%Y-%m-%d')
-            
-            if today in stats:
-                stats[today] += 1
+            try:
+                # Journaled before anything else, so going offline or quitting can't lose it
+                ready = data_handler.finish_cycle(today)
+            except sqlite3.Error as e:
+                sync_log.error("Error journaling cycle: %s", e)
+                return
+            if not ready:
+                # Nothing cached yet; loading the history picks up the journaled cycle
+                self.controller.io.submit(
+                    data_handler.bootstrap,
+                    on_success=lambda _: self.record_cycle(data_handler),
+                    on_error=lambda e: sync_log.warning("Error loading user data: %s", e)
+                )
             else:
-                stats[today] = 1
-            
-            # Save updated stats    
-            self.controller.data_handler.save_stats(stats)
-            
-            # Check for newly unlocked achievements
-            total_cycles = sum(stats.values())
-            unlocked_achievements = self.controller.data_handler.get_achievements()
-            
-            # Achievement definitions from AchievementsPage
-            achievement_definitions = self.controller.frames[AchievementsPage].achievements
-            
-            # Check for cycle-based achievements
-            for achievement_id, achievement in achievement_definitions.items():
-                if (not achievement_id.startswith("streak_") and 
-                    achievement_id not in unlocked_achievements and
-                    total_cycles >= achievement["requirement"]):
-                    
-                    # Unlock the achievement
-                    unlocked_achievements[achievement_id] = {
-                        'unlocked_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                    }
-                    
-                    # Show notification for new achievement
-                    if hasattr(self, 'Changing_text'):
-                        self.after(100, lambda: self.Changing_text.configure(
-                            text=f"Achievement Unlocked: {achievement['name']}"))
-                        self.after(3000, lambda: self.Changing_text.configure(text="Inhale"))
-            
-            # Save updated achievements
-            self.controller.data_handler.save_achievements(unlocked_achievements)
+                self.record_cycle(data_handler)
+        # The engine carries on with the next cycle
+
+    def record_cycle(self, data_handler):
+        """Sync a recorded cycle with the rest of the session's and check for achievements"""
+        if data_handler is not self.controller.data_handler:
+            return  # Logged out in the meantime
+        self.controller.defer_sync()
+
+        # Check for newly unlocked achievements
+        newly_unlocked = data_handler.check_achievements()
+        if not newly_unlocked:
+            return
+        
+        # One save for everything this cycle unlocked
+        engine = data_handler.achievement_engine()
+        self.controller.save_user_data('achievements', engine.unlocked, defer=True)
         
-        # Continue with the next cycle
-        self.start_inhale()
+        # Show notification for new achievement
+        if hasattr(self, 'Changing_text'):
+            names = ", ".join(engine.definitions[achievement_id]['name'] for achievement_id in newly_unlocked)
+            self.after(100, lambda: self.Changing_text.configure(text=f"Achievement Unlocked: {names}"))
+            self.after(3000, self.show_phase_name)
 
-    def animate_progress(self, segment, current, duration, callback):
-        if current <= duration:
-            progress = current / duration
-            
-            if self.settings['progress_style'] == 'bars':
-                self.progress_bars[segment].set(progress)
-            else:
-                self.progress_indicator.set_progress(segment, progress)
-                
-            task = self.after(50, lambda: self.animate_progress(segment, current + 50, duration, callback))
-            self.scheduled_tasks.append(task)
-        else:
-            if self.settings['progress_style'] == 'bars':
-                self.progress_bars[segment].set(1)
-            else:
-                self.progress_indicator.set_progress(segment, 1)
-            callback()
+    def show_phase_name(self):
+        if self.engine and self.engine.running:
+            self.Changing_text.configure(text=self.engine.phases[self.engine.phase][0])
 
     def play_sound(self, sound):
         if not self.is_exercise_active or not self.winfo_viewable():
             return
-            
-        # Get fresh settings to ensure we have the latest sound preference
-        self.settings = self.get_settings()
-        if self.settings.get('sound', True) and hasattr(self, sound + '_sound'):
-            sound_obj = getattr(self, sound + '_sound')
-            if sound_obj:
-                sound_obj.play()
+
+        # Settings are in memory, so a cue never waits on the network
+        if self.settings.sound_enabled():
+            self.audio.play_cue(sound)
 
     def done_button_click(self):
         self.stop_exercise()
@@ -997,53 +3270,136 @@ class MainPage(ctk.CTkFrame):
 
     def stop_exercise(self):
         self.is_exercise_active = False
-        if hasattr(self, 'inhale_sound') and self.inhale_sound:
-            self.inhale_sound.stop()
-        if hasattr(self, 'hold_sound') and self.hold_sound:
-            self.hold_sound.stop()
-        if hasattr(self, 'exhale_sound') and self.exhale_sound:
-            self.exhale_sound.stop()
+        self.audio.stop_cues()
         
         for task in self.scheduled_tasks:
             self.after_cancel(task)
         self.scheduled_tasks.clear()
+        if self.engine:
+            self.engine.stop()
+        if self.tick_task:
+            self.after_cancel(self.tick_task)
+            self.tick_task = None
 
     def toggle_background_music(self, should_play):
-        # Get fresh settings to ensure we have the latest sound preference
-        self.settings = self.get_settings()
-        if hasattr(self, 'background_music') and self.background_music:
-            if should_play and self.settings.get('sound', True):
-                self.background_music.play(-1)
-            else:
-                self.background_music.stop()
+        if should_play and self.settings.sound_enabled():
+            self.audio.play_music()
+        else:
+            self.audio.stop_music()
+
+# "image" draws the stats chart to a cached picture in a worker; "live" keeps an interactive figure on the Tk thread
+CHART_RENDER = os.environ.get("STILLMIND_CHART_RENDER", "image")
 
-    def play_background_music(self):
+class ChartRenderer:
+    """Rasterizes the daily-counts chart off the Tk thread and caches the images in memory and on disk"""
+
+    # Figure and text colors matching CTkFrame in each appearance mode
+    THEME_COLORS = {
+        "Light": ("#dbdbdb", "#1a1a1a"),
+        "Dark": ("#2b2b2b", "#dce4ee"),
+    }
+
+    def __init__(self, directory=None, max_memory=16, max_files=64):
+        self.directory = directory or get_app_data_path("chart_cache")
+        self.max_memory = max_memory
+        self.max_files = max_files
+        self.memory = OrderedDict()  # key -> PIL image, least recently used first
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def key(days, theme, size):
+        """Hash of everything that changes the picture"""
+        return hashlib.sha1(json.dumps([days, theme, size]).encode()).hexdigest()
+
+    def get(self, key):
+        """Image from memory, or None; safe to call on the Tk thread"""
+        with self.lock:
+            image = self.memory.get(key)
+            if image is not None:
+                self.memory.move_to_end(key)
+            return image
+
+    def remember(self, key, image):
+        with self.lock:
+            self.memory[key] = image
+            self.memory.move_to_end(key)
+            while len(self.memory) > self.max_memory:
+                self.memory.popitem(last=False)
+
+    def path(self, key):
+        return os.path.join(self.directory, f"{key}.png")
+
+    def render(self, key, days, theme, size):
+        """Image for `key` from disk, or drawn with Agg; runs in a worker"""
+        image = self.get(key)
+        if image is None:
+            try:
+                with Image.open(self.path(key)) as cached:
+                    image = cached.convert("RGBA")
+            except OSError:
+                image = self.rasterize(days, theme, size)
+                self.save(key, image)
+            self.remember(key, image)
+        return image
+
+    def rasterize(self, days, theme, size):
+        # Only the object API is used here, which is safe outside the main thread
+        Figure, FigureCanvasAgg = get_matplotlib(offscreen=True)
+        face, text = self.THEME_COLORS.get(theme, self.THEME_COLORS["Dark"])
+        dpi = 100
+        figure = Figure(figsize=(size[0] / dpi, size[1] / dpi), dpi=dpi, facecolor=face)
+        canvas = FigureCanvasAgg(figure)
+        figure.subplots_adjust(bottom=0.25)  # Room for the rotated dates
+        ax = figure.add_subplot(facecolor=face)
+        counts = [count for _, count in days]
+        ax.bar(range(len(counts)), counts, color="C0")
+        ax.set_xlim(-0.6, len(counts) - 0.4)
+        ax.set_ylim(0, max(counts + [1]) * 1.1)
+        ticks = StatsPage.date_ticks(days)
+        ax.set_xticks(ticks)
+        ax.set_xticklabels([days[i][0] for i in ticks], rotation=45, ha='right')
+        ax.set_xlabel('Date', color=text)
+        ax.set_ylabel('Completed Cycles', color=text)
+        ax.set_title('Breathing Exercises Per Day', color=text)
+        ax.tick_params(colors=text)
+        for spine in ax.spines.values():
+            spine.set_color(text)
+        canvas.draw()
+        return Image.frombuffer("RGBA", canvas.get_width_height(), canvas.buffer_rgba(), "raw", "RGBA", 0, 1).copy()
+
+    def save(self, key, image):
+        """Write the image atomically and keep only the newest max_files on disk"""
         try:
-            mixer.init()
-            mixer.music.load(get_resource_path("audio/background.wav"))
-            mixer.music.play(-1)  # -1 means loop indefinitely
-        except Exception as e:
-            logging.error(f"Error playing background music: {e}")
+            os.makedirs(self.directory, exist_ok=True)
+            temp_path = self.path(key) + ".tmp"
+            image.save(temp_path, "PNG")
+            os.replace(temp_path, self.path(key))
+            files = sorted(
+                (entry for entry in os.scandir(self.directory) if entry.name.endswith(".png")),
+                key=lambda entry: entry.stat().st_mtime
+            )
+            for entry in files[:-self.max_files]:
+                os.remove(entry.path)
+        except OSError as e:
+            ui_log.warning("Could not cache chart image: %s", e)
 
-    def get_settings(self):
-        if hasattr(self.controller, 'data_handler') and self.controller.data_handler:
-            return self.controller.data_handler.get_settings()
-        else:
-            # Default settings if no user is logged in
-            return {
-                'progress_style': 'bars',
-                'sound': True,
-                'breathing_times': {
-                    'inhale': 4,
-                    'hold': 7,
-                    'exhale': 8
-                }
-            }
+_chart_renderer = None
+
+def get_chart_renderer():
+    """Shared ChartRenderer for the whole process"""
+    global _chart_renderer
+    if _chart_renderer is None:
+        _chart_renderer = ChartRenderer()
+    return _chart_renderer
 
 class StatsPage(ctk.CTkFrame):
+    RANGES = (7, 30, 90, 365)  # Selectable number of days to graph
+    CHART_SIZE = (800, 400)  # Chart size in "image" mode, before display scaling
+
     def __init__(self, parent, controller):
         super().__init__(parent)
         self.controller = controller
+        self.range_days = self.RANGES[0]
         
         # Add background canvas
         self.bg_canvas = BackgroundCanvas(self)
@@ -1060,208 +3416,327 @@ class StatsPage(ctk.CTkFrame):
         self.back_button = ctk.CTkButton(
             self,
             text="Back",
-            image=ctk.CTkImage(Image.open(get_resource_path("icons/back.png")), size=(20, 20)),
+            image=assets.acquire("icons/back.png", (20, 20)),
             command=lambda: controller.show_frame(StartingPage)
         )
         self.back_button.place(relx=0.5, rely=0.95, anchor="center")
         self.back_button.lift()
 
+        self.range_selector = ctk.CTkSegmentedButton(
+            self,
+            values=[f"{days} days" for days in self.RANGES],
+            command=self.change_range
+        )
+        self.range_selector.set(f"{self.range_days} days")
+        self.range_selector.place(relx=0.98, rely=0.05, anchor="e")
+        self.range_selector.lift()
+
         self.graph_frame = ctk.CTkFrame(self)
         self.graph_frame.place(relx=0.5, rely=0.4, anchor="center")
-        
+        self.message_label = ctk.CTkLabel(self.graph_frame, text="", font=("Arial", 16))
+        self.chart_label = ctk.CTkLabel(self.graph_frame, text="")  # Shows the rendered chart in "image" mode
+        self.chart_key = None  # Chart shown, or being rendered, in "image" mode
+
+        # Totals under the graph
+        self.stats_frame = ctk.CTkFrame(self)
+        self.cycle_label = ctk.CTkLabel(self.stats_frame, text="", font=("Arial", 16))
+        self.cycle_label.pack(pady=5)
+        self.streak_label = ctk.CTkLabel(self.stats_frame, text="", font=("Arial", 16))
+        self.streak_label.pack(pady=5)
+
+        # One figure for the life of the page, created on first draw and updated in place afterwards
+        self.figure = None
+        self.ax = None
+        self.bars = None
+        self.figure_canvas = None
+
+        # The graph is drawn by show_frame when the page is opened
+        # A rendered chart image has the theme baked in, so redraw it if the theme changes while it's on screen
+        controller.settings_store.subscribe(self.on_theme_changed, 'theme')
+
+    def show_message(self, text, text_color=None):
+        """Replace the graph with a single message (loading, empty or error state)"""
+        if self.figure_canvas:
+            self.figure_canvas.get_tk_widget().pack_forget()
+        self.chart_label.pack_forget()
+        self.chart_key = None
+        self.stats_frame.place_forget()
+        self.message_label.configure(text=text, text_color=text_color or ctk.ThemeManager.theme["CTkLabel"]["text_color"])
+        self.message_label.pack(pady=20)
+
+    def on_theme_changed(self, changed):
+        # Called after App.apply_theme, so the new appearance mode is already set; the new key renders afresh
+        if CHART_RENDER == "image" and self.controller.current_frame is self:
+            self.update_graph()
+
+    def change_range(self, value):
+        self.range_days = int(value.split()[0])
         self.update_graph()
 
     def update_graph(self):
-        for widget in self.graph_frame.winfo_children():
-            widget.destroy()
-
-        if self.controller.data_handler:
-            stats = self.controller.data_handler.get_stats()
-        else:
-            stats = {}  # Default empty stats if no user is logged in
+        data_handler = self.controller.data_handler
+        if not data_handler:
+            self.draw_graph(([], 0, 0))  # Default empty stats if no user is logged in
+            return
 
-        if not stats:
-            no_data = ctk.CTkLabel(
-                self.graph_frame,
-                text="No breathing exercises completed yet",
-                font=("Arial", 16)
-            )
-            no_data.pack(pady=20)
+        if data_handler.stats_index() is not None:
+            self.draw_graph(self.load_summary(data_handler, self.range_days))
             return
 
-        fig, ax = plt.subplots(figsize=(8, 4))
-        dates = list(stats.keys())[-7:]
-        counts = [stats.get(date, 0) for date in dates]
-        total_cycles = sum(stats.values())
-        streak = self.calculate_streak(stats)
-        stats_frame = ctk.CTkFrame(self)
-        stats_frame.place(relx=0.5, rely=0.8, anchor="center")
+        self.show_message("Loading stats...")
+        self.controller.io.submit(
+            self.load_summary, data_handler, self.range_days,
+            on_success=self.draw_graph,
+            on_error=lambda e: self.show_message(f"Could not load stats: {e}", "#FF0000")
+        )
+
+    @staticmethod
+    def load_summary(data_handler, days=7):
+        """Fetch only what the page draws: the selected days, the total and the streak"""
+        return (
+            data_handler.get_last_n_days(days),
+            data_handler.get_total_since(),
+            data_handler.get_current_streak()
+        )
+
+    @staticmethod
+    def date_ticks(days):
+        """Positions of about a week's worth of date labels, always including today"""
+        return sorted(range(len(days) - 1, -1, -max(1, len(days) // 7)))
+
+    def create_graph(self):
+        Figure, FigureCanvasTkAgg = get_matplotlib()
+        self.figure = Figure(figsize=(8, 4))
+        self.figure.subplots_adjust(bottom=0.25)  # Room for the rotated dates
+        self.ax = self.figure.add_subplot()
+        self.ax.set_xlabel('Date')
+        self.ax.set_ylabel('Completed Cycles')
+        self.ax.set_title('Breathing Exercises Per Day')
+        self.figure_canvas = FigureCanvasTkAgg(self.figure, self.graph_frame)
+
+    def draw_graph(self, summary):
+        days, total_cycles, streak = summary
+        if days and len(days) != self.range_days:
+            return  # Another range was picked while this one loaded
+
+        if not total_cycles:
+            self.show_message("No breathing exercises completed yet")
+            return
 
         # Display statistics
-        cycle_label = ctk.CTkLabel(stats_frame, text=f"Total Cycles: {total_cycles}", font=("Arial", 16))
-        cycle_label.pack(pady=5)
+        self.cycle_label.configure(text=f"Total Cycles: {total_cycles}")
+        self.streak_label.configure(text=f"Current Streak: {streak}")
+        self.stats_frame.place(relx=0.5, rely=0.8, anchor="center")
 
-        streak_label = ctk.CTkLabel(stats_frame, text=f"Current Streak: {streak}", font=("Arial", 16))
-        streak_label.pack(pady=5)
-        
-        ax.bar(dates, counts)
-        ax.set_xlabel('Date')
-        ax.set_ylabel('Completed Cycles')
-        ax.set_title('Breathing Exercises Per Day')
-        plt.xticks(rotation=45)
-        
-        canvas = FigureCanvasTkAgg(fig, self.graph_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill="both", expand=True)
+        if CHART_RENDER == "image":
+            self.draw_chart_image(days)
+        else:
+            self.draw_live_graph(days)
+
+    def draw_chart_image(self, days):
+        renderer = get_chart_renderer()
+        theme = ctk.get_appearance_mode()
+        scaling = ctk.ScalingTracker.get_widget_scaling(self)
+        size = (round(self.CHART_SIZE[0] * scaling), round(self.CHART_SIZE[1] * scaling))
+        key = renderer.key(days, theme, size)
+        if key == self.chart_key:
+            return  # Already showing or rendering this chart
+
+        self.chart_key = key
+        image = renderer.get(key)
+        if image is not None:
+            self.show_chart_image(image)
+            return
 
-    def calculate_streak(self, stats):
-        # Calculate the current streak of consecutive days
-        today = datetime.now().date()
-        dates = sorted([datetime.strptime(date, '%Y-%m-%d').date() for date in stats.keys()])
-        
-        if not dates:
-            return 0
-            
-        # Check if today is in the stats
-        if today in dates:
-            streak = 1
+        if not self.chart_label.winfo_ismapped():
+            self.message_label.configure(text="Drawing chart...")
+            self.message_label.pack(pady=20)
+        self.controller.io.submit(
+            renderer.render, key, days, theme, size,
+            on_success=lambda image: self.finish_chart_image(key, image),
+            on_error=lambda e: self.show_message(f"Could not draw stats: {e}", "#FF0000")
+        )
+
+    def finish_chart_image(self, key, image):
+        if key == self.chart_key:  # Skip charts replaced while they rendered
+            self.show_chart_image(image)
+
+    def show_chart_image(self, image):
+        self.message_label.pack_forget()
+        self.chart_label.configure(image=ctk.CTkImage(light_image=image, dark_image=image, size=self.CHART_SIZE))
+        self.chart_label.pack()
+
+    def draw_live_graph(self, days):
+        if self.figure is None:
+            self.create_graph()
+        counts = [count for _, count in days]
+        if self.bars is not None and len(self.bars) == len(counts):
+            for bar, count in zip(self.bars, counts):
+                bar.set_height(count)
         else:
-            return 0  # No exercise today, no streak
-            
-        prev_date = today
-        for date in sorted(dates, reverse=True):
-            if (prev_date - date).days == 1:
-                streak += 1
-                prev_date = date
-            elif (prev_date - date).days > 1:
-                break
-                
-        return streak
+            if self.bars is not None:
+                self.bars.remove()
+            self.bars = self.ax.bar(range(len(counts)), counts, color="C0")
+            self.ax.set_xlim(-0.6, len(counts) - 0.4)
+        ticks = self.date_ticks(days)
+        self.ax.set_xticks(ticks)
+        self.ax.set_xticklabels([days[i][0] for i in ticks], rotation=45, ha='right')
+        self.ax.set_ylim(0, max(max(counts), 1) * 1.1)
+
+        self.message_label.pack_forget()
+        self.figure_canvas.get_tk_widget().pack(fill="both", expand=True)
+        self.figure_canvas.draw_idle()
 
 class NotificationManager:
+    # Longest single sleep, so wall clock changes and system sleep are noticed within a minute
+    MAX_SLEEP = 60
+    # Reminders missed by more than this (e.g. the machine slept through them) are skipped
+    CATCH_UP_WINDOW = 60 * 60
+    # Difference between wall clock and monotonic time that counts as a clock change
+    CLOCK_JUMP_TOLERANCE = 2
+
     def __init__(self):
-        print("Initializing NotificationManager...")
+        notification_log.debug("Initializing NotificationManager")
         self.notification_thread = None
         self.is_running = False
         self.last_notification_time = None
-        self.settings_last_modified = None
-        self.user_data_handler = None
+        self.lock = threading.Lock()
+        self.wake_event = threading.Event()
+        self.settings_changed = False
+        self.schedule = []  # min-heap of (fire timestamp, 'HH:MM')
+        self.last_fired = {}  # 'HH:MM' -> date it last fired
         
         # Default settings
-        self.settings = {
-            'enabled': True,
-            'time': '09:00'
-        }
+        self.settings = dict(DEFAULT_NOTIFICATION_SETTINGS)
         
-    def set_data_handler(self, data_handler):
-        self.user_data_handler = data_handler
-        if self.user_data_handler:
-            self.settings = self.user_data_handler.get_notification_settings()
-            print(f"Loaded notification settings: {self.settings}")
-
-    def save_settings(self):
-        print("Saving notification settings...")
-        if self.user_data_handler:
-            self.user_data_handler.save_notification_settings(self.settings)
-            print("Settings saved successfully to Supabase")
-            self.last_notification_time = None  # Reset last notification time
-        else:
-            print("No data handler available to save settings")
+    def update_settings(self, settings):
+        """Replace the reminder settings and wake the scheduler to recompute its next fire time"""
+        with self.lock:
+            self.settings = dict(settings)
+            self.settings_changed = True
+        self.wake_event.set()
 
     def start_notification_thread(self):
-        print("Starting notification thread...")
+        notification_log.debug("Starting notification thread")
         if self.notification_thread is None or not self.notification_thread.is_alive():
             self.is_running = True
+            self.wake_event.clear()
+            self.settings_changed = True
             self.notification_thread = threading.Thread(target=self.notification_loop)
             self.notification_thread.daemon = True
             self.notification_thread.start()
-            print("Notification thread started")
+            notification_log.debug("Notification thread started")
 
     def stop_notification_thread(self):
-        print("Stopping notification thread...")
+        notification_log.debug("Stopping notification thread")
         self.is_running = False
+        self.wake_event.set()
         if self.notification_thread:
             self.notification_thread.join(timeout=1)
-        print("Notification thread stopped")
-
-    def check_settings_updated(self):
-        if self.user_data_handler:
-            current_settings = self.user_data_handler.get_notification_settings()
-            if current_settings != self.settings:
-                self.settings = current_settings
-                self.last_notification_time = None  # Reset last notification time
-                print("Settings updated from Supabase:", self.settings)
-                return True
-        return False
-
-    def should_send_notification(self):
-        if not self.settings['enabled']:
-            print("Notifications are disabled")
-            return False
+        notification_log.debug("Notification thread stopped")
+
+    def reminder_times(self):
+        """Valid reminder times from the settings, as sorted 'HH:MM' strings"""
+        if not self.settings.get('enabled', True):
+            return []
+        times = self.settings.get('times') or [self.settings.get('time', '09:00')]
+        valid = set()
+        for value in times:
+            try:
+                valid.add(datetime.strptime(value, '%H:%M').strftime('%H:%M'))
+            except (TypeError, ValueError):
+                notification_log.warning("Ignoring invalid reminder time: %s", value)
+        return sorted(valid)
 
-        # Check if settings have been updated
-        self.check_settings_updated()
+    @staticmethod
+    def next_occurrence(time_str, after):
+        """First datetime strictly after `after` whose wall clock time is time_str"""
+        reminder_time = datetime.strptime(time_str, '%H:%M').time()
+        candidate = datetime.combine(after.date(), reminder_time)
+        if candidate <= after:
+            candidate = datetime.combine(after.date() + timedelta(days=1), reminder_time)
+        return candidate
+
+    def rebuild_schedule(self, now):
+        with self.lock:
+            self.settings_changed = False
+            times = self.reminder_times()
+        self.schedule = [(self.next_occurrence(t, now).timestamp(), t) for t in times]
+        heapq.heapify(self.schedule)
+
+    def fire_due(self, now):
+        """Pop every reminder that is due, reschedule it and send at most one notification"""
+        due = False
+        while self.schedule and self.schedule[0][0] <= now.timestamp():
+            fire_at, time_str = heapq.heappop(self.schedule)
+            heapq.heappush(self.schedule, (self.next_occurrence(time_str, now).timestamp(), time_str))
+
+            target = datetime.fromtimestamp(fire_at)
+            if self.last_fired.get(time_str) == target.date():
+                continue  # Already sent, e.g. the clock was set back
+            self.last_fired[time_str] = target.date()
+            if (now - target).total_seconds() <= self.CATCH_UP_WINDOW:
+                due = True
+            else:
+                metrics.count("notifications.skipped")
+                notification_log.info("Skipping reminder missed at %s", target.strftime('%Y-%m-%d %H:%M'))
 
-        now = datetime.now()
-        try:
-            notification_time = datetime.strptime(self.settings['time'], '%H:%M').time()
-            current_time = now.time()
-            target_datetime = datetime.combine(now.date(), notification_time)
-            
-            print(f"\nNotification Debug Info:")
-            print(f"Current time: {current_time.strftime('%H:%M:%S')}")
-            print(f"Target time: {notification_time.strftime('%H:%M')}")
-            print(f"Scheduled for: {target_datetime.strftime('%Y-%m-%d %H:%M')}")
-            print(f"Last notification sent: {self.last_notification_time}")
-            
-            # Only proceed if hours and minutes match exactly
-            time_matches = (current_time.hour == notification_time.hour and 
-                          current_time.minute == notification_time.minute)
-            
-            if time_matches:
-                # Make sure we haven't sent a notification in the last 30 seconds
-                if (self.last_notification_time and 
-                    (now - self.last_notification_time).total_seconds() < 30):
-                    print("Skipping: Last notification was sent less than 30 seconds ago")
-                    return False
-                    
-                print(f"✓ It's notification time! Preparing to send notification...")
-                return True
-            
-            print("× Not notification time yet")
-            return False
-            
-        except Exception as e:
-            print(f"Error checking notification time: {e}")
-            return False
+        # Several reminders due at once (e.g. after waking from sleep) collapse into one
+        if due:
+            self.send_notification()
+            self.last_notification_time = now
+            notification_log.info("Notification sent at %s", now.strftime('%Y-%m-%d %H:%M:%S'))
 
     def notification_loop(self):
-        print("\nStarting notification loop...")
-        print("Notification system is running and checking for scheduled times")
+        notification_log.debug("Starting notification loop")
         while self.is_running:
             try:
-                if self.should_send_notification():
-                    self.send_notification()
-                    self.last_notification_time = datetime.now()
-                    print(f"✓ Notification sent at: {self.last_notification_time.strftime('%Y-%m-%d %H:%M:%S')}")
-                time.sleep(1)  # Check every second
+                if self.settings_changed:
+                    self.rebuild_schedule(datetime.now())
+
+                wall_before, mono_before = time.time(), time.monotonic()
+                if self.schedule:
+                    timeout = min(max(self.schedule[0][0] - wall_before, 0), self.MAX_SLEEP)
+                else:
+                    timeout = None  # Nothing scheduled, sleep until settings change
+
+                if self.wake_event.wait(timeout):
+                    self.wake_event.clear()
+                    metrics.count("notifications.woken")
+                    continue
+                metrics.count("notifications.timeouts")
+
+                # Monotonic time ignores clock changes, so any difference means the wall clock moved
+                expected_wall = wall_before + (time.monotonic() - mono_before)
+                if time.time() < expected_wall - self.CLOCK_JUMP_TOLERANCE:
+                    # Clock set back, fire times computed from the old clock are too late
+                    notification_log.info("System clock moved back, rescheduling reminders")
+                    metrics.count("notifications.clock_changes")
+                    self.rebuild_schedule(datetime.now())
+
+                with metrics.span("notifications.fire_due"):
+                    self.fire_due(datetime.now())
                     
             except Exception as e:
-                print(f"Error in notification loop: {e}")
-                time.sleep(5)
+                metrics.count("notifications.loop_errors")
+                notification_log.exception("Error in notification loop: %s", e)
+                self.wake_event.wait(5)
 
+    @metrics.timed("notifications.send")
     def send_notification(self):
         try:
-            print("\nSending notification...")
-            notification.notify(
+            notification_log.debug("Sending notification")
+            get_notifier().notify(
                 title='StillMind Reminder',
                 message='Time for your daily breathing exercise!',
                 app_icon=None,
                 timeout=10,
             )
-            print("✓ Notification sent successfully")
+            metrics.count("notifications.sent")
+            notification_log.debug("Notification sent successfully")
         except Exception as e:
-            print(f"× Error sending notification: {e}")
+            metrics.count("notifications.send_errors")
+            notification_log.error("Error sending notification: %s", e)
 
 class SettingsPage(ctk.CTkFrame):
     def __init__(self, parent, controller):
@@ -1289,8 +3764,8 @@ class SettingsPage(ctk.CTkFrame):
         )
         self.scrollable_frame.place(relx=0.5, rely=0.5, anchor="center")
 
-        # Load settings
-        self.settings = self.get_settings()
+        # Settings live in the shared store; the widgets are filled from it
+        self.settings = controller.settings_store
 
         # Create frames for different setting sections
         general_frame = ctk.CTkFrame(self.scrollable_frame)
@@ -1313,7 +3788,7 @@ class SettingsPage(ctk.CTkFrame):
             offvalue=False
         )
         self.theme_switch.pack(side="right", expand=True)
-        self.theme_switch.select() if self.settings['theme'] == 'dark' else self.theme_switch.deselect()
+        self.theme_switch.select() if self.settings.theme() == 'dark' else self.theme_switch.deselect()
 
         # Sound setting
         sound_frame = ctk.CTkFrame(general_frame)
@@ -1328,7 +3803,7 @@ class SettingsPage(ctk.CTkFrame):
             offvalue=False
         )
         self.sound_switch.pack(side="right", expand=True)
-        self.sound_switch.select() if self.settings['sound'] else self.sound_switch.deselect()
+        self.sound_switch.select() if self.settings.sound_enabled() else self.sound_switch.deselect()
 
         # Breathing Settings
         breathing_frame = ctk.CTkFrame(self.scrollable_frame)
@@ -1344,7 +3819,7 @@ class SettingsPage(ctk.CTkFrame):
         inhale_label.pack(side="left", expand=True)
         self.inhale_entry = ctk.CTkEntry(inhale_frame, width=100)
         self.inhale_entry.pack(side="right", expand=True)
-        self.inhale_entry.insert(0, str(self.settings['breathing_times']['inhale']))
+        self.inhale_entry.insert(0, str(self.settings.breathing_times()['inhale']))
 
         # Hold setting
         hold_frame = ctk.CTkFrame(breathing_frame)
@@ -1353,7 +3828,7 @@ class SettingsPage(ctk.CTkFrame):
         hold_label.pack(side="left", expand=True)
         self.hold_entry = ctk.CTkEntry(hold_frame, width=100)
         self.hold_entry.pack(side="right", expand=True)
-        self.hold_entry.insert(0, str(self.settings['breathing_times']['hold']))
+        self.hold_entry.insert(0, str(self.settings.breathing_times()['hold']))
 
         # Exhale setting
         exhale_frame = ctk.CTkFrame(breathing_frame)
@@ -1362,7 +3837,7 @@ class SettingsPage(ctk.CTkFrame):
         exhale_label.pack(side="left", expand=True)
         self.exhale_entry = ctk.CTkEntry(exhale_frame, width=100)
         self.exhale_entry.pack(side="right", expand=True)
-        self.exhale_entry.insert(0, str(self.settings['breathing_times']['exhale']))
+        self.exhale_entry.insert(0, str(self.settings.breathing_times()['exhale']))
 
         # Progress Style Settings
         style_frame = ctk.CTkFrame(self.scrollable_frame)
@@ -1371,7 +3846,7 @@ class SettingsPage(ctk.CTkFrame):
         style_label = ctk.CTkLabel(style_frame, text="Progress Style", font=("Arial", 16, "bold"))
         style_label.pack(pady=10)
 
-        self.style_var = ctk.StringVar(value=self.settings['progress_style'])
+        self.style_var = ctk.StringVar(value=self.settings.progress_style())
         self.style_menu = ctk.CTkOptionMenu(
             style_frame,
             values=['bars', 'circle', 'triangle'],
@@ -1388,7 +3863,7 @@ class SettingsPage(ctk.CTkFrame):
         notification_label.pack(pady=10)
 
         # Load notification settings
-        self.notification_settings = self.get_notification_settings()
+        self.notification_settings = self.settings.reminder_settings()
 
         # Notification switch
         notification_switch_frame = ctk.CTkFrame(notification_frame)
@@ -1438,299 +3913,236 @@ class SettingsPage(ctk.CTkFrame):
         self.back_button = ctk.CTkButton(
             self,
             text="Back",
-            image=ctk.CTkImage(Image.open(get_resource_path("icons/back.png")), size=(20, 20)),
+            image=assets.acquire("icons/back.png", (20, 20)),
             command=lambda: controller.show_frame(StartingPage)
         )
         self.back_button.place(relx=0.5, rely=0.9, anchor="center")
         self.back_button.lift()
 
-    def get_settings(self):
-        if self.controller.data_handler:
-            return self.controller.data_handler.get_settings()
-        else:
-            # Default settings if no user is logged in
-            return {
-                'theme': 'dark',
-                'sound': True,
-                'breathing_times': {
-                    'inhale': 4,
-                    'hold': 7,
-                    'exhale': 8
-                },
-                'notifications': True,
-                'progress_style': 'bars'
-            }
-
-    def get_notification_settings(self):
-        if self.controller.data_handler:
-            return self.controller.data_handler.get_notification_settings()
-        else:
-            # Default notification settings if no user is logged in
-            return {
-                'enabled': True,
-                'time': '09:00'
-            }
-
     def toggle_theme(self):
-        self.settings['theme'] = 'dark' if self.theme_switch.get() else 'light'
-        # Update theme immediately
-        if self.settings['theme'] == 'dark':
-            ctk.set_appearance_mode("dark")
-        else:
-            ctk.set_appearance_mode("light")
-        
-        # Update button colors
-        button_color = get_button_color()
-        for frame in self.controller.frames.values():
-            for widget in frame.winfo_children():
-                if isinstance(widget, ctk.CTkButton):
-                    widget.configure(fg_color=button_color)
-        
-        # Update all background canvases
-        for frame in self.controller.frames.values():
-            if hasattr(frame, 'bg_canvas'):
-                frame.bg_canvas.update_background_color()
-        
-        self.save_settings()
+        # The store applies the theme to every page through the App's subscription
+        self.settings.update({'theme': 'dark' if self.theme_switch.get() else 'light'}, on_error=self.show_save_error)
 
     def toggle_sound(self):
-        self.settings['sound'] = self.sound_switch.get()
-        self.save_settings()
-        
-        # Update sound state immediately in MainPage
-        main_page = self.controller.frames[MainPage]
-        if main_page:
-            main_page.settings = self.settings  # Update MainPage settings
-            main_page.toggle_background_music(self.sound_switch.get())
+        # MainPage starts or stops the background music when told about the change
+        self.settings.update({'sound': bool(self.sound_switch.get())}, on_error=self.show_save_error)
 
     def change_progress_style(self, choice):
-        self.settings['progress_style'] = choice
-        self.save_settings()
-        
-        # Immediately update MainPage settings
-        if self.controller.frames[MainPage]:
-            self.controller.frames[MainPage].settings = self.settings
-
-    def refresh_settings_from_database(self):
-        """Reload settings from database and update UI elements"""
-        if self.controller.data_handler:
-            self.settings = self.controller.data_handler.get_settings()
-            self.notification_settings = self.controller.data_handler.get_notification_settings()
-            
-            # Update UI to reflect current settings
-            self.theme_switch.select() if self.settings['theme'] == 'dark' else self.theme_switch.deselect()
-            self.sound_switch.select() if self.settings.get('sound', True) else self.sound_switch.deselect()
-            
-            # Update breathing times
-            self.inhale_entry.delete(0, 'end')
-            self.inhale_entry.insert(0, str(self.settings['breathing_times']['inhale']))
-            self.hold_entry.delete(0, 'end')
-            self.hold_entry.insert(0, str(self.settings['breathing_times']['hold']))
-            self.exhale_entry.delete(0, 'end')
-            self.exhale_entry.insert(0, str(self.settings['breathing_times']['exhale']))
-            
-            # Update progress style dropdown
-            self.style_var.set(self.settings['progress_style'])
-            
-            # Update notification settings
-            self.notification_switch.select() if self.notification_settings['enabled'] else self.notification_switch.deselect()
-            time_parts = self.notification_settings['time'].split(':')
-            if len(time_parts) == 2:
-                self.hours_var.set(time_parts[0])
-                self.minutes_var.set(time_parts[1])
+        self.settings.update({'progress_style': choice}, on_error=self.show_save_error)
+
+    def refresh_from_store(self):
+        """Update the widgets to the current settings"""
+        self.theme_switch.select() if self.settings.theme() == 'dark' else self.theme_switch.deselect()
+        self.sound_switch.select() if self.settings.sound_enabled() else self.sound_switch.deselect()
+        
+        # Update breathing times
+        breathing_times = self.settings.breathing_times()
+        self.inhale_entry.delete(0, 'end')
+        self.inhale_entry.insert(0, str(breathing_times['inhale']))
+        self.hold_entry.delete(0, 'end')
+        self.hold_entry.insert(0, str(breathing_times['hold']))
+        self.exhale_entry.delete(0, 'end')
+        self.exhale_entry.insert(0, str(breathing_times['exhale']))
+        
+        # Update progress style dropdown
+        self.style_var.set(self.settings.progress_style())
+        
+        # Update notification settings
+        self.notification_settings = self.settings.reminder_settings()
+        self.notification_switch.select() if self.notification_settings['enabled'] else self.notification_switch.deselect()
+        time_parts = self.notification_settings['time'].split(':')
+        if len(time_parts) == 2:
+            self.hours_var.set(time_parts[0])
+            self.minutes_var.set(time_parts[1])
     
     def save_changes(self):
         try:
-            self.settings['breathing_times']['inhale'] = int(self.inhale_entry.get())
-            self.settings['breathing_times']['hold'] = int(self.hold_entry.get())
-            self.settings['breathing_times']['exhale'] = int(self.exhale_entry.get())
-            self.save_settings()
-            messagebox.showinfo("Success", "Settings saved successfully!")
-            
-            # Immediately apply settings to MainPage
-            if self.controller.frames[MainPage]:
-                self.controller.frames[MainPage].settings = self.settings
-            
+            breathing_times = {
+                'inhale': int(self.inhale_entry.get()),
+                'hold': int(self.hold_entry.get()),
+                'exhale': int(self.exhale_entry.get())
+            }
         except ValueError:
             messagebox.showerror("Error", "Please enter valid numbers for breathing times")
-    
-    def change_progress_style(self, choice):
-        self.settings['progress_style'] = choice
-        self.save_settings()
-        
-        # Immediately update MainPage settings
-        if self.controller.frames[MainPage]:
-            self.controller.frames[MainPage].settings = self.settings
-    
-    def save_settings(self):
-        if self.controller.data_handler:
-            self.controller.data_handler.save_settings(self.settings)
-        # If no data handler, settings won't be saved (logged out state)
+            return
+        self.settings.update({'breathing_times': breathing_times}, on_error=self.show_save_error)
+        messagebox.showinfo("Success", "Settings saved successfully!")
+
+    def show_save_error(self, error):
+        messagebox.showerror("Error", f"Could not save settings: {error}")
 
     def toggle_notifications(self):
-        self.notification_settings['enabled'] = self.notification_switch.get()
-        self.save_notification_settings()
+        self.save_notification_settings({'enabled': bool(self.notification_switch.get())})
     
     def update_notification_time(self, *args):
         hour = self.hours_var.get()
         minute = self.minutes_var.get()
-        new_time = f"{hour}:{minute}"
-        
-        if new_time != self.notification_settings['time']:
-            self.notification_settings['time'] = new_time
-            self.save_notification_settings()
+        self.save_notification_settings({'time': f"{hour}:{minute}"})
     
-    def save_notification_settings(self):
-        if self.controller.data_handler:
-            self.controller.data_handler.save_notification_settings(self.notification_settings)
-        # If no data handler, settings won't be saved (logged out state)
+    def save_notification_settings(self, changes):
+        # The store saves when logged in and wakes the reminder scheduler through its subscription
+        self.settings.update_notifications(changes, on_error=self.show_save_error)
+        self.notification_settings = self.settings.reminder_settings()
+
+class BarProgress(ctk.CTkFrame):
+    """One progress bar per breathing phase"""
+
+    def __init__(self, parent, segments=3, **kwargs):
+        super().__init__(parent, fg_color="transparent", **kwargs)
+        self.bars = []
+        self.values = []
+        self.set_segments(segments)
+
+    def set_segments(self, segments):
+        if segments == len(self.bars):
+            return
+        for bar in self.bars:
+            bar.destroy()
+        self.bars = []
+        for i in range(segments):
+            bar = ctk.CTkProgressBar(self, width=600 // segments)
+            bar.set(0)
+            bar.pack(side="left", padx=20)
+            self.bars.append(bar)
+        self.values = [0] * segments
+
+    def set_progress(self, segment, progress):
+        if self.values[segment] != progress:
+            self.values[segment] = progress
+            self.bars[segment].set(progress)
+
+    def reset(self):
+        for segment in range(len(self.bars)):
+            self.set_progress(segment, 0)
 
 class CircleProgress(ctk.CTkCanvas):
-    def __init__(self, parent, size=200, **kwargs):
+    """Ring of arcs, one per breathing phase, created once and updated in place"""
+
+    def __init__(self, parent, size=200, segments=3, **kwargs):
         super().__init__(parent, width=size, height=size, highlightthickness=0, borderwidth=0, bg="#333333", **kwargs)
         self.size = size
-        self.segments = 3
-        self.current_segment = 0
-        self.progress = 0
-        self.draw_circle()
-    
-    def draw_circle(self):
+        self.segments = 0
+        self.arcs = []
+        self.shown = []  # (fill, extent) currently configured on each arc
+        self.set_segments(segments)
+
+    def set_segments(self, segments):
+        """Create the arc items; only needed again when the number of phases changes"""
+        if segments == self.segments:
+            return
         self.delete("all")
-        center = self.size // 2
-        radius = (self.size - 20) // 2
-        
-        for i in range(self.segments):
-            start = i * (360 / self.segments)
-            end = (i + 1) * (360 / self.segments)
-            
-            if i < self.current_segment:
-                fill = "green"
-            elif i == self.current_segment:
-                fill = "green"
-                end = start + (end - start) * self.progress
-            else:
-                fill = "gray"
-                
-            start_rad = math.radians(start - 90)
-            end_rad = math.radians(end - 90)
-            
-            x1 = center + radius * math.cos(start_rad)
-            y1 = center + radius * math.sin(start_rad)
-            x2 = center + radius * math.cos(end_rad)
-            y2 = center + radius * math.sin(end_rad)
-            
+        self.segments = segments
+        span = 360 / segments
+        self.arcs = [
             self.create_arc(
                 20, 20, self.size-20, self.size-20,
-                start=start-90, extent=end-start,
-                fill=fill, outline="white"
+                start=i * span - 90, extent=span,
+                fill="gray", outline="white"
             )
-    
+            for i in range(segments)
+        ]
+        self.shown = [("gray", span)] * segments
+        self.current_segment = 0
+        self.progress = 0
+
+    def show(self, segment, fill, extent):
+        if self.shown[segment] != (fill, extent):
+            self.shown[segment] = (fill, extent)
+            self.itemconfig(self.arcs[segment], fill=fill, extent=extent)
+
     def set_progress(self, segment, progress):
+        span = 360 / self.segments
+        if segment != self.current_segment:
+            # Only the segments between the old and new position change state
+            for i in range(self.segments):
+                if i < segment:
+                    self.show(i, "green", span)
+                elif i > segment:
+                    self.show(i, "gray", span)
         self.current_segment = segment
         self.progress = progress
-        self.draw_circle()
+        self.show(segment, "green", span * progress)
+
+    def reset(self):
+        self.set_progress(0, 0)
 
 class TriangleProgress(ctk.CTkCanvas):
-    def __init__(self, parent, size=200, **kwargs):
+    """Triangle (or polygon, for more phases) whose sides fill in turn; line items are moved, not recreated"""
+
+    def __init__(self, parent, size=200, segments=3, **kwargs):
         super().__init__(parent, width=size, height=size, highlightthickness=0, borderwidth=0, bg="#333333", **kwargs)
         self.size = size
-        self.current_side = 0
-        self.progress = 0
-        self.draw_triangle()
-    
-    def draw_triangle(self):
-        self.delete("all")
+        self.sides = 0
+        self.side_points = []
+        self.lines = []  # (green line, gray line) per side
+        self.shown = []  # Fraction of each side currently drawn green
+        self.set_segments(segments)
+
+    def corners(self, sides):
         padding = 20
         height = self.size - 2 * padding
-        width = height * math.sqrt(3) / 2
-        
-        top = (self.size/2, padding)
-        bottom_left = (self.size/2 - width/2, self.size - padding)
-        bottom_right = (self.size/2 + width/2, self.size - padding)
-        
-        sides = [
-            (top, bottom_right),
-            (bottom_right, bottom_left),
-            (bottom_left, top)
+        if sides == 3:
+            width = height * math.sqrt(3) / 2
+            return [
+                (self.size/2, padding),
+                (self.size/2 + width/2, self.size - padding),
+                (self.size/2 - width/2, self.size - padding)
+            ]
+        radius = height / 2
+        return [
+            (self.size/2 + radius * math.sin(2 * math.pi * i / sides),
+             self.size/2 - radius * math.cos(2 * math.pi * i / sides))
+            for i in range(sides)
         ]
-        
-        # Draw each side with thicker lines (increased from 3 to 8)
-        for i, (start, end) in enumerate(sides):
-            if i < self.current_side:
-                color = "green"  # Completed sides
-            elif i == self.current_side:
-                # Current side - partially filled
-                mid_x = start[0] + (end[0] - start[0]) * self.progress
-                mid_y = start[1] + (end[1] - start[1]) * self.progress
-                self.create_line(start[0], start[1], mid_x, mid_y, fill="green", width=8)
-                self.create_line(mid_x, mid_y, end[0], end[1], fill="gray", width=8)
-                continue
-            else:
-                color = "gray"  # Future sides
-            
-            self.create_line(start[0], start[1], end[0], end[1], fill=color, width=8)
-    
+
+    def set_segments(self, segments):
+        """Create the line items; only needed again when the number of phases changes"""
+        if segments == self.sides:
+            return
+        self.delete("all")
+        self.sides = segments
+        corners = self.corners(segments)
+        self.side_points = list(zip(corners, corners[1:] + corners[:1]))
+        # Each side is a green part and a gray part that meet at the progress point
+        self.lines = [
+            (self.create_line(*start, *start, fill="green", width=8),
+             self.create_line(*start, *end, fill="gray", width=8))
+            for start, end in self.side_points
+        ]
+        self.shown = [0] * segments
+        self.current_side = 0
+        self.progress = 0
+
+    def show(self, side, progress):
+        if self.shown[side] == progress:
+            return
+        self.shown[side] = progress
+        start, end = self.side_points[side]
+        mid_x = start[0] + (end[0] - start[0]) * progress
+        mid_y = start[1] + (end[1] - start[1]) * progress
+        green, gray = self.lines[side]
+        self.coords(green, start[0], start[1], mid_x, mid_y)
+        self.coords(gray, mid_x, mid_y, end[0], end[1])
+
     def set_progress(self, side, progress):
+        if side != self.current_side:
+            for i in range(self.sides):
+                if i != side:
+                    self.show(i, 1 if i < side else 0)
         self.current_side = side
         self.progress = progress
-        self.draw_triangle()
+        self.show(side, progress)
+
+    def reset(self):
+        self.set_progress(0, 0)
 
 class AchievementsPage(ctk.CTkFrame):
     def __init__(self, parent, controller):
         super().__init__(parent)
         self.controller = controller
         
-        # Define achievements dictionary - this is our achievement definitions, not unlocked achievements
-        self.achievements = {
-            "first_breath": {
-                "name": "First Breath",
-                "description": "Complete your first breathing exercise",
-                "icon": "🌱",
-                "requirement": 1
-            },
-            "beginner": {
-                "name": "Beginner",
-                "description": "Complete 10 breathing exercises",
-                "icon": "🌿",
-                "requirement": 10
-            },
-            "intermediate": {
-                "name": "Intermediate",
-                "description": "Complete 50 breathing exercises",
-                "icon": "🌳",
-                "requirement": 50
-            },
-            "advanced": {
-                "name": "Advanced",
-                "description": "Complete 100 breathing exercises",
-                "icon": "🌲",
-                "requirement": 100
-            },
-            "master": {
-                "name": "Breath Master",
-                "description": "Complete 500 breathing exercises",
-                "icon": "🏆",
-                "requirement": 500
-            },
-            "streak_3": {
-                "name": "Consistent",
-                "description": "Maintain a 3-day streak",
-                "icon": "📆",
-                "requirement": 3
-            },
-            "streak_7": {
-                "name": "Dedicated",
-                "description": "Maintain a 7-day streak",
-                "icon": "🔥",
-                "requirement": 7
-            },
-            "streak_30": {
-                "name": "Committed",
-                "description": "Maintain a 30-day streak",
-                "icon": "⭐",
-                "requirement": 30
-            }
-        }
+        # Achievement definitions, not unlocked achievements
+        self.achievements = ACHIEVEMENT_DEFINITIONS
         
         # Add background canvas
         self.bg_canvas = BackgroundCanvas(self)
@@ -1755,57 +4167,64 @@ class AchievementsPage(ctk.CTkFrame):
         self.back_button = ctk.CTkButton(
             self,
             text="Back",
-            image=ctk.CTkImage(Image.open(get_resource_path("icons/back.png")), size=(20, 20)),
+            image=assets.acquire("icons/back.png", (20, 20)),
             command=lambda: controller.show_frame(StartingPage)
         )
         self.back_button.place(relx=0.5, rely=0.9, anchor="center")
         self.back_button.lift()
 
-        self.update_achievements()
+        # The list is filled by show_frame when the page is opened
 
-    def calculate_streak(self, stats):
-        # Calculate the current streak of consecutive days
-        today = datetime.now().date()
-        dates = sorted([datetime.strptime(date, '%Y-%m-%d').date() for date in stats.keys()])
-        
-        if not dates:
-            return 0
-            
-        # Check if today is in the stats
-        if today in dates:
-            streak = 1
-        else:
-            return 0  # No exercise today, no streak
-            
-        prev_date = today
-        for date in sorted(dates, reverse=True):
-            if (prev_date - date).days == 1:
-                streak += 1
-                prev_date = date
-            elif (prev_date - date).days > 1:
-                break
-                
-        return streak
+    def show_message(self, text, text_color=None):
+        """Replace the list with a single message (loading or error state)"""
+        for widget in self.scrollable_frame.winfo_children():
+            widget.destroy()
+        label = ctk.CTkLabel(self.scrollable_frame, text=text, font=("Arial", 16))
+        if text_color:
+            label.configure(text_color=text_color)
+        label.pack(pady=50)
 
     def update_achievements(self):
+        data_handler = getattr(self.controller, 'data_handler', None)
+        if not data_handler:
+            self.display_achievements(0, 0, {})
+            return
+
+        if data_handler.stats_index() is not None and data_handler.cached('achievements') is not None:
+            self.unlock_and_display(data_handler, *self.load_progress(data_handler))
+            return
+
+        self.show_message("Loading achievements...")
+        self.controller.io.submit(
+            self.load_progress, data_handler,
+            on_success=lambda result: self.unlock_and_display(data_handler, *result),
+            on_error=lambda e: self.show_message(f"Could not load achievements: {e}", "#FF0000")
+        )
+
+    @staticmethod
+    def load_progress(data_handler):
+        """(total cycles, current streak, unlocked achievements), from the cache where possible"""
+        return (
+            data_handler.get_total_since(),
+            data_handler.get_current_streak(),
+            data_handler.get_achievements()
+        )
+
+    def unlock_and_display(self, data_handler, total_cycles, current_streak, unlocked_achievements):
+        # Catch up on anything reached without a cycle event, e.g. on another device
+        if data_handler.check_achievements(total_cycles, current_streak):
+            self.controller.save_user_data('achievements', data_handler.achievement_engine().unlocked)
+        engine = data_handler.achievement_engine()
+        if engine is not None:
+            unlocked_achievements = engine.unlocked
+        self.display_achievements(total_cycles, current_streak, unlocked_achievements)
+
+    def display_achievements(self, total_cycles, current_streak, unlocked_achievements):
         # Clear existing achievements display
         for widget in self.scrollable_frame.winfo_children():
             widget.destroy()
 
-        # Load user stats
-        stats = {}
-        if hasattr(self.controller, 'data_handler') and self.controller.data_handler:
-            stats = self.controller.data_handler.get_stats()
-
-        # Calculate total cycles and current streak
-        total_cycles = sum(stats.values()) if stats else 0
-        current_streak = self.calculate_streak(stats)
-
-        # Load unlocked achievements from database
-        unlocked_achievements = {}
-        if hasattr(self.controller, 'data_handler') and self.controller.data_handler:
-            unlocked_achievements = self.controller.data_handler.get_achievements()
-            print(f"Loaded achievements from database: {unlocked_achievements}")  # Debugging
+        ui_log.debug("Loaded achievements from database: %s", unlocked_achievements)
 
         # Display achievements
         for i, (achievement_id, achievement) in enumerate(self.achievements.items()):
@@ -1821,26 +4240,6 @@ class AchievementsPage(ctk.CTkFrame):
                     unlock_date = unlocked_achievements[achievement_id].get('unlocked_at', 'Unknown date')
                 else:
                     unlock_date = unlocked_achievements[achievement_id]
-            # Or if meets requirements now
-            elif achievement_id.startswith("streak_"):
-                req_streak = achievement["requirement"]
-                if current_streak >= req_streak:
-                    is_unlocked = True
-            else:
-                # Check total cycles for other achievements
-                if total_cycles >= achievement["requirement"]:
-                    is_unlocked = True
-            
-            # Update unlocked achievements in database if newly unlocked
-            if is_unlocked and achievement_id not in unlocked_achievements and hasattr(self.controller, 'data_handler') and self.controller.data_handler:
-                current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                unlocked_achievements[achievement_id] = {
-                    'unlocked_at': current_time
-                }
-                # Save to database
-                self.controller.data_handler.save_achievements(unlocked_achievements)
-                unlock_date = current_time
-                print(f"New achievement unlocked: {achievement_id} at {unlock_date}")  # Debugging
             
             # Create achievement frame
             achievement_frame = ctk.CTkFrame(self.scrollable_frame)
@@ -1907,7 +4306,7 @@ class AchievementsPage(ctk.CTkFrame):
                         )
                         date_label.pack()
                     except Exception as e:
-                        print(f"Error displaying date: {e}, date value: {unlock_date}")
+                        ui_log.warning("Error displaying date %s: %s", unlock_date, e)
             else:
                 status_label = ctk.CTkLabel(
                     status_frame, 
@@ -1917,7 +4316,7 @@ class AchievementsPage(ctk.CTkFrame):
                 )
                 status_label.pack()
                 
-                if achievement_id.startswith("streak_"):
+                if AchievementEngine.rule_of(achievement_id, achievement) == "streak":
                     progress_label = ctk.CTkLabel(
                         status_frame,
                         text=f"{current_streak}/{achievement['requirement']} days",
@@ -2010,7 +4409,7 @@ class HelpPage(ctk.CTkFrame):
         self.back_button = ctk.CTkButton(
             self,
             text="Back",
-            image=ctk.CTkImage(Image.open(get_resource_path("icons/back.png")), size=(20, 20)),
+            image=assets.acquire("icons/back.png", (20, 20)),
             command=lambda: controller.show_frame(StartingPage)
         )
         self.back_button.place(relx=0.5, rely=0.9, anchor="center")
@@ -2042,7 +4441,7 @@ class AccountPage(ctk.CTkFrame):
         self.back_button = ctk.CTkButton(
             self,
             text="Back",
-            image=ctk.CTkImage(Image.open(get_resource_path("icons/back.png")), size=(20, 20)),
+            image=assets.acquire("icons/back.png", (20, 20)),
             command=lambda: controller.show_frame(StartingPage)
         )
         self.back_button.place(relx=0.5, rely=0.85, anchor="center")
@@ -2063,9 +4462,29 @@ class AccountPage(ctk.CTkFrame):
             not_logged_in.pack(pady=50)
             return
             
+        loading_label = ctk.CTkLabel(
+            self.main_frame,
+            text="Loading account...",
+            font=("Arial", 16)
+        )
+        loading_label.pack(pady=50)
+
+        # Get user info from Supabase without blocking the window (creating the client too, on first use)
+        self.controller.io.submit(
+            self.load_user,
+            on_success=self.show_user_info,
+            on_error=self.show_user_info_error
+        )
+
+    @staticmethod
+    def load_user():
+        return get_supabase().auth.get_user()
+
+    def show_user_info(self, user):
+        for widget in self.main_frame.winfo_children():
+            widget.destroy()
+
         try:
-            # Get user info from Supabase
-            user = supabase.auth.get_user()
             email = user.user.email if user and hasattr(user, 'user') else "Unknown"
             
             email_label = ctk.CTkLabel(
@@ -2101,13 +4520,22 @@ class AccountPage(ctk.CTkFrame):
             )
             delete_account_button.pack(pady=10)
             
+            # Theme the new buttons like the rest of the page
+            self.controller.styles.register_tree(self)
+            self.controller.styles.apply(self)
+            
         except Exception as e:
-            error_label = ctk.CTkLabel(
-                self.main_frame,
-                text=f"Error loading user info: {str(e)}",
-                text_color="#FF0000"
-            )
-            error_label.pack(pady=20)
+            self.show_user_info_error(e)
+
+    def show_user_info_error(self, error):
+        for widget in self.main_frame.winfo_children():
+            widget.destroy()
+        error_label = ctk.CTkLabel(
+            self.main_frame,
+            text=f"Error loading user info: {str(error)}",
+            text_color="#FF0000"
+        )
+        error_label.pack(pady=20)
     
     def logout(self):
         """Log out the current user"""
@@ -2151,13 +4579,17 @@ class AccountPage(ctk.CTkFrame):
                 status_label.configure(text="New passwords don't match", text_color="#FF0000")
                 return
                 
-            try:
-                # Change password using Supabase
-                response = supabase.auth.update_user({"password": new})
+            def on_changed(_):
                 status_label.configure(text="Password changed successfully!", text_color="#00FF00")
                 self.controller.after(2000, dialog.destroy)
-            except Exception as e:
-                status_label.configure(text=f"Error: {str(e)}", text_color="#FF0000")
+
+            status_label.configure(text="Changing password...", text_color=("gray10", "gray90"))
+            # Change password using Supabase
+            self.controller.io.submit(
+                lambda: get_supabase().auth.update_user({"password": new}),
+                on_success=on_changed,
+                on_error=lambda e: status_label.configure(text=f"Error: {str(e)}", text_color="#FF0000")
+            )
         
         submit_button = ctk.CTkButton(dialog, text="Change Password", command=change_password)
         submit_button.pack(pady=10)
@@ -2194,22 +4626,31 @@ class AccountPage(ctk.CTkFrame):
                 status_label.configure(text="Please enter your password", text_color="#FF0000")
                 return
                 
-            try:
+            data_handler = self.controller.data_handler
+
+            def delete_remote():
                 # Delete account from Supabase
-                supabase.auth.delete_user()
+                get_supabase().auth.delete_user()
                 
                 # Delete all user data from tables
-                if self.controller.data_handler:
-                    user_id = self.controller.data_handler.user_id
-                    supabase.table("app_settings").delete().eq("user_id", user_id).execute()
-                    supabase.table("breathing_stats").delete().eq("user_id", user_id).execute()
-                    supabase.table("achievements").delete().eq("user_id", user_id).execute()
-                    supabase.table("notification_settings").delete().eq("user_id", user_id).execute()
-                
+                if data_handler:
+                    user_id = data_handler.user_id
+                    # Nothing journaled may recreate the rows deleted below
+                    data_handler.cache.clear_outbox(user_id)
+                    for table in USER_TABLES:
+                        get_supabase().table(table).delete().eq("user_id", user_id).execute()
+                    data_handler.cache.invalidate(user_id)
+
+            def on_deleted(_):
                 status_label.configure(text="Account deleted successfully!", text_color="#00FF00")
                 self.controller.after(2000, lambda: [dialog.destroy(), self.controller.logout()])
-            except Exception as e:
-                status_label.configure(text=f"Error: {str(e)}", text_color="#FF0000")
+
+            status_label.configure(text="Deleting account...", text_color=("gray10", "gray90"))
+            self.controller.io.submit(
+                delete_remote,
+                on_success=on_deleted,
+                on_error=lambda e: status_label.configure(text=f"Error: {str(e)}", text_color="#FF0000")
+            )
         
         buttons_frame = ctk.CTkFrame(dialog, fg_color="transparent")
         buttons_frame.pack(pady=10, fill="x")